@@ -1,10 +1,15 @@
 from typing import Any
 
 from .adapter import SQLAdapter
+from .async_adapter import AsyncSQLAdapter
 
 
 def adapter(**kwargs: Any) -> SQLAdapter:
     return SQLAdapter(**kwargs)
 
 
-__all__ = ['SQLAdapter', 'adapter']
+def async_adapter(**kwargs: Any) -> AsyncSQLAdapter:
+    return AsyncSQLAdapter(**kwargs)
+
+
+__all__ = ['AsyncSQLAdapter', 'SQLAdapter', 'adapter', 'async_adapter']
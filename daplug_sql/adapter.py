@@ -1,46 +1,151 @@
 from __future__ import annotations
 
-import re
-from typing import TYPE_CHECKING, Any, Optional, Sequence, Tuple
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Iterator, Optional, Sequence, Tuple
 
 from daplug_core import dict_merger, logger  # type: ignore[import-untyped]
-from daplug_core.base_adapter import BaseAdapter  # type: ignore[import-untyped]
 
-from .exception import CreateTableException, SQLAdapterException
+from .adapter_base import SQLAdapterBase
+from .batch_publisher import BatchPublisher, configured_publisher
+from .column_builder import ColumnBuilder
+from .connection_state import ConnectionState, ConnectionStates
+from .exception import SQLAdapterException, raise_error, validate_read
+from .group_commit import GroupCommitter, grouped
+from .insert_builder import InsertBuilder
+from .outbox import OUTBOX_TABLE, OutboxWriter, outbox_table_statement, outboxed
+from .paginator import PageWalk, Paginator
+from .parallel_scanner import ParallelScanner
+from .pipeline import Pipeline, StatementResult
 from .param_adapter import ParamAdapter
-from .sql_connection import sql_connection, sql_connection_cleanup
+from .projection_buffer import ProjectionBuffer
+from .read_loader import ReadLoader, current_loader, loader_scope
+from .row_formatter import RowFormatter
+from .statement_builder import StatementBuilder
+from .statement_cache import statement_cache
+from .transaction import TransactionManager
+from .sql_connection import borrowed_connector, release_connector, sql_connection, sql_connection_cleanup, sql_pool_cleanup
 from .types import ConnectionProtocol, CursorProtocol, JSONDict
+from .update_builder import UpdateBuilder
 from .upsert_builder import UpsertBuilder
+from .upsert_coalescer import UpsertCoalescer
 
 if TYPE_CHECKING:
     from .sql_connector import SQLConnector
 
 
-class SQLAdapter(BaseAdapter):
-
-    SAFE_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+class SQLAdapter(SQLAdapterBase):
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
-        self.endpoint: str = kwargs['endpoint']
-        self.database: str = kwargs['database']
-        self.user: str = kwargs['user']
-        self.password: str = kwargs['password']
-        self.port: int = kwargs.get('port', 5432)
-        self.engine: str = kwargs.get('engine', 'postgres').lower()
+        self.config: JSONDict = dict(kwargs)
         self.autocommit: bool = kwargs.get('autocommit', True)
-        self.connection: ConnectionProtocol | None = None
-        self.cursor: CursorProtocol | None = None
+        self.pool_options: JSONDict = {
+            'min_size': kwargs.get('pool_min_size', 1),
+            'max_size': kwargs.get('pool_max_size', 10),
+            'timeout': kwargs.get('pool_timeout', 30),
+            'idle_timeout': kwargs.get('pool_idle_timeout', 300),
+        }
+        self.thread_safe: bool = kwargs.get('thread_safe', False)
+        self.prepared: bool = kwargs.get('prepared', False)
+        self.states: ConnectionStates = ConnectionStates(self.thread_safe, on_release=self.__release_state)
+        self.connected: bool = False
+        self.buffers: list[ProjectionBuffer] = []
+        self.batch_publisher: Optional[BatchPublisher] = configured_publisher(**kwargs)
+        self.transactions: TransactionManager = TransactionManager(self, self.__execute)
+        self.group_committer: Optional[GroupCommitter] = None
+        if kwargs.get('group_commit', False):
+            if not self.autocommit:
+                raise ValueError('group_commit batches autocommit writes; it cannot be combined with autocommit=False')
+            if not self.thread_safe:
+                raise ValueError('group_commit tracks explicit transactions per thread; it requires thread_safe=True')
+            self.group_committer = GroupCommitter(
+                self, window=kwargs.get('group_commit_window', 0.005), size=kwargs.get('group_commit_size', 100)
+            )
+        self.outbox_table: str = kwargs.get('outbox_table', OUTBOX_TABLE)
+        if kwargs.get('publish_mode') == 'outbox':
+            self.publisher: Any = OutboxWriter(self, self.__execute, self.outbox_table)
+        elif self.batch_publisher is not None:
+            self.publisher = self.batch_publisher
+
+    @property
+    def connector(self) -> SQLConnector | None:
+        return self.states.current().connector
+
+    @connector.setter
+    def connector(self, connector: SQLConnector | None) -> None:
+        self.states.current().connector = connector
+
+    @property
+    def connection(self) -> ConnectionProtocol | None:
+        return self.states.current().connection
+
+    @connection.setter
+    def connection(self, connection: ConnectionProtocol | None) -> None:
+        self.states.current().connection = connection
+
+    @property
+    def cursor(self) -> CursorProtocol | None:
+        return self.states.current().cursor
+
+    @cursor.setter
+    def cursor(self, cursor: CursorProtocol | None) -> None:
+        self.states.current().cursor = cursor
 
     @sql_connection
     def connect(self, connector: 'SQLConnector') -> None:
         self.connection = connector.connect()
         self.cursor = connector.cursor()
+        self.connector = connector
+        self.connected = True
 
     @sql_connection_cleanup
     def close(self) -> None:
-        self.__close_cursor()
-        self.__close_connection()
+        self.connected = False
+        try:
+            self.__close_buffers()
+        finally:
+            self.__close_publisher()
+            self.__close_thread_states()
+            self.__close_cursor()
+            self.__close_connection()
+
+    @sql_pool_cleanup
+    def close_pool(self) -> None:
+        self.close()
+
+    def release(self) -> None:
+        self.states.release()
+
+    def buffer(self, **kwargs: Any) -> ProjectionBuffer:
+        projection_buffer = ProjectionBuffer(self, **kwargs)
+        self.buffers.append(projection_buffer)
+        return projection_buffer
+
+    def loader(self) -> ContextManager[ReadLoader]:
+        return loader_scope(ReadLoader(self))
+
+    def flush_publishes(self) -> None:
+        if self.batch_publisher is not None:
+            self.batch_publisher.flush()
+
+    def transaction(self) -> ContextManager[None]:
+        return self.transactions.transaction()
+
+    def savepoint(self) -> ContextManager[None]:
+        return self.transactions.savepoint()
+
+    @contextmanager
+    def pipeline(self, **kwargs: Any) -> Iterator[Pipeline]:
+        queued = Pipeline(self.engine)
+        yield queued
+        self.__run_pipeline(queued, **kwargs)
+
+    def publish(self, db_data: Any, **kwargs: Any) -> None:
+        if isinstance(self.publisher, OutboxWriter) or not self.transactions.defer(db_data, **kwargs):
+            super().publish(db_data, **kwargs)
+
+    def statement_cache_info(self) -> dict[str, int]:
+        return statement_cache.info()
 
     def commit(self, commit: bool = True) -> None:
         if commit and self.connection:
@@ -49,44 +154,139 @@ class SQLAdapter(BaseAdapter):
     def create(self, **kwargs: Any) -> JSONDict:
         return self.insert(**kwargs)
 
+    @grouped
+    @outboxed
     def insert(self, **kwargs: Any) -> JSONDict:
         data, columns, values = self.__get_data_params(**kwargs)
-        table = self.__format_identifier(kwargs['table'])
-        formatted_columns = [self.__format_identifier(column) for column in columns]
-        placeholder_clause = self.__build_placeholders(len(columns))
-        query = f'INSERT INTO {table} ({", ".join(formatted_columns)}) VALUES ({placeholder_clause})'
+        if kwargs.get('atomic', False):
+            return self.__insert_atomic(columns, values, **kwargs)
+        query = StatementBuilder(self.engine).insert(kwargs['table'], columns)
         exists = self.__get_existing(**kwargs)
         if exists:
             self.__raise_error('NOT_UNIQUE', **kwargs)
         self.__execute(query, values, **kwargs)
-        super().publish(data, **kwargs)
+        self.publish(data, **kwargs)
         return data
 
-    def read(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+    @grouped
+    @outboxed
+    def insert_many(self, rows: Sequence[JSONDict], **kwargs: Any) -> JSONDict:
+        inserted: list[JSONDict] = []
+        rejected: list[Any] = []
+        for batch in self._batches(self.__unique_rows(rows, rejected, **kwargs), **kwargs):
+            for group in self.__group_by_columns(batch):
+                written = self.__insert_group(group, **kwargs)
+                for row in group:
+                    if str(row[kwargs['identifier']]) in written:
+                        inserted.append(row)
+                    else:
+                        rejected.append(row[kwargs['identifier']])
+        for row in inserted:
+            self.publish(row, **kwargs)
+        return {'inserted': inserted, 'rejected': rejected}
+
+    def read(self, identifier_value: Any, **kwargs: Any) -> Any:
         return self.get(identifier_value, **kwargs)
 
-    def get(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
-        table = self.__format_identifier(kwargs['table'])
-        identifier = self.__format_identifier(kwargs['identifier'])
-        query = f'SELECT * FROM {table} WHERE {identifier} = %s'
-        self.__execute(query, (identifier_value,), **kwargs)
+    def get(self, identifier_value: Any, **kwargs: Any) -> Any:
+        formatter = RowFormatter(kwargs.get('row_format', 'dict'))
+        if formatter.tuples:
+            query = StatementBuilder(self.engine).select(kwargs['table'], kwargs['identifier'])
+            return self.__fetch_formatted(formatter, query, (identifier_value,), **kwargs)
+        read_loader = current_loader(self)
+        if read_loader is not None:
+            return read_loader.load(identifier_value, **kwargs)
+        return self.__get(identifier_value, **kwargs)
+
+    def __get(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        query = StatementBuilder(self.engine).select(kwargs['table'], kwargs['identifier'])
+        self.__execute(query, (identifier_value,), self.__prepare(**kwargs), **kwargs)
         row = self.__get_data()
         return row if isinstance(row, dict) else None
 
-    def query(self, **kwargs: Any) -> list[JSONDict]:
-        if 'params' not in kwargs:
-            self.__raise_error('PARAMS_REQUIRED', **kwargs)
-        if any(word in kwargs['query'].lower() for word in ['insert', 'update', 'delete']):
-            self.__raise_error('READ_ONLY', **kwargs)
+    def get_many(self, identifier_values: Sequence[Any], **kwargs: Any) -> dict[Any, Optional[JSONDict]]:
+        keys = list(dict.fromkeys(identifier_values))
+        rows: list[JSONDict] = []
+        for chunk in self._batches(keys, **kwargs):
+            rows.extend(self.__fetch_rows(chunk, **kwargs))
+        return self._keyed(keys, rows, **kwargs)
+
+    def query(self, **kwargs: Any) -> list[Any]:
+        validate_read(**kwargs)
+        return self._select(**kwargs)
+
+    def _select(self, **kwargs: Any) -> list[Any]:
         query = kwargs.pop('query')
         params = kwargs.pop('params')
+        formatter = RowFormatter(kwargs.get('row_format', 'dict'))
+        if formatter.tuples:
+            return list(self.__fetch_formatted(formatter, query, params, all=True, **kwargs))
         self.__execute(query, params, **kwargs)
         result = self.__get_data(all=True)
         if isinstance(result, list):
             return list(result)
         return []
 
+    def iter_query(self, **kwargs: Any) -> Iterator[Any]:
+        validate_read(**kwargs)
+        chunk_size = int(kwargs.get('chunk_size', self.BATCH_SIZE))
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be a positive integer')
+        formatter = RowFormatter(kwargs.get('row_format', 'dict'))
+        with self.__stream_cursor(chunk_size, dictionary=not formatter.tuples) as cursor:
+            self.__debug(kwargs['query'], kwargs['params'], kwargs.get('debug', False))
+            self.__stream_call(kwargs['query'], cursor.execute, kwargs['query'], kwargs['params'])
+            while True:
+                rows = self.__stream_call(kwargs['query'], cursor.fetchmany, chunk_size)
+                if not rows:
+                    return
+                rows = formatter.rows(cursor.description, rows)
+                if kwargs.get('chunks', False):
+                    yield rows
+                else:
+                    yield from rows
+
+    def query_columns(self, **kwargs: Any) -> Any:
+        validate_read(**kwargs)
+        builder = ColumnBuilder(kwargs.get('output', 'list'))
+        chunk_size = int(kwargs.get('chunk_size', self.BATCH_SIZE))
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be a positive integer')
+        with self.__stream_cursor(chunk_size, dictionary=False) as cursor:
+            self.__debug(kwargs['query'], kwargs['params'], kwargs.get('debug', False))
+            self.__stream_call(kwargs['query'], cursor.execute, kwargs['query'], kwargs['params'])
+            while True:
+                rows = self.__stream_call(kwargs['query'], cursor.fetchmany, chunk_size)
+                if not builder.names and cursor.description:
+                    builder.describe(cursor.description)
+                if not rows:
+                    return builder.build()
+                builder.extend(rows)
+
+    def paginate(self, **kwargs: Any) -> JSONDict:
+        paginator = Paginator(self.engine, **kwargs)
+        query, params = paginator.build()
+        self.__execute(query, params, debug=kwargs.get('debug', False))
+        return paginator.page(self.__get_rows())
+
+    def iter_pages(self, **kwargs: Any) -> Iterator[list[JSONDict]]:
+        walk = PageWalk(kwargs.pop('after', None))
+        while not walk.done:
+            items = walk.advance(self.paginate(**kwargs, after=walk.after))
+            if items:
+                yield items
+
+    def parallel_scan(self, **kwargs: Any) -> Iterator[JSONDict] | int:
+        scanner = ParallelScanner(self, **kwargs)
+        if scanner.callback is None:
+            return scanner.rows()
+        return scanner.run()
+
+    @grouped
+    @outboxed
     def update(self, **kwargs: Any) -> JSONDict:
+        if kwargs.get('atomic', False):
+            return self.__update_atomic(**kwargs)
         exists = self.__get_existing(**kwargs)
         if not exists:
             self.__raise_error('NOT_EXISTS', **kwargs)
@@ -96,9 +296,11 @@ class SQLAdapter(BaseAdapter):
             kwargs['data'], kwargs['table'], kwargs['identifier']
         )
         self.__execute(query, params, **kwargs)
-        super().publish(kwargs['data'], **kwargs)
+        self.publish(kwargs['data'], **kwargs)
         return kwargs['data']
 
+    @grouped
+    @outboxed
     def upsert(self, **kwargs: Any) -> Optional[JSONDict]:
         if kwargs.get('atomic', True):
             return self.__upsert_atomic(**kwargs)
@@ -107,23 +309,39 @@ class SQLAdapter(BaseAdapter):
             return self.update(**kwargs)
         return self.insert(**kwargs)
 
+    @grouped
+    @outboxed
+    def upsert_many(self, rows: Sequence[JSONDict], **kwargs: Any) -> list[JSONDict]:
+        written: list[JSONDict] = []
+        if kwargs.get('coalesce', True):
+            rows = UpsertCoalescer(**kwargs).coalesce(rows)
+        for batch in self._batches([dict(row) for row in rows], **kwargs):
+            for group in self.__group_by_columns(batch):
+                written.extend(self.__upsert_group(group, **kwargs))
+        for row in written:
+            self.publish(row, **kwargs)
+        return written
+
     def create_table(self, **kwargs: Any) -> None:
         query = str(kwargs.pop('query', ''))
         if not query.strip().lower().startswith('create table'):
             self.__raise_error('TABLE_WRITE_ONLY', **kwargs)
         self.__execute(query, None, **kwargs)
 
+    def install_outbox(self, **kwargs: Any) -> None:
+        self.__execute(outbox_table_statement(self.engine, self.outbox_table), None, **kwargs)
+
     def install_json_merge(self, **kwargs: Any) -> None:
         if self.engine == 'mysql':
             return
         self.__execute(UpsertBuilder.POSTGRES_JSON_MERGE_FUNCTION, None, **kwargs)
 
+    @grouped
+    @outboxed
     def delete(self, identifier_value: Any, **kwargs: Any) -> None:
-        table = self.__format_identifier(kwargs['table'])
-        identifier = self.__format_identifier(kwargs['identifier'])
-        query = f'DELETE FROM {table} WHERE {identifier} = %s'
-        self.__execute(query, (identifier_value,), **kwargs)
-        super().publish({kwargs['identifier']: identifier_value}, **kwargs)
+        query = StatementBuilder(self.engine).delete(kwargs['table'], kwargs['identifier'])
+        self.__execute(query, (identifier_value,), self.__prepare(**kwargs), **kwargs)
+        self.publish({kwargs['identifier']: identifier_value}, **kwargs)
 
     def create_index(self, table_name: str, index_columns: Sequence[str]) -> None:
         table = self.__format_identifier(table_name)
@@ -132,21 +350,117 @@ class SQLAdapter(BaseAdapter):
         statement = f'CREATE INDEX {index_name} ON {table} ({", ".join(formatted_columns)})'
         self.__execute(query=statement, params=None)
 
+    def __insert_atomic(self, columns: list[str], values: Tuple[Any, ...], **kwargs: Any) -> JSONDict:
+        data = dict(kwargs['data'])
+        if kwargs['identifier'] not in data:
+            raise KeyError(f'identifier "{kwargs["identifier"]}" missing from payload')
+        query = StatementBuilder(self.engine).insert_unique(kwargs['table'], kwargs['identifier'], columns)
+        self.__execute(query, values, **kwargs)
+        cursor = self.__result_cursor()
+        if cursor and cursor.rowcount == 0:
+            self.__raise_error('NOT_UNIQUE', **kwargs)
+        self.publish(data, **kwargs)
+        return data
+
+    def __insert_group(self, rows: list[JSONDict], **kwargs: Any) -> set[str]:
+        identifier = kwargs['identifier']
+        builder = InsertBuilder(self.engine, rows=rows, table=kwargs['table'], identifier=identifier)
+        if self.engine == 'mysql':
+            query, params = builder.build_existing()
+            self.__execute(query, params, **kwargs)
+            existing = {str(row[identifier]) for row in self.__get_rows()}
+            rows = [row for row in rows if str(row[identifier]) not in existing]
+            if not rows:
+                return set()
+            query, params = InsertBuilder(self.engine, rows=rows, table=kwargs['table'], identifier=identifier).build()
+            self.__execute(query, params, **kwargs)
+            return {str(row[identifier]) for row in rows}
+        query, params = builder.build()
+        self.__execute(query, params, **kwargs)
+        return {str(row[identifier]) for row in self.__get_rows()}
+
+    def __unique_rows(self, rows: Sequence[JSONDict], rejected: list[Any], **kwargs: Any) -> list[JSONDict]:
+        identifier = kwargs['identifier']
+        unique: list[JSONDict] = []
+        seen: set[str] = set()
+        for row in rows:
+            if identifier not in row:
+                raise KeyError(f'identifier "{identifier}" missing from payload')
+            key = str(row[identifier])
+            if key in seen:
+                rejected.append(row[identifier])
+                continue
+            seen.add(key)
+            unique.append(dict(row))
+        return unique
+
+    def __group_by_columns(self, rows: list[JSONDict]) -> list[list[JSONDict]]:
+        groups: dict[Tuple[str, ...], list[JSONDict]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row.keys()), []).append(row)
+        return list(groups.values())
+
+    def __get_rows(self) -> list[JSONDict]:
+        result = self.__get_data(all=True)
+        return result if isinstance(result, list) else []
+
+    def __update_atomic(self, **kwargs: Any) -> JSONDict:
+        query, params = UpdateBuilder(self.engine, **kwargs).build()
+        self.__execute(query, params, **kwargs)
+        if self.engine == 'mysql':
+            row = self.__get(kwargs['data'][kwargs['identifier']], **kwargs)
+        else:
+            result = self.__get_data()
+            row = result if isinstance(result, dict) else None
+        if row is None:
+            raise_error('NOT_EXISTS', **kwargs)
+        self.publish(row, **kwargs)
+        return row
+
     def __upsert_atomic(self, **kwargs: Any) -> Optional[JSONDict]:
         builder = UpsertBuilder(self.engine, **kwargs)
         query, params = builder.build()
-        self.__execute(query, params, **kwargs)
-        row = self.__upsert_written_row(**kwargs)
+        self.__execute(query, params, self.__prepare(**kwargs), **kwargs)
+        row = self.__upsert_written_row(builder, **kwargs)
         if row is None:
             return None
-        super().publish(row, **kwargs)
+        self.publish(row, **kwargs)
         return row
 
-    def __upsert_written_row(self, **kwargs: Any) -> Optional[JSONDict]:
-        if self.cursor and self.cursor.rowcount == 0:
+    def __upsert_group(self, rows: list[JSONDict], **kwargs: Any) -> list[JSONDict]:
+        builder = UpsertBuilder(self.engine, **{**kwargs, 'rows': rows})
+        query, params = builder.build()
+        self.__execute(query, params, **kwargs)
+        if self.engine != 'mysql':
+            return self.__get_rows()
+        if builder.reconstructable(kwargs.get('returning', True), batch=True):
+            return rows
+        if kwargs.get('guard_column'):
+            return self.__fetch_applied(rows, **kwargs)
+        return self.__fetch_rows([row[kwargs['identifier']] for row in rows], **kwargs)
+
+    def __fetch_applied(self, rows: list[JSONDict], **kwargs: Any) -> list[JSONDict]:
+        identifier, guard_column = kwargs['identifier'], kwargs['guard_column']
+        query = StatementBuilder(self.engine).select_applied(kwargs['table'], identifier, guard_column, len(rows))
+        params: list[Any] = []
+        for row in rows:
+            params.extend(ParamAdapter(self.engine).sequence((row[identifier], row.get(guard_column))))
+        self.__execute(query, tuple(params), **kwargs)
+        return self.__get_rows()
+
+    def __fetch_rows(self, identifier_values: Sequence[Any], **kwargs: Any) -> list[JSONDict]:
+        query, params = self._select_keys(identifier_values, **kwargs)
+        self.__execute(query, params, **kwargs)
+        return self.__get_rows()
+
+    def __upsert_written_row(self, builder: UpsertBuilder, **kwargs: Any) -> Optional[JSONDict]:
+        cursor = self.__result_cursor()
+        if cursor and cursor.rowcount == 0:
             return None
         if self.engine == 'mysql':
-            return self.get(kwargs['data'][kwargs['identifier']], **kwargs)
+            if builder.reconstructable(kwargs.get('returning', True)):
+                return dict(kwargs['data'])
+            return self.__get(kwargs['data'][kwargs['identifier']], **kwargs)
         row = self.__get_data()
         return row if isinstance(row, dict) else None
 
@@ -156,27 +470,12 @@ class SQLAdapter(BaseAdapter):
         update_columns = [key for key in data.keys() if key != identifier]
         if not update_columns:
             raise ValueError('no updatable fields supplied for update operation')
-        formatted_table = self.__format_identifier(table)
-        formatted_identifier = self.__format_identifier(identifier)
-        set_clause_parts = []
-        for column in update_columns:
-            formatted_column = self.__format_identifier(column)
-            set_clause_parts.append(f'{formatted_column} = %s')
-        set_clause = ', '.join(set_clause_parts)
         params = ParamAdapter(self.engine).sequence(tuple(data[column] for column in update_columns)) + (data[identifier],)
-        query = f'UPDATE {formatted_table} SET {set_clause} WHERE {formatted_identifier} = %s'
-        return query, params
+        return StatementBuilder(self.engine).update(table, identifier, update_columns), params
 
     def __get_existing(self, **kwargs: Any) -> JSONDict | bool:
-        identifier = kwargs['identifier']
-        data = kwargs['data']
-        if identifier not in data:
-            raise KeyError(f'identifier "{identifier}" missing from payload')
-        identifier_value = data[identifier]
-        table = self.__format_identifier(kwargs['table'])
-        identifier_column = self.__format_identifier(identifier)
-        query = f'SELECT * FROM {table} WHERE {identifier_column} = %s LIMIT 1'
-        self.__execute(query, (identifier_value,), **kwargs)
+        query, params = self._select_existing(**kwargs)
+        self.__execute(query, params, self.__prepare(**kwargs), **kwargs)
         result = self.__get_data()
         if isinstance(result, dict):
             return result
@@ -191,9 +490,10 @@ class SQLAdapter(BaseAdapter):
         return data, columns, values
 
     def __get_data(self, **kwargs: Any) -> JSONDict | list[JSONDict] | None:
-        if not self.cursor:
+        cursor = self.__result_cursor()
+        if not cursor:
             return [] if kwargs.get('all', False) else None
-        get = self.cursor.fetchall if kwargs.get('all', False) else self.cursor.fetchone
+        get = cursor.fetchall if kwargs.get('all', False) else cursor.fetchone
         try:
             result = get()
         except Exception:
@@ -204,34 +504,143 @@ class SQLAdapter(BaseAdapter):
             return []
         return result if isinstance(result, dict) else None
 
-    def __execute(self, query: str, params: Optional[Sequence[Any]] = None, **kwargs: Any) -> None:
+    def __fetch_formatted(self, formatter: RowFormatter, query: str, params: Optional[Sequence[Any]], **kwargs: Any) -> Any:
+        self.__ensure_connected()
+        if not self.connector:
+            raise SQLAdapterException('adapter is not connected')
+        cursor = self.connector.tuple_cursor()
+        try:
+            self.__execute(query, params, cursor=cursor, **kwargs)
+            if kwargs.get('all', False):
+                return formatter.rows(cursor.description, cursor.fetchall())
+            row = cursor.fetchone()
+            return None if row is None else formatter.row(cursor.description, row)
+        finally:
+            cursor.close()
+
+    def __prepare(self, **kwargs: Any) -> bool:
+        return bool(kwargs.get('prepared', self.prepared))
+
+    def __result_cursor(self) -> CursorProtocol | None:
+        state = self.states.current()
+        return state.result or state.cursor
+
+    def __stream_call(self, query: str, call: Callable[..., Any], *args: Any) -> Any:
+        try:
+            return call(*args)
+        except Exception as error:
+            logger.log(level='ERROR', log={'error': error, 'query': query})
+            raise SQLAdapterException(f'error with execution, check logs - {error}') from error
+
+    @contextmanager
+    def __stream_cursor(self, chunk_size: int, dictionary: bool) -> Iterator[CursorProtocol]:
+        self.__ensure_connected()
+        if not self.connector:
+            raise SQLAdapterException('adapter is not connected')
+        if self.engine != 'mysql':
+            cursor = self.connector.stream_cursor(chunk_size, dictionary=dictionary)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+        with borrowed_connector(self) as connector:
+            cursor = connector.stream_cursor(chunk_size, dictionary=dictionary)
+            yield cursor
+            cursor.close()
+
+    def __ensure_connected(self) -> None:
+        if self.thread_safe and self.connected and not self.cursor:
+            self.connect()  # pylint: disable=no-value-for-parameter
+
+    def __execute(
+        self,
+        query: str,
+        params: Optional[Sequence[Any]] = None,
+        prepare: bool = False,
+        cursor: Optional[CursorProtocol] = None,
+        **kwargs: Any,
+    ) -> None:
+        self.__ensure_connected()
         if not self.cursor or not self.connection:
             raise SQLAdapterException('adapter is not connected')
+        state = self.states.current()
+        state.result = cursor
+        target = cursor or self.cursor
         try:
             self.__debug(query, params, kwargs.get('debug', False))
-            if params is None:
-                self.cursor.execute(query)
+            if prepare and self.connector and cursor is None:
+                state.result = self.connector.execute_prepared(self.cursor, query, params)
+            elif params is None:
+                target.execute(query)
             else:
-                self.cursor.execute(query, params)
-            self.commit(kwargs.get('commit', False))
+                target.execute(query, params)
+            if not state.transaction_depth:
+                self.commit(kwargs.get('commit', False))
         except Exception as error:
             self.__debug(query, params, True)
             logger.log(level='ERROR', log={'error': error})
-            if kwargs.get('rollback'):
+            if kwargs.get('rollback') and not state.transaction_depth:
                 self.connection.rollback()
             raise SQLAdapterException(f'error with execution, check logs - {error}') from error
 
-    def __build_placeholders(self, count: int) -> str:
-        if count <= 0:
-            raise ValueError('columns must include at least one entry')
-        return ', '.join(['%s'] * count)
+    def __run_pipeline(self, queued: Pipeline, **kwargs: Any) -> None:
+        if not queued.statements:
+            queued.resolve()
+            return
+        state = self.states.current()
+        if isinstance(self.publisher, OutboxWriter) and not state.transaction_depth:
+            with self.transactions.transaction(commit=kwargs.get('commit', False)):
+                self.__run_pipeline(queued, **kwargs)
+            return
+        query, params = queued.script()
+        explicit = self.engine == 'mysql' and self.autocommit and not state.transaction_depth
+        if explicit:
+            query = f'START TRANSACTION;\n{query};\nCOMMIT'
+        try:
+            self.__execute(
+                query, params, debug=kwargs.get('debug', False), commit=kwargs.get('commit', False), rollback=not explicit
+            )
+            returned = self.__pipeline_results(queued, explicit)
+        except Exception as error:
+            if explicit:
+                self.__rollback_pipeline()
+            if isinstance(error, SQLAdapterException):
+                raise
+            raise SQLAdapterException(f'error with execution, check logs - {error}') from error
+        queued.resolve(returned)
+        for db_data, options in queued.events():
+            self.publish(db_data, **options)
+
+    def __pipeline_results(self, queued: Pipeline, explicit: bool) -> list[Optional[StatementResult]]:
+        if self.engine != 'mysql':
+            row = self.__get_data() if queued.counted() else None
+            return queued.counts(row if isinstance(row, dict) else None)
+        returned: list[Optional[StatementResult]] = [None] * len(queued)
+        cursor = self.cursor
+        nextset = getattr(cursor, 'nextset', None)
+        if cursor is None or not callable(nextset):
+            return returned
+        counts = [cursor.rowcount]
+        while nextset():  # pylint: disable=not-callable
+            counts.append(cursor.rowcount)
+        counts = counts[1:] if explicit else counts
+        if len(counts) < len(queued):
+            return returned
+        for index, (statement, count) in enumerate(zip(queued.statements, counts)):
+            if statement.kind != 'execute':
+                returned[index] = ([], count)
+        return returned
+
+    def __rollback_pipeline(self) -> None:
+        try:
+            if self.cursor:
+                self.cursor.execute('ROLLBACK')
+        except Exception as error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'pipeline_rollback_error: {error}'})
 
     def __format_identifier(self, value: str) -> str:
-        if not isinstance(value, str) or not self.SAFE_IDENTIFIER.match(value):
-            raise ValueError(f'invalid identifier: {value}')
-        if self.engine == 'mysql':
-            return f'`{value}`'
-        return f'"{value}"'
+        return StatementBuilder(self.engine).format(value)
 
     def __debug(self, query: str, params: Optional[Sequence[Any]], debug: bool = False) -> None:
         if not debug or not self.cursor:
@@ -245,6 +654,36 @@ class SQLAdapter(BaseAdapter):
                 pass
         logger.log(level='INFO', log={'query': query, 'params': params})
 
+    def __close_buffers(self) -> None:
+        failure: Optional[Exception] = None
+        for projection_buffer in list(self.buffers):
+            try:
+                projection_buffer.close()
+            except Exception as error:  # pylint: disable=broad-except
+                failure = failure or error
+        if failure is not None:
+            raise failure
+
+    def __close_publisher(self) -> None:
+        if self.group_committer is not None:
+            self.group_committer.close()
+        if self.batch_publisher is not None:
+            self.batch_publisher.close()
+
+    def __close_thread_states(self) -> None:
+        for state in self.states.others():
+            self.states.release(state)
+
+    def __release_state(self, state: ConnectionState) -> None:
+        if state.cursor:
+            try:
+                state.cursor.close()
+            except Exception:
+                pass
+        if state.connector:
+            release_connector(self, state.connector)
+        state.connector, state.connection, state.cursor, state.result = None, None, None, None
+
     def __close_cursor(self) -> None:
         if not self.cursor:
             return
@@ -253,33 +692,17 @@ class SQLAdapter(BaseAdapter):
         except Exception:
             pass
         self.cursor = None
+        self.states.current().result = None
 
     def __close_connection(self) -> None:
         if not self.connection:
             return
-        try:
-            self.connection.close()
-        except Exception:
-            pass
+        if not self.connector:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
         self.connection = None
 
     def __raise_error(self, error_type: str, **kwargs: Any) -> None:
-        if error_type == 'PARAMS_REQUIRED':
-            raise SQLAdapterException('params kwargs are required to prevent sql inject; send empty dict if not needed')
-        if error_type == 'READ_ONLY':
-            raise SQLAdapterException(
-                'query method is for read-only operations; please use another function for destructive operations'
-            )
-        if error_type == 'TABLE_WRITE_ONLY':
-            raise CreateTableException(
-                'create table query-string must start with "create table"'
-            )
-        if error_type == 'NOT_UNIQUE':
-            raise SQLAdapterException(
-                f'row already exist with {kwargs["identifier"]} = {kwargs.get("data", {}).get(kwargs["identifier"])}'
-            )
-        if error_type == 'NOT_EXISTS':
-            raise SQLAdapterException(
-                f'row does not exist with {kwargs["identifier"]} = {kwargs.get("data", {}).get(kwargs["identifier"])}'
-            )
-        raise SQLAdapterException(f'Something went wrong and I am not sure how I got here: {error_type}')
+        raise_error(error_type, **kwargs)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Sequence, Tuple
+
+from daplug_core.base_adapter import BaseAdapter  # type: ignore[import-untyped]
+
+from .statement_builder import StatementBuilder
+from .types import JSONDict
+
+Statement = Tuple[str, Tuple[Any, ...]]
+
+
+def worker_config(config: JSONDict, **overrides: Any) -> JSONDict:
+    return {**config, 'thread_safe': False, 'group_commit': False, **overrides}
+
+
+class SQLAdapterBase(BaseAdapter):
+
+    SAFE_IDENTIFIER = StatementBuilder.SAFE_IDENTIFIER
+    BATCH_SIZE = 500
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.endpoint: str = kwargs['endpoint']
+        self.database: str = kwargs['database']
+        self.user: str = kwargs['user']
+        self.password: str = kwargs['password']
+        self.port: int = kwargs.get('port', 5432)
+        self.engine: str = kwargs.get('engine', 'postgres').lower()
+
+    def _batches(self, rows: list[Any], **kwargs: Any) -> list[list[Any]]:
+        batch_size = int(kwargs.get('batch_size', self.BATCH_SIZE))
+        if batch_size <= 0:
+            raise ValueError('batch_size must be a positive integer')
+        return [rows[index:index + batch_size] for index in range(0, len(rows), batch_size)]
+
+    def _select_keys(self, identifier_values: Sequence[Any], **kwargs: Any) -> Statement:
+        statements = StatementBuilder(self.engine)
+        if self.engine == 'mysql':
+            query = statements.select_many(kwargs['table'], kwargs['identifier'], len(identifier_values))
+            return query, tuple(identifier_values)
+        return statements.select_any(kwargs['table'], kwargs['identifier']), (list(identifier_values),)
+
+    def _select_existing(self, **kwargs: Any) -> Statement:
+        identifier = kwargs['identifier']
+        data = kwargs['data']
+        if identifier not in data:
+            raise KeyError(f'identifier "{identifier}" missing from payload')
+        return StatementBuilder(self.engine).select_existing(kwargs['table'], identifier), (data[identifier],)
+
+    @staticmethod
+    def _keyed(keys: Sequence[Any], rows: Sequence[JSONDict], **kwargs: Any) -> dict[Any, JSONDict | None]:
+        found = {str(row[kwargs['identifier']]): row for row in rows}
+        return {key: found.get(str(key)) for key in keys}
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, ContextManager, Optional, Sequence
+
+from daplug_core import dict_merger, logger  # type: ignore[import-untyped]
+
+from .adapter_base import SQLAdapterBase
+from .async_connector import AsyncResult, AsyncSQLConnector
+from .batch_publisher import BatchPublisher, configured_publisher
+from .exception import SQLAdapterException, raise_error, validate_read
+from .paginator import PageWalk, Paginator
+from .param_adapter import ParamAdapter
+from .pipeline import Pipeline
+from .read_loader import AsyncReadLoader, current_loader, loader_scope
+from .statement_builder import StatementBuilder
+from .types import JSONDict
+from .update_builder import UpdateBuilder
+from .upsert_builder import UpsertBuilder
+
+
+class AsyncSQLAdapter(SQLAdapterBase):
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.driver: str = 'aiomysql' if self.engine == 'mysql' else 'psycopg'
+        self.connector: AsyncSQLConnector = AsyncSQLConnector(
+            self,
+            min_size=kwargs.get('pool_min_size', 1),
+            max_size=kwargs.get('pool_max_size', 10),
+            timeout=kwargs.get('pool_timeout', 30),
+            idle_timeout=kwargs.get('pool_idle_timeout', 300),
+        )
+        if kwargs.get('publish_mode') == 'outbox':
+            raise ValueError('publish_mode="outbox" is only supported by SQLAdapter')
+        self.batch_publisher: Optional[BatchPublisher] = configured_publisher(**kwargs)
+        if self.batch_publisher is not None:
+            self.publisher = self.batch_publisher
+
+    async def __aenter__(self) -> 'AsyncSQLAdapter':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        await self.connector.open()
+
+    async def close(self) -> None:
+        if self.batch_publisher is not None:
+            await asyncio.to_thread(self.batch_publisher.close)
+        await self.connector.close()
+
+    async def flush_publishes(self) -> None:
+        if self.batch_publisher is not None:
+            await asyncio.to_thread(self.batch_publisher.flush)
+
+    @asynccontextmanager
+    async def pipeline(self, **kwargs: Any) -> AsyncIterator[Pipeline]:
+        queued = Pipeline(self.engine, self.driver)
+        yield queued
+        await self.__run_pipeline(queued, **kwargs)
+
+    def loader(self) -> ContextManager[AsyncReadLoader]:
+        return loader_scope(AsyncReadLoader(self))
+
+    async def create(self, **kwargs: Any) -> JSONDict:
+        return await self.insert(**kwargs)
+
+    async def insert(self, **kwargs: Any) -> JSONDict:
+        data = dict(kwargs['data'])
+        if not data:
+            raise ValueError('no data supplied for insert operation')
+        columns = list(data.keys())
+        params = self.__params(data[column] for column in columns)
+        if kwargs.get('atomic', False):
+            if kwargs['identifier'] not in data:
+                raise KeyError(f'identifier "{kwargs["identifier"]}" missing from payload')
+            query = StatementBuilder(self.engine).insert_unique(kwargs['table'], kwargs['identifier'], columns)
+            _, rowcount = await self.__execute(query, params, **kwargs)
+            if rowcount == 0:
+                raise_error('NOT_UNIQUE', **kwargs)
+        else:
+            if await self.__get_existing(**kwargs):
+                raise_error('NOT_UNIQUE', **kwargs)
+            await self.__execute(StatementBuilder(self.engine).insert(kwargs['table'], columns), params, **kwargs)
+        await self.__publish(data, **kwargs)
+        return data
+
+    async def read(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        return await self.get(identifier_value, **kwargs)
+
+    async def get(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        read_loader = current_loader(self)
+        if read_loader is not None:
+            return await read_loader.load(identifier_value, **kwargs)
+        return await self.__get(identifier_value, **kwargs)
+
+    async def __get(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        query = StatementBuilder(self.engine).select(kwargs['table'], kwargs['identifier'])
+        rows, _ = await self.__execute(query, (identifier_value,), **kwargs)
+        return rows[0] if rows else None
+
+    async def get_many(self, identifier_values: Sequence[Any], **kwargs: Any) -> dict[Any, Optional[JSONDict]]:
+        keys = list(dict.fromkeys(identifier_values))
+        found: list[JSONDict] = []
+        for chunk in self._batches(keys, **kwargs):
+            rows, _ = await self.__execute(*self._select_keys(chunk, **kwargs), **kwargs)
+            found.extend(rows)
+        return self._keyed(keys, found, **kwargs)
+
+    async def query(self, **kwargs: Any) -> list[JSONDict]:
+        validate_read(**kwargs)
+        query = kwargs.pop('query')
+        params = kwargs.pop('params')
+        rows, _ = await self.__execute(query, params, **kwargs)
+        return rows
+
+    async def iter_query(self, **kwargs: Any) -> AsyncIterator[Any]:
+        validate_read(**kwargs)
+        chunk_size = int(kwargs.get('chunk_size', 500))
+        if chunk_size <= 0:
+            raise ValueError('chunk_size must be a positive integer')
+        if kwargs.get('debug', False):
+            logger.log(level='INFO', log={'query': kwargs['query'], 'params': kwargs['params']})
+        try:
+            async for rows in self.connector.stream(kwargs['query'], kwargs['params'], chunk_size):
+                if kwargs.get('chunks', False):
+                    yield rows
+                    continue
+                for row in rows:
+                    yield row
+        except SQLAdapterException:
+            raise
+        except Exception as error:
+            logger.log(level='ERROR', log={'error': error, 'query': kwargs['query']})
+            raise SQLAdapterException(f'error with execution, check logs - {error}') from error
+
+    async def paginate(self, **kwargs: Any) -> JSONDict:
+        paginator = Paginator(self.engine, **kwargs)
+        query, params = paginator.build()
+        rows, _ = await self.__execute(query, params, debug=kwargs.get('debug', False))
+        return paginator.page(rows)
+
+    async def iter_pages(self, **kwargs: Any) -> AsyncIterator[list[JSONDict]]:
+        walk = PageWalk(kwargs.pop('after', None))
+        while not walk.done:
+            items = walk.advance(await self.paginate(**kwargs, after=walk.after))
+            if items:
+                yield items
+
+    async def update(self, **kwargs: Any) -> JSONDict:
+        if kwargs.get('atomic', False):
+            return await self.__update_atomic(**kwargs)
+        exists = await self.__get_existing(**kwargs)
+        if not exists:
+            raise_error('NOT_EXISTS', **kwargs)
+        if kwargs.get('merge', True):
+            kwargs['data'] = dict_merger.merge(exists, kwargs['data'], **kwargs)
+        data = kwargs['data']
+        identifier = kwargs['identifier']
+        update_columns = [key for key in data.keys() if key != identifier]
+        if not update_columns:
+            raise ValueError('no updatable fields supplied for update operation')
+        query = StatementBuilder(self.engine).update(kwargs['table'], identifier, update_columns)
+        params = self.__params(data[column] for column in update_columns) + (data[identifier],)
+        await self.__execute(query, params, **kwargs)
+        await self.__publish(data, **kwargs)
+        return data
+
+    async def upsert(self, **kwargs: Any) -> Optional[JSONDict]:
+        if not kwargs.get('atomic', True):
+            if await self.__get_existing(**kwargs):
+                return await self.update(**kwargs)
+            return await self.insert(**kwargs)
+        builder = UpsertBuilder(self.engine, driver=self.driver, **kwargs)
+        query, params = builder.build()
+        rows, rowcount = await self.__execute(query, params, **kwargs)
+        if rowcount == 0:
+            return None
+        if self.engine != 'mysql':
+            row = rows[0] if rows else None
+        elif builder.reconstructable(kwargs.get('returning', True)):
+            row = dict(kwargs['data'])
+        else:
+            row = await self.__get(kwargs['data'][kwargs['identifier']], **kwargs)
+        if row is None:
+            return None
+        await self.__publish(row, **kwargs)
+        return row
+
+    async def delete(self, identifier_value: Any, **kwargs: Any) -> None:
+        query = StatementBuilder(self.engine).delete(kwargs['table'], kwargs['identifier'])
+        await self.__execute(query, (identifier_value,), **kwargs)
+        await self.__publish({kwargs['identifier']: identifier_value}, **kwargs)
+
+    async def create_table(self, **kwargs: Any) -> None:
+        query = str(kwargs.pop('query', ''))
+        if not query.strip().lower().startswith('create table'):
+            raise_error('TABLE_WRITE_ONLY', **kwargs)
+        await self.__execute(query, None, **kwargs)
+
+    async def install_json_merge(self, **kwargs: Any) -> None:
+        if self.engine == 'mysql':
+            return
+        await self.__execute(UpsertBuilder.POSTGRES_JSON_MERGE_FUNCTION, None, **kwargs)
+
+    async def __update_atomic(self, **kwargs: Any) -> JSONDict:
+        query, params = UpdateBuilder(self.engine, driver=self.driver, **kwargs).build()
+        rows, _ = await self.__execute(query, params, **kwargs)
+        if self.engine == 'mysql':
+            row = await self.__get(kwargs['data'][kwargs['identifier']], **kwargs)
+        else:
+            row = rows[0] if rows else None
+        if row is None:
+            raise_error('NOT_EXISTS', **kwargs)
+        await self.__publish(row, **kwargs)
+        return row
+
+    async def __get_existing(self, **kwargs: Any) -> JSONDict | bool:
+        rows, _ = await self.__execute(*self._select_existing(**kwargs), **kwargs)
+        return rows[0] if rows else False
+
+    async def __execute(self, query: str, params: Optional[Sequence[Any]] = None, **kwargs: Any) -> AsyncResult:
+        try:
+            if kwargs.get('debug', False):
+                logger.log(level='INFO', log={'query': query, 'params': params})
+            return await self.connector.execute(query, params)
+        except SQLAdapterException:
+            raise
+        except Exception as error:
+            logger.log(level='ERROR', log={'error': error, 'query': query})
+            raise SQLAdapterException(f'error with execution, check logs - {error}') from error
+
+    async def __run_pipeline(self, queued: Pipeline, **kwargs: Any) -> None:
+        if not queued.statements:
+            queued.resolve()
+            return
+        statements = [(statement.query, statement.params or None) for statement in queued.statements]
+        try:
+            if kwargs.get('debug', False):
+                logger.log(level='INFO', log={'pipeline': statements})
+            returned = await self.connector.pipeline(statements)
+        except SQLAdapterException:
+            raise
+        except Exception as error:
+            logger.log(level='ERROR', log={'error': error, 'pipeline': len(statements)})
+            raise SQLAdapterException(f'error with execution, check logs - {error}') from error
+        queued.resolve(returned)
+        for db_data, options in queued.events():
+            await self.__publish(db_data, **options)
+
+    async def __publish(self, db_data: JSONDict, **kwargs: Any) -> None:
+        await asyncio.to_thread(super().publish, db_data, **kwargs)
+
+    def __params(self, values: Any) -> tuple[Any, ...]:
+        return ParamAdapter(self.engine, self.driver).sequence(tuple(values))
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import uuid
+from typing import Any, AsyncIterator, Optional, Sequence, Tuple
+
+from .exception import SQLAdapterException
+from .types import AdapterConfig, JSONDict
+
+AsyncResult = Tuple[list[JSONDict], int]
+
+
+class AsyncSQLConnector:
+
+    def __init__(self, cls: AdapterConfig, **kwargs: Any) -> None:
+        self.endpoint: str = cls.endpoint
+        self.database: str = cls.database
+        self.user: str = cls.user
+        self.password: str = cls.password
+        self.port: int = cls.port
+        self.engine: str = getattr(cls, 'engine', 'postgres').lower()
+        self.min_size: int = int(kwargs.get('min_size', 1))
+        self.max_size: int = int(kwargs.get('max_size', 10))
+        self.timeout: float = float(kwargs.get('timeout', 30))
+        self.idle_timeout: float = float(kwargs.get('idle_timeout', 300))
+        self.pool: Any = None
+
+    async def open(self) -> None:
+        if self.pool is not None:
+            return
+        if self.engine == 'mysql':
+            self.pool = await self._open_mysql()
+        else:
+            self.pool = await self._open_postgres()
+
+    async def close(self) -> None:
+        if self.pool is None:
+            return
+        pool, self.pool = self.pool, None
+        if self.engine == 'mysql':
+            pool.close()
+            await pool.wait_closed()
+        else:
+            await pool.close()
+
+    async def execute(self, query: str, params: Optional[Sequence[Any]] = None) -> AsyncResult:
+        if self.pool is None:
+            raise SQLAdapterException('adapter is not connected')
+        if self.engine == 'mysql':
+            return await self._execute_mysql(query, params)
+        return await self._execute_postgres(query, params)
+
+    async def pipeline(self, statements: Sequence[Tuple[str, Optional[Sequence[Any]]]]) -> list[AsyncResult]:
+        if self.pool is None:
+            raise SQLAdapterException('adapter is not connected')
+        if self.engine == 'mysql':
+            return await self._pipeline_mysql(statements)
+        return await self._pipeline_postgres(statements)
+
+    async def stream(self, query: str, params: Optional[Sequence[Any]], chunk_size: int) -> AsyncIterator[list[JSONDict]]:
+        if self.pool is None:
+            raise SQLAdapterException('adapter is not connected')
+        if self.engine == 'mysql':
+            import aiomysql  # pylint: disable=import-outside-toplevel
+            async with self.pool.acquire() as connection:
+                async with connection.cursor(aiomysql.SSDictCursor) as cursor:
+                    await cursor.execute(query, params)
+                    while rows := await cursor.fetchmany(chunk_size):
+                        yield list(rows)
+            return
+        async with self.pool.connection() as connection:
+            async with connection.transaction():
+                async with connection.cursor(name=f'daplug_stream_{uuid.uuid4().hex}') as cursor:
+                    await cursor.execute(query, params)
+                    while rows := await cursor.fetchmany(chunk_size):
+                        yield list(rows)
+
+    async def _open_postgres(self) -> Any:
+        try:
+            from psycopg.rows import dict_row  # pylint: disable=import-outside-toplevel
+            from psycopg_pool import AsyncConnectionPool  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise SQLAdapterException('AsyncSQLAdapter requires psycopg[pool] for postgres: pip install daplug-sql[async]') from error
+        pool = AsyncConnectionPool(
+            conninfo='',
+            kwargs={
+                'dbname': self.database,
+                'host': self.endpoint,
+                'port': self.port,
+                'user': self.user,
+                'password': self.password,
+                'autocommit': True,
+                'row_factory': dict_row,
+            },
+            min_size=self.min_size,
+            max_size=self.max_size,
+            timeout=self.timeout,
+            max_idle=self.idle_timeout,
+            open=False,
+        )
+        await pool.open()
+        return pool
+
+    async def _open_mysql(self) -> Any:
+        try:
+            import aiomysql  # pylint: disable=import-outside-toplevel
+        except ImportError as error:
+            raise SQLAdapterException('AsyncSQLAdapter requires aiomysql for mysql: pip install daplug-sql[async]') from error
+        return await aiomysql.create_pool(
+            host=self.endpoint,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            db=self.database,
+            minsize=self.min_size,
+            maxsize=self.max_size,
+            pool_recycle=int(self.idle_timeout),
+            autocommit=True,
+            charset='utf8mb4',
+            cursorclass=aiomysql.DictCursor,
+        )
+
+    async def _execute_postgres(self, query: str, params: Optional[Sequence[Any]]) -> AsyncResult:
+        async with self.pool.connection() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall() if cursor.description else []
+                return list(rows), cursor.rowcount
+
+    async def _execute_mysql(self, query: str, params: Optional[Sequence[Any]]) -> AsyncResult:
+        async with self.pool.acquire() as connection:
+            async with connection.cursor() as cursor:
+                await cursor.execute(query, params)
+                rows = await cursor.fetchall() if cursor.description else []
+                return list(rows), cursor.rowcount
+
+    async def _pipeline_postgres(self, statements: Sequence[Tuple[str, Optional[Sequence[Any]]]]) -> list[AsyncResult]:
+        async with self.pool.connection() as connection:
+            cursors = []
+            async with connection.pipeline():
+                async with connection.transaction():
+                    for query, params in statements:
+                        cursor = connection.cursor()
+                        await cursor.execute(query, params)
+                        cursors.append(cursor)
+            results = []
+            for cursor in cursors:
+                results.append((list(await cursor.fetchall()) if cursor.description else [], cursor.rowcount))
+                await cursor.close()
+            return results
+
+    async def _pipeline_mysql(self, statements: Sequence[Tuple[str, Optional[Sequence[Any]]]]) -> list[AsyncResult]:
+        async with self.pool.acquire() as connection:
+            await connection.begin()
+            try:
+                results = []
+                async with connection.cursor() as cursor:
+                    for query, params in statements:
+                        await cursor.execute(query, params)
+                        results.append((list(await cursor.fetchall()) if cursor.description else [], cursor.rowcount))
+                await connection.commit()
+                return results
+            except BaseException:
+                await connection.rollback()
+                raise
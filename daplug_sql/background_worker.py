@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class BackgroundWorker:
+
+    STOP = object()
+
+    def __init__(self, name: str, handle: Callable[[List[Any]], None], **kwargs: Any) -> None:
+        self.name: str = name
+        self.handle: Callable[[List[Any]], None] = handle
+        self.on_stop: Optional[Callable[[], None]] = kwargs.get('on_stop')
+        self.linger: float = float(kwargs.get('linger', 0.0))
+        self.batch_size: int = int(kwargs.get('batch_size', 1))
+        self.queue: queue.Queue[Any] = queue.Queue(maxsize=int(kwargs.get('queue_size', 0)))
+        self.lock: threading.Lock = threading.Lock()
+        self.thread: Optional[threading.Thread] = None
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> None:
+        self.__start()
+        self.queue.put(item, timeout=timeout)
+
+    def join(self) -> None:
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self) -> None:
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is None:
+            return
+        self.queue.put(self.STOP)
+        thread.join()
+
+    def __start(self) -> None:
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.__run, name=self.name, daemon=True)
+                self.thread.start()
+
+    def __run(self) -> None:
+        stopping = False
+        try:
+            while not stopping:
+                batch, stopping = self.__collect()
+                if not batch:
+                    return
+                try:
+                    self.handle(batch)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            if self.on_stop is not None:
+                self.on_stop()
+
+    def __collect(self) -> Tuple[List[Any], bool]:
+        item = self.queue.get()
+        if item is self.STOP:
+            self.queue.task_done()
+            return [], True
+        batch = [item]
+        deadline = time.monotonic() + self.linger
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self.STOP:
+                self.queue.task_done()
+                return batch, True
+            batch.append(item)
+        return batch, False
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import queue
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import boto3
+import simplejson as json
+from daplug_core import logger  # type: ignore[import-untyped]
+
+from .background_worker import BackgroundWorker
+from .types import JSONDict
+
+FailureCallback = Callable[[JSONDict, Any], Any]
+TopicKey = Tuple[Optional[str], str]
+PUBLISH_MODES = ('inline', 'batch', 'outbox')
+
+
+def configured_publisher(**kwargs: Any) -> Optional['BatchPublisher']:
+    mode = kwargs.get('publish_mode', 'inline')
+    if mode not in PUBLISH_MODES:
+        raise ValueError(f'publish_mode must be one of {PUBLISH_MODES}')
+    if mode != 'batch':
+        return None
+    return BatchPublisher(
+        batch_size=kwargs.get('publish_batch_size', BatchPublisher.MAX_BATCH_SIZE),
+        queue_size=kwargs.get('publish_queue_size', 10000),
+        linger=kwargs.get('publish_linger', 0.05),
+        timeout=kwargs.get('publish_timeout', 1.0),
+        on_failure=kwargs.get('publish_on_failure'),
+        client=kwargs.get('sns_client'),
+        endpoint=kwargs.get('sns_endpoint'),
+        region=kwargs.get('sns_region'),
+    )
+
+
+class BatchPublisher:
+
+    MAX_BATCH_SIZE = 10
+    MAX_REQUEST_BYTES = 256 * 1024
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.batch_size: int = int(kwargs.get('batch_size', self.MAX_BATCH_SIZE))
+        self.linger: float = float(kwargs.get('linger', 0.05))
+        self.timeout: Optional[float] = kwargs.get('timeout', 1.0)
+        self.region: Optional[str] = kwargs.get('region')
+        self.on_failure: Optional[FailureCallback] = kwargs.get('on_failure')
+        self.clients: Dict[Optional[str], Any] = {}
+        if kwargs.get('client') is not None:
+            self.clients[kwargs.get('endpoint')] = kwargs['client']
+        self.worker: BackgroundWorker = BackgroundWorker(
+            'daplug-sql-publisher',
+            self.__deliver,
+            linger=float(kwargs.get('linger', 0.05)),
+            batch_size=self.batch_size,
+            queue_size=int(kwargs.get('queue_size', 10000)),
+        )
+        if not 0 < self.batch_size <= self.MAX_BATCH_SIZE:
+            raise ValueError(f'batch_size must be between 1 and {self.MAX_BATCH_SIZE}')
+
+    def publish(self, **kwargs: Any) -> None:
+        if not kwargs.get('arn') or not kwargs.get('data'):
+            return
+        try:
+            self.worker.put(kwargs, timeout=self.timeout)
+        except queue.Full as error:
+            self.__fail(kwargs, error)
+
+    def flush(self) -> None:
+        self.worker.join()
+
+    def close(self) -> None:
+        self.worker.close()
+
+    def __deliver(self, batch: List[JSONDict]) -> None:
+        for event, error in self.send(batch):
+            self.__fail(event, error)
+
+    def send(self, events: List[JSONDict]) -> List[Tuple[JSONDict, Any]]:
+        topics: Dict[TopicKey, List[JSONDict]] = {}
+        for event in events:
+            topics.setdefault((event.get('endpoint'), event['arn']), []).append(event)
+        failures: List[Tuple[JSONDict, Any]] = []
+        for (endpoint, arn), events_for_topic in topics.items():
+            for group, entries in self.__requests(events_for_topic):
+                try:
+                    response = self.__client(endpoint).publish_batch(TopicArn=arn, PublishBatchRequestEntries=entries)
+                except Exception as error:  # pylint: disable=broad-except
+                    failures.extend((event, error) for event in group)
+                    continue
+                failures.extend((group[int(failed['Id'])], failed) for failed in response.get('Failed', []))
+        return failures
+
+    def __requests(self, events: List[JSONDict]) -> List[Tuple[List[JSONDict], List[JSONDict]]]:
+        requests: List[Tuple[List[JSONDict], List[JSONDict]]] = []
+        group: List[JSONDict] = []
+        entries: List[JSONDict] = []
+        size = 0
+        for event in events:
+            entry = self.__entry(len(entries), event)
+            entry_size = self.__entry_size(entry)
+            if entries and (len(entries) == self.batch_size or size + entry_size > self.MAX_REQUEST_BYTES):
+                requests.append((group, entries))
+                entry, group, entries, size = {**entry, 'Id': '0'}, [], [], 0
+            group.append(event)
+            entries.append(entry)
+            size += entry_size
+        if entries:
+            requests.append((group, entries))
+        return requests
+
+    @staticmethod
+    def __entry_size(entry: JSONDict) -> int:
+        size = len(entry['Message'].encode('utf-8'))
+        for name, attribute in entry['MessageAttributes'].items():
+            size += len(name.encode('utf-8')) + len(str(attribute.get('DataType', '')).encode('utf-8'))
+            value = attribute.get('StringValue', attribute.get('BinaryValue', b''))
+            size += len(value) if isinstance(value, (bytes, bytearray)) else len(str(value).encode('utf-8'))
+        return size
+
+    def __entry(self, index: int, event: JSONDict) -> JSONDict:
+        entry: JSONDict = {
+            'Id': str(index),
+            'Message': event['message'] if 'message' in event else json.dumps(event['data'], default=str),
+            'MessageAttributes': event.get('attributes') or {},
+        }
+        if event.get('fifo_group_id'):
+            entry['MessageGroupId'] = event['fifo_group_id']
+        if event.get('fifo_duplication_id'):
+            entry['MessageDeduplicationId'] = event['fifo_duplication_id']
+        return entry
+
+    def __client(self, endpoint: Optional[str]) -> Any:
+        if endpoint not in self.clients:
+            self.clients[endpoint] = boto3.client('sns', region_name=self.region, endpoint_url=endpoint)
+        return self.clients[endpoint]
+
+    def __fail(self, event: JSONDict, error: Any) -> None:
+        logger.log(level='WARN', log={'error': f'publish_sns_error: {error}', 'arn': event.get('arn')})
+        if self.on_failure is None:
+            return
+        try:
+            self.on_failure(event, error)
+        except Exception as callback_error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'publish_failure_callback_error: {callback_error}'})
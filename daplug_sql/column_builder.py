@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import Any, List, Sequence
+
+from .exception import SQLAdapterException
+
+
+class ColumnBuilder:
+
+    OUTPUTS = ('list', 'numpy', 'arrow')
+
+    def __init__(self, output: str = 'list') -> None:
+        if output not in self.OUTPUTS:
+            raise ValueError(f'output must be one of {self.OUTPUTS}')
+        self.output: str = output
+        self.names: List[str] = []
+        self.columns: List[List[Any]] = []
+
+    def describe(self, description: Sequence[Sequence[Any]]) -> None:
+        names = [column[0] for column in description]
+        if len(set(names)) != len(names):
+            raise ValueError(f'duplicate column names in result; alias them to build columns: {names}')
+        self.names = names
+        self.columns = [[] for _ in names]
+
+    def extend(self, rows: Sequence[Sequence[Any]]) -> None:
+        for column, values in zip(self.columns, zip(*rows)):
+            column.extend(values)
+
+    def build(self) -> Any:
+        if self.output == 'numpy':
+            numpy = self.__require('numpy')
+            return {name: numpy.asarray(values) for name, values in zip(self.names, self.columns)}
+        if self.output == 'arrow':
+            pyarrow = self.__require('pyarrow')
+            return pyarrow.Table.from_arrays([pyarrow.array(values) for values in self.columns], names=self.names)
+        return dict(zip(self.names, self.columns))
+
+    def __require(self, module: str) -> Any:
+        try:
+            return __import__(module)
+        except ImportError as error:
+            raise SQLAdapterException(f'output="{self.output}" requires {module}: pip install daplug-sql[{self.output}]') from error
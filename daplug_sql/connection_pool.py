@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+from .exception import SQLAdapterException
+from .sql_connector import SQLConnector
+from .types import ConnectionProtocol
+
+
+def is_connection_closed(connection: ConnectionProtocol | None) -> bool:
+    if not connection:
+        return True
+    closed_attr = getattr(connection, 'closed', None)
+    if closed_attr is not None:
+        return bool(closed_attr)
+    open_attr = getattr(connection, 'open', None)
+    if open_attr is not None:
+        return open_attr == 0
+    is_connected = getattr(connection, 'is_connected', None)
+    if callable(is_connected):
+        return not is_connected()
+    return False
+
+
+def close_connector(connector: SQLConnector) -> None:
+    connection = getattr(connector, 'connection', None)
+    if connection:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    connector.connection = None
+
+
+ConnectorFactory = Callable[[], SQLConnector]
+
+
+class ConnectionPool:
+
+    def __init__(self, factory: Optional[ConnectorFactory] = None, **kwargs: Any) -> None:
+        self.factory: Optional[ConnectorFactory] = factory
+        self.min_size: int = int(kwargs.get('min_size', 1))
+        self.max_size: int = int(kwargs.get('max_size', 10))
+        self.timeout: float = float(kwargs.get('timeout', 30))
+        self.idle_timeout: float = float(kwargs.get('idle_timeout', 300))
+        if self.min_size < 0 or self.max_size < max(self.min_size, 1):
+            raise ValueError('pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1')
+        self.idle: List[Tuple[SQLConnector, float]] = []
+        self.size: int = 0
+        self.closed: bool = False
+        self.condition = threading.Condition()
+
+    def checkout(self, timeout: float | None = None, factory: Optional[ConnectorFactory] = None) -> SQLConnector:
+        create = factory or self.factory
+        if create is None:
+            raise ValueError('checkout needs a connector factory when the pool has none')
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self.condition:
+            while True:
+                if self.closed:
+                    raise SQLAdapterException('connection pool is closed')
+                self.__reap()
+                if self.idle:
+                    connector, _ = self.idle.pop()
+                    return connector
+                if self.size < self.max_size:
+                    self.size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SQLAdapterException(f'timed out waiting for a connection after {self.timeout}s')
+                self.condition.wait(remaining)
+        try:
+            return create()
+        except Exception:
+            self.__release_slot()
+            raise
+
+    def checkin(self, connector: SQLConnector) -> None:
+        connection = getattr(connector, 'connection', None)
+        if self.closed or is_connection_closed(connection) or not self.__reset(connection):
+            self.discard(connector)
+            return
+        with self.condition:
+            self.idle.append((connector, time.monotonic()))
+            self.condition.notify()
+
+    def discard(self, connector: SQLConnector) -> None:
+        close_connector(connector)
+        self.__release_slot()
+
+    def close(self) -> None:
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+            self.size -= len(idle)
+            self.condition.notify_all()
+        for connector, _ in idle:
+            close_connector(connector)
+
+    def __reap(self) -> None:
+        cutoff = time.monotonic() - self.idle_timeout
+        keep: List[Tuple[SQLConnector, float]] = []
+        for connector, returned_at in self.idle:
+            stale = returned_at < cutoff and self.size > self.min_size
+            if stale or is_connection_closed(getattr(connector, 'connection', None)):
+                close_connector(connector)
+                self.size -= 1
+            else:
+                keep.append((connector, returned_at))
+        self.idle = keep
+
+    def __reset(self, connection: ConnectionProtocol | None) -> bool:
+        if connection is None or getattr(connection, 'autocommit', True):
+            return True
+        try:
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    def __release_slot(self) -> None:
+        with self.condition:
+            self.size -= 1
+            self.condition.notify()
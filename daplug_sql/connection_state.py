@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple
+
+from .types import ConnectionProtocol, CursorProtocol
+
+if TYPE_CHECKING:
+    from .sql_connector import SQLConnector
+
+
+class ConnectionState:
+
+    def __init__(self) -> None:
+        self.connector: Optional['SQLConnector'] = None
+        self.connection: ConnectionProtocol | None = None
+        self.cursor: CursorProtocol | None = None
+        self.result: CursorProtocol | None = None
+        self.transaction_depth: int = 0
+        self.savepoints: int = 0
+        self.deferred: Optional[List[Tuple[Any, dict[str, Any]]]] = None
+
+
+class ThreadOwner:
+    pass
+
+
+class ConnectionStates:
+
+    def __init__(self, thread_safe: bool = False, on_release: Optional[Callable[[ConnectionState], None]] = None) -> None:
+        self.thread_safe: bool = thread_safe
+        self.on_release: Optional[Callable[[ConnectionState], None]] = on_release
+        self.shared: ConnectionState = ConnectionState()
+        self.local = threading.local()
+        self.registry: List[ConnectionState] = []
+        self.lock = threading.Lock()
+
+    def current(self) -> ConnectionState:
+        if not self.thread_safe:
+            return self.shared
+        state: Optional[ConnectionState] = getattr(self.local, 'state', None)
+        if state is None:
+            state = ConnectionState()
+            self.local.owner = ThreadOwner()
+            self.local.state = state
+            self.local.finalizer = weakref.finalize(self.local.owner, self.release, state)
+            self.local.finalizer.atexit = False
+            with self.lock:
+                self.registry.append(state)
+        return state
+
+    def others(self) -> List[ConnectionState]:
+        if not self.thread_safe:
+            return []
+        current = self.current()
+        with self.lock:
+            return [state for state in self.registry if state is not current]
+
+    def release(self, state: Optional[ConnectionState] = None) -> None:
+        if not self.thread_safe:
+            return
+        if state is None:
+            state = getattr(self.local, 'state', None)
+            if state is None:
+                return
+            self.local.finalizer.detach()
+            self.local.state, self.local.owner, self.local.finalizer = None, None, None
+        with self.lock:
+            if state not in self.registry:
+                return
+            self.registry.remove(state)
+        if self.on_release is not None:
+            self.on_release(state)
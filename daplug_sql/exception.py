@@ -1,6 +1,38 @@
+from typing import Any, NoReturn
+
+
 class SQLAdapterException(Exception):
     """Base exception for SQL adapter errors."""
 
 
 class CreateTableException(SQLAdapterException):
     """Raised when create-table rules are violated."""
+
+
+def validate_read(**kwargs: Any) -> None:
+    if 'params' not in kwargs:
+        raise_error('PARAMS_REQUIRED', **kwargs)
+    if any(word in kwargs['query'].lower() for word in ['insert', 'update', 'delete']):
+        raise_error('READ_ONLY', **kwargs)
+
+
+def raise_error(error_type: str, **kwargs: Any) -> NoReturn:
+    if error_type == 'PARAMS_REQUIRED':
+        raise SQLAdapterException('params kwargs are required to prevent sql inject; send empty dict if not needed')
+    if error_type == 'READ_ONLY':
+        raise SQLAdapterException(
+            'query method is for read-only operations; please use another function for destructive operations'
+        )
+    if error_type == 'TABLE_WRITE_ONLY':
+        raise CreateTableException(
+            'create table query-string must start with "create table"'
+        )
+    if error_type == 'NOT_UNIQUE':
+        raise SQLAdapterException(
+            f'row already exist with {kwargs["identifier"]} = {kwargs.get("data", {}).get(kwargs["identifier"])}'
+        )
+    if error_type == 'NOT_EXISTS':
+        raise SQLAdapterException(
+            f'row does not exist with {kwargs["identifier"]} = {kwargs.get("data", {}).get(kwargs["identifier"])}'
+        )
+    raise SQLAdapterException(f'Something went wrong and I am not sure how I got here: {error_type}')
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import functools
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, TypeVar
+
+from daplug_core import logger  # type: ignore[import-untyped]
+
+from .adapter_base import worker_config
+from .background_worker import BackgroundWorker
+from .batch_publisher import BatchPublisher
+from .types import JSONDict
+
+if TYPE_CHECKING:
+    from .adapter import SQLAdapter
+
+PendingWrite = Tuple[str, Tuple[Any, ...], JSONDict, 'Future[Any]']
+MethodT = TypeVar('MethodT', bound=Callable[..., Any])
+
+
+def grouped(method: MethodT) -> MethodT:
+
+    @functools.wraps(method)
+    def decorator(adapter: 'SQLAdapter', *args: Any, **kwargs: Any) -> Any:
+        committer = adapter.group_committer
+        if committer is None or adapter.states.current().transaction_depth:
+            return method(adapter, *args, **kwargs)
+        return committer.submit(method.__name__, args, kwargs)
+
+    return decorator  # type: ignore[return-value]
+
+
+class CallFailed(Exception):
+
+    def __init__(self, index: int, error: Exception) -> None:
+        super().__init__(str(error))
+        self.index: int = index
+        self.error: Exception = error
+
+
+class GroupCommitter:
+
+    def __init__(self, adapter: 'SQLAdapter', **kwargs: Any) -> None:
+        self.factory: Callable[..., 'SQLAdapter'] = type(adapter)
+        self.publisher: Optional[BatchPublisher] = adapter.batch_publisher
+        self.config: JSONDict = worker_config(adapter.config, **({'publish_mode': 'inline'} if self.publisher else {}))
+        self.window: float = float(kwargs.get('window', 0.005))
+        self.size: int = int(kwargs.get('size', 100))
+        self.writer: Optional['SQLAdapter'] = None
+        self.worker: BackgroundWorker = BackgroundWorker(
+            'daplug-sql-group-commit', self.__write, linger=self.window, batch_size=self.size, on_stop=self.__discard
+        )
+        if self.window < 0 or self.size <= 0:
+            raise ValueError('group_commit_window must be >= 0 and group_commit_size must be positive')
+
+    def submit(self, method: str, args: Tuple[Any, ...], kwargs: JSONDict) -> Any:
+        future: Future[Any] = Future()
+        self.worker.put((method, args, kwargs, future))
+        return future.result()
+
+    def close(self) -> None:
+        self.worker.close()
+
+    def __write(self, group: List[PendingWrite]) -> None:
+        try:
+            if self.writer is None:
+                self.writer = self.factory(**self.config)
+                if self.publisher is not None:
+                    self.writer.publisher = self.publisher
+                self.writer.connect()  # pylint: disable=no-value-for-parameter
+            self.__commit(self.writer, group)
+        except Exception as error:  # pylint: disable=broad-except
+            self.__fail(group, error)
+            self.__discard()
+
+    def __commit(self, writer: 'SQLAdapter', group: List[PendingWrite]) -> None:
+        while group:
+            results: List[Any] = []
+            try:
+                with writer.transaction():
+                    for index, (method, args, kwargs, _) in enumerate(group):
+                        try:
+                            results.append(getattr(writer, method)(*args, **kwargs))
+                        except Exception as error:
+                            raise CallFailed(index, error) from error
+            except CallFailed as failed:
+                group[failed.index][3].set_exception(failed.error)
+                group = group[:failed.index] + group[failed.index + 1:]
+                continue
+            for (_, _, _, future), result in zip(group, results):
+                future.set_result(result)
+            return
+
+    def __fail(self, group: List[PendingWrite], error: Exception) -> None:
+        logger.log(level='ERROR', log={'error': f'group_commit_error: {error}', 'writes': len(group)})
+        for _, _, _, future in group:
+            if not future.done():
+                future.set_exception(error)
+
+    def __discard(self) -> None:
+        writer, self.writer = self.writer, None
+        if writer is None:
+            return
+        try:
+            writer.close()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'group_commit_close_error: {error}'})
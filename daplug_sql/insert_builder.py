@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any, List, Sequence, Tuple
+
+from .param_adapter import ParamAdapter
+from .statement_builder import StatementBuilder
+from .statement_cache import statement_cache
+from .types import JSONDict
+
+
+class InsertBuilder:
+
+    def __init__(self, engine: str, **kwargs: Any) -> None:
+        self.engine: str = engine
+        self.driver: str = kwargs.get('driver', 'psycopg2')
+        self.statements: StatementBuilder = StatementBuilder(engine)
+        self.rows: List[JSONDict] = list(kwargs['rows'])
+        self.table: str = kwargs['table']
+        self.identifier: str = kwargs['identifier']
+        self.columns: List[str] = list(self.rows[0].keys()) if self.rows else []
+
+    def build(self) -> Tuple[str, Tuple[Any, ...]]:
+        self.__validate()
+        key = ('insert_many', self.engine, self.table, self.identifier, tuple(self.columns), len(self.rows))
+        return statement_cache.get(key, self.__compile), self.__insert_params()
+
+    def build_existing(self) -> Tuple[str, Tuple[Any, ...]]:
+        self.__validate()
+        key = ('insert_many_existing', self.engine, self.table, self.identifier, len(self.rows))
+        return statement_cache.get(key, self.__compile_existing), tuple(row[self.identifier] for row in self.rows)
+
+    def __compile(self) -> str:
+        query = (
+            f'INSERT INTO {self.__format(self.table)} ({self.__column_clause()}) '
+            f'VALUES {self.__values_clause()}'
+        )
+        if self.engine != 'mysql':
+            identifier = self.__format(self.identifier)
+            query += f' ON CONFLICT ({identifier}) DO NOTHING RETURNING {identifier}'
+        return query
+
+    def __compile_existing(self) -> str:
+        identifier = self.__format(self.identifier)
+        placeholders = self.statements.placeholders(len(self.rows))
+        return f'SELECT {identifier} FROM {self.__format(self.table)} WHERE {identifier} IN ({placeholders})'
+
+    def __validate(self) -> None:
+        if not self.columns:
+            raise ValueError('no data supplied for insert operation')
+        for row in self.rows:
+            if self.identifier not in row:
+                raise KeyError(f'identifier "{self.identifier}" missing from payload for insert')
+            if list(row.keys()) != self.columns:
+                raise ValueError('all rows in an insert batch must share the same columns')
+
+    def __column_clause(self) -> str:
+        return ', '.join(self.__format(column) for column in self.columns)
+
+    def __values_clause(self) -> str:
+        row_placeholder = f'({self.statements.placeholders(len(self.columns))})'
+        return ', '.join([row_placeholder] * len(self.rows))
+
+    def __insert_params(self) -> Tuple[Any, ...]:
+        adapter = ParamAdapter(self.engine, self.driver)
+        params: List[Any] = []
+        for row in self.rows:
+            params.extend(adapter.sequence(self.__row_values(row)))
+        return tuple(params)
+
+    def __row_values(self, row: JSONDict) -> Sequence[Any]:
+        return tuple(row[column] for column in self.columns)
+
+    def __format(self, value: str) -> str:
+        return self.statements.format(value)
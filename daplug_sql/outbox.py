@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Sequence, TypeVar
+
+import simplejson as json
+from daplug_core import logger  # type: ignore[import-untyped]
+
+from .adapter_base import worker_config
+from .batch_publisher import BatchPublisher, FailureCallback
+from .exception import SQLAdapterException
+from .statement_builder import StatementBuilder
+from .types import ConnectionProtocol, CursorProtocol, JSONDict
+
+if TYPE_CHECKING:
+    from .adapter import SQLAdapter
+
+OUTBOX_TABLE = 'daplug_outbox'
+OUTBOX_COLUMNS = ['topic_arn', 'endpoint', 'message', 'attributes', 'fifo_group_id', 'fifo_duplication_id']
+Execute = Callable[..., None]
+MethodT = TypeVar('MethodT', bound=Callable[..., Any])
+
+
+def outbox_table_statement(engine: str, table: str = OUTBOX_TABLE) -> str:
+    statements = StatementBuilder(engine)
+    columns = [statements.format(column) for column in ['id', *OUTBOX_COLUMNS, 'created_at']]
+    if engine == 'mysql':
+        types = [
+            'BIGINT AUTO_INCREMENT PRIMARY KEY', 'VARCHAR(512) NOT NULL', 'VARCHAR(512)', 'LONGTEXT NOT NULL',
+            'TEXT', 'VARCHAR(128)', 'VARCHAR(128)', 'TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)',
+        ]
+    else:
+        types = [
+            'BIGSERIAL PRIMARY KEY', 'TEXT NOT NULL', 'TEXT', 'TEXT NOT NULL',
+            'TEXT', 'TEXT', 'TEXT', 'TIMESTAMPTZ NOT NULL DEFAULT now()',
+        ]
+    definitions = ', '.join(f'{column} {column_type}' for column, column_type in zip(columns, types))
+    return f'CREATE TABLE IF NOT EXISTS {statements.format(table)} ({definitions})'
+
+
+def outboxed(method: MethodT) -> MethodT:
+
+    @functools.wraps(method)
+    def decorator(adapter: 'SQLAdapter', *args: Any, **kwargs: Any) -> Any:
+        writer = adapter.publisher
+        if not isinstance(writer, OutboxWriter):
+            return method(adapter, *args, **kwargs)
+        with adapter.transactions.transaction(commit=kwargs.get('commit', False)):
+            return method(adapter, *args, **kwargs)
+
+    return decorator  # type: ignore[return-value]
+
+
+class OutboxWriter:
+
+    def __init__(self, adapter: 'SQLAdapter', execute: Execute, table: str = OUTBOX_TABLE) -> None:
+        self.adapter: 'SQLAdapter' = adapter
+        self.execute: Execute = execute
+        self.table: str = table
+        self.insert: str = StatementBuilder(adapter.engine).insert(table, OUTBOX_COLUMNS)
+
+    def publish(self, **kwargs: Any) -> None:
+        if not kwargs.get('arn') or not kwargs.get('data'):
+            return
+        self.execute(self.insert, (
+            kwargs['arn'],
+            kwargs.get('endpoint'),
+            json.dumps(kwargs['data'], default=str),
+            json.dumps(kwargs.get('attributes') or {}, default=str),
+            kwargs.get('fifo_group_id'),
+            kwargs.get('fifo_duplication_id'),
+        ))
+
+
+class OutboxRelay:
+
+    def __init__(self, adapter: 'SQLAdapter', **kwargs: Any) -> None:
+        self.adapter: 'SQLAdapter' = adapter
+        self.factory: Callable[..., 'SQLAdapter'] = type(adapter)
+        self.config: JSONDict = worker_config(adapter.config, publish_mode='inline')
+        self.reader: Optional['SQLAdapter'] = None
+        self.statements: StatementBuilder = StatementBuilder(adapter.engine)
+        self.table: str = kwargs.get('table', getattr(adapter, 'outbox_table', OUTBOX_TABLE))
+        self.batch_size: int = int(kwargs.get('batch_size', 500))
+        self.interval: float = float(kwargs.get('interval', 1.0))
+        self.on_failure: Optional[FailureCallback] = kwargs.get('on_failure')
+        self.publisher: BatchPublisher = BatchPublisher(
+            client=kwargs.get('sns_client'),
+            endpoint=adapter.sns_endpoint,
+            region=kwargs.get('sns_region'),
+        )
+        self.stopped: threading.Event = threading.Event()
+        if self.batch_size <= 0:
+            raise ValueError('batch_size must be a positive integer')
+
+    def relay(self) -> int:
+        reader = self.__connect()
+        cursor, connection = reader.cursor, reader.connection
+        if not cursor or not connection:
+            self.close()
+            raise SQLAdapterException('outbox relay is not connected')
+        explicit = bool(connection.autocommit)
+        try:
+            if explicit:
+                cursor.execute('START TRANSACTION' if self.adapter.engine == 'mysql' else 'BEGIN')
+            cursor.execute(self.__select(), (self.batch_size,))
+            rows = list(cursor.fetchall())
+            delivered = self.__deliver(rows)
+            if delivered:
+                cursor.execute(*self.__delete(delivered))
+            if explicit:
+                cursor.execute('COMMIT')
+            else:
+                connection.commit()
+            return len(delivered)
+        except Exception as error:
+            self.__rollback(cursor, connection, explicit)
+            raise SQLAdapterException(f'outbox relay failed - {error}') from error
+
+    def run(self) -> None:
+        self.stopped.clear()
+        try:
+            while not self.stopped.is_set():
+                try:
+                    relayed = self.relay()
+                except SQLAdapterException as error:
+                    logger.log(level='ERROR', log={'error': str(error)})
+                    relayed = 0
+                if relayed < self.batch_size:
+                    self.stopped.wait(self.interval)
+        finally:
+            self.close()
+
+    def stop(self) -> None:
+        self.stopped.set()
+
+    def close(self) -> None:
+        reader, self.reader = self.reader, None
+        if reader is None:
+            return
+        try:
+            reader.close()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'outbox_relay_close_error: {error}'})
+
+    def __connect(self) -> 'SQLAdapter':
+        if self.reader is None:
+            reader = self.factory(**self.config)
+            try:
+                reader.connect()  # pylint: disable=no-value-for-parameter
+            except Exception as error:
+                raise SQLAdapterException(f'outbox relay could not connect - {error}') from error
+            self.reader = reader
+        return self.reader
+
+    def __rollback(self, cursor: CursorProtocol, connection: ConnectionProtocol, explicit: bool) -> None:
+        try:
+            if explicit:
+                cursor.execute('ROLLBACK')
+            else:
+                connection.rollback()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'outbox_relay_rollback_error: {error}'})
+            self.close()
+
+    def __deliver(self, rows: List[JSONDict]) -> List[Any]:
+        events = [{
+            'outbox_id': row['id'],
+            'arn': row['topic_arn'],
+            'endpoint': row['endpoint'],
+            'message': row['message'],
+            'attributes': json.loads(row['attributes']) if row['attributes'] else {},
+            'fifo_group_id': row['fifo_group_id'],
+            'fifo_duplication_id': row['fifo_duplication_id'],
+        } for row in rows]
+        failed = set()
+        for event, error in self.publisher.send(events):
+            failed.add(event['outbox_id'])
+            logger.log(level='WARN', log={'error': f'outbox_publish_error: {error}', 'outbox_id': event['outbox_id']})
+            if self.on_failure is None:
+                continue
+            try:
+                self.on_failure(event, error)
+            except Exception as callback_error:  # pylint: disable=broad-except
+                logger.log(level='ERROR', log={'error': f'publish_failure_callback_error: {callback_error}'})
+        return [event['outbox_id'] for event in events if event['outbox_id'] not in failed]
+
+    def __select(self) -> str:
+        table, identifier = self.statements.format(self.table), self.statements.format('id')
+        return f'SELECT * FROM {table} ORDER BY {identifier} LIMIT %s FOR UPDATE SKIP LOCKED'
+
+    def __delete(self, identifiers: Sequence[Any]) -> tuple[str, tuple[Any, ...]]:
+        table, identifier = self.statements.format(self.table), self.statements.format('id')
+        if self.adapter.engine == 'mysql':
+            return f'DELETE FROM {table} WHERE {identifier} IN ({self.statements.placeholders(len(identifiers))})', tuple(identifiers)
+        return f'DELETE FROM {table} WHERE {identifier} = ANY(%s)', (list(identifiers),)
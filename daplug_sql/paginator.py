@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+
+from .exception import SQLAdapterException, raise_error
+from .statement_builder import StatementBuilder
+from .statement_cache import statement_cache
+from .types import JSONDict
+
+
+class Paginator:
+
+    PAGE_SIZE = 100
+
+    def __init__(self, engine: str, **kwargs: Any) -> None:
+        self.engine: str = engine
+        self.statements: StatementBuilder = StatementBuilder(engine)
+        self.table: str = kwargs['table']
+        self.identifier: str = kwargs['identifier']
+        self.page_size: int = int(kwargs.get('page_size', self.PAGE_SIZE))
+        self.after: Optional[str] = kwargs.get('after')
+        self.where: Optional[str] = kwargs.get('where')
+        self.params: Tuple[Any, ...] = tuple(kwargs.get('params') or ())
+        if self.page_size <= 0:
+            raise ValueError('page_size must be a positive integer')
+        if self.where and 'params' not in kwargs:
+            raise_error('PARAMS_REQUIRED', **kwargs)
+
+    def build(self) -> Tuple[str, Tuple[Any, ...]]:
+        key = ('paginate', self.engine, self.table, self.identifier, self.where, self.after is not None)
+        params = self.params
+        if self.after is not None:
+            params += (self.decode(self.after),)
+        return statement_cache.get(key, self.__compile), params + (self.page_size + 1,)
+
+    def page(self, rows: List[JSONDict]) -> JSONDict:
+        items = rows[:self.page_size]
+        has_more = len(rows) > self.page_size
+        return {'items': items, 'next': self.encode(items[-1][self.identifier]) if has_more else None}
+
+    @staticmethod
+    def encode(value: Any) -> str:
+        payload = json.dumps({'after': value}, default=str).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii')
+
+    @staticmethod
+    def decode(token: str) -> Any:
+        try:
+            return json.loads(base64.urlsafe_b64decode(token.encode('ascii')))['after']
+        except (binascii.Error, UnicodeError, ValueError, KeyError, TypeError) as error:
+            raise SQLAdapterException(f'invalid pagination token: {token}') from error
+
+    def __compile(self) -> str:
+        identifier = self.statements.format(self.identifier)
+        conditions = [f'({self.where})'] if self.where else []
+        if self.after is not None:
+            conditions.append(f'{identifier} > %s')
+        where_clause = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        return f'SELECT * FROM {self.statements.format(self.table)}{where_clause} ORDER BY {identifier} LIMIT %s'
+
+
+class PageWalk:
+
+    def __init__(self, after: Optional[str] = None) -> None:
+        self.after: Optional[str] = after
+        self.done: bool = False
+
+    def advance(self, page: JSONDict) -> List[JSONDict]:
+        self.after = page['next']
+        self.done = self.after is None
+        return page['items']
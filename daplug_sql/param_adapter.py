@@ -8,14 +8,18 @@ from psycopg2.extras import Json  # type: ignore[import-untyped]
 
 class ParamAdapter:
 
-    def __init__(self, engine: str) -> None:
+    def __init__(self, engine: str, driver: str = 'psycopg2') -> None:
         self.engine: str = engine.lower()
+        self.driver: str = driver
 
     def value(self, value: Any) -> Any:
         if not isinstance(value, (dict, list)):
             return value
         if self.engine == 'mysql':
             return json.dumps(value)
+        if self.driver == 'psycopg':
+            from psycopg.types.json import Jsonb  # pylint: disable=import-outside-toplevel
+            return Jsonb(value)
         return Json(value)
 
     def sequence(self, values: Sequence[Any]) -> Tuple[Any, ...]:
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+from .param_adapter import ParamAdapter
+from .statement_builder import StatementBuilder
+from .types import JSONDict
+from .update_builder import UpdateBuilder
+from .upsert_builder import UpsertBuilder
+
+StatementResult = Tuple[List[JSONDict], int]
+
+
+class PipelineStatement(NamedTuple):
+    kind: str
+    query: str
+    params: Tuple[Any, ...]
+    payload: Any
+    options: Optional[JSONDict]
+
+
+class Pipeline:
+
+    COUNT_SETTING = 'daplug.pipeline_{index}'
+
+    def __init__(self, engine: str, driver: str = 'psycopg2') -> None:
+        self.engine: str = engine
+        self.driver: str = driver
+        self.statements: List[PipelineStatement] = []
+        self.results: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def insert(self, **kwargs: Any) -> None:
+        data = dict(kwargs['data'])
+        if not data:
+            raise ValueError('no data supplied for insert operation')
+        columns = list(data.keys())
+        values = ParamAdapter(self.engine, self.driver).sequence(tuple(data[column] for column in columns))
+        self.__queue('insert', StatementBuilder(self.engine).insert(kwargs['table'], columns), values, data, kwargs)
+
+    def upsert(self, **kwargs: Any) -> None:
+        query, params = UpsertBuilder(self.engine, **{**kwargs, 'driver': self.driver}).build()
+        self.__queue('write', query, params, dict(kwargs['data']), kwargs)
+
+    def update(self, **kwargs: Any) -> None:
+        query, params = UpdateBuilder(self.engine, **{**kwargs, 'driver': self.driver}).build()
+        self.__queue('write', query, params, dict(kwargs['data']), kwargs)
+
+    def delete(self, identifier_value: Any, **kwargs: Any) -> None:
+        query = StatementBuilder(self.engine).delete(kwargs['table'], kwargs['identifier'])
+        self.__queue('delete', query, (identifier_value,), {kwargs['identifier']: identifier_value}, kwargs)
+
+    def execute(self, query: str, params: Optional[Sequence[Any]] = None) -> None:
+        self.__queue('execute', query, tuple(params or ()), None, None)
+
+    def script(self) -> Tuple[str, Optional[Tuple[Any, ...]]]:
+        parameterized = any(statement.params for statement in self.statements)
+        queries: List[str] = []
+        params: List[Any] = []
+        counted = self.counted()
+        for index, statement in enumerate(self.statements):
+            query = statement.query.strip().rstrip(';')
+            if index in counted:
+                query = self.__counting(query, index)
+            queries.append(query if statement.params or not parameterized else query.replace('%', '%%'))
+            params.extend(statement.params)
+        if counted:
+            queries.append(self.__read_counts(counted))
+        return ';\n'.join(queries), tuple(params) if parameterized else None
+
+    def counted(self) -> List[int]:
+        if self.engine == 'mysql':
+            return []
+        return [index for index, statement in enumerate(self.statements) if statement.kind == 'write']
+
+    def counts(self, row: Optional[JSONDict]) -> List[Optional[StatementResult]]:
+        returned: List[Optional[StatementResult]] = [None] * len(self.statements)
+        for index in self.counted():
+            value = (row or {}).get(f'pipeline_{index}')
+            if value not in (None, ''):
+                returned[index] = ([], int(value))
+        return returned
+
+    def resolve(self, returned: Optional[Sequence[Optional[StatementResult]]] = None) -> List[Any]:
+        self.results = []
+        for index, statement in enumerate(self.statements):
+            result = returned[index] if returned is not None else None
+            rows, count = result if result is not None else ([], -1)
+            if statement.kind == 'execute':
+                self.results.append(rows if result is not None else None)
+            elif statement.kind == 'delete' or (not rows and count == 0):
+                self.results.append(None)
+            else:
+                self.results.append(rows[0] if rows else statement.payload)
+        return self.results
+
+    def events(self) -> List[Tuple[Any, JSONDict]]:
+        events: List[Tuple[Any, JSONDict]] = []
+        for statement, result in zip(self.statements, self.results):
+            if statement.options is None:
+                continue
+            if statement.kind == 'delete':
+                events.append((statement.payload, statement.options))
+            elif result is not None:
+                events.append((result, statement.options))
+        return events
+
+    def __counting(self, query: str, index: int) -> str:
+        setting = self.COUNT_SETTING.format(index=index)
+        return f"WITH daplug_written AS ({query}) SELECT set_config('{setting}', count(*)::text, true) FROM daplug_written"
+
+    def __read_counts(self, counted: List[int]) -> str:
+        columns = ', '.join(
+            f"current_setting('{self.COUNT_SETTING.format(index=index)}', true) AS pipeline_{index}" for index in counted
+        )
+        return f'SELECT {columns}'
+
+    def __queue(self, kind: str, query: str, params: Sequence[Any], payload: Any, options: Optional[JSONDict]) -> None:
+        self.statements.append(PipelineStatement(kind, query, tuple(params), payload, options))
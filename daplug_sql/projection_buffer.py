@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from daplug_core import logger  # type: ignore[import-untyped]
+
+from .exception import SQLAdapterException
+from .types import JSONDict
+
+if TYPE_CHECKING:
+    from .adapter import SQLAdapter
+
+PendingBatch = Tuple[JSONDict, List[JSONDict]]
+FlushFailure = Tuple[Exception, List[JSONDict]]
+
+
+class ProjectionBuffer:
+
+    def __init__(self, adapter: 'SQLAdapter', **kwargs: Any) -> None:
+        self.adapter: 'SQLAdapter' = adapter
+        self.max_rows: int = int(kwargs.get('max_rows', adapter.BATCH_SIZE))
+        self.max_pending: int = int(kwargs.get('max_pending', self.max_rows * 4))
+        self.flush_interval_ms: Optional[int] = kwargs.get('flush_interval_ms', 1000 if adapter.thread_safe else None)
+        self.pending_timeout: float = float(kwargs.get('pending_timeout', 30.0))
+        self.on_error: Callable[[Exception, List[JSONDict]], None] = kwargs.get('on_error', self.__log_error)
+        if self.max_rows <= 0 or self.max_pending < self.max_rows:
+            raise ValueError('max_rows must be positive and max_pending must be at least max_rows')
+        if self.flush_interval_ms and not adapter.thread_safe:
+            raise ValueError('flush_interval_ms flushes from a background thread and requires a thread_safe=True adapter')
+        self.pending: Dict[str, PendingBatch] = {}
+        self.queued: int = 0
+        self.in_flight: int = 0
+        self.closed: bool = False
+        self.condition = threading.Condition()
+        self.flush_lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.timer: Optional[threading.Thread] = None
+        if self.flush_interval_ms:
+            self.timer = threading.Thread(target=self.__run_timer, name='daplug-projection-buffer', daemon=True)
+            self.timer.start()
+
+    def __enter__(self) -> 'ProjectionBuffer':
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def upsert(self, **kwargs: Any) -> None:
+        options = {key: value for key, value in kwargs.items() if key != 'data'}
+        batch_key = json.dumps(options, sort_keys=True, default=str)
+        if self.timer is None and self.__saturated():
+            self.flush()
+        with self.condition:
+            if self.closed:
+                raise SQLAdapterException('projection buffer is closed')
+            if not self.condition.wait_for(lambda: not self.__saturated(), timeout=self.pending_timeout):
+                raise SQLAdapterException(f'projection buffer stayed full for {self.pending_timeout} seconds')
+            self.pending.setdefault(batch_key, (options, []))[1].append(dict(kwargs['data']))
+            self.queued += 1
+            full = self.queued >= self.max_rows
+        if full:
+            self.flush()
+
+    def flush(self) -> List[JSONDict]:
+        written, failure = self.__flush()
+        if failure is not None:
+            raise failure[0]
+        return written
+
+    def close(self) -> List[JSONDict]:
+        with self.condition:
+            self.closed = True
+        self.stopped.set()
+        if self.timer and self.timer is not threading.current_thread():
+            self.timer.join()
+        written = self.flush()
+        self.adapter.buffers = [buffer for buffer in self.adapter.buffers if buffer is not self]
+        return written
+
+    def __saturated(self) -> bool:
+        return self.queued + self.in_flight >= self.max_pending
+
+    def __flush(self) -> Tuple[List[JSONDict], Optional[FlushFailure]]:
+        written: List[JSONDict] = []
+        with self.flush_lock:
+            with self.condition:
+                batches = list(self.pending.items())
+                self.pending = {}
+                self.in_flight, self.queued = self.queued, 0
+            try:
+                for index, (_, (options, rows)) in enumerate(batches):
+                    try:
+                        written.extend(self.adapter.upsert_many(rows, **options))
+                    except Exception as error:
+                        return written, (error, self.__requeue(batches[index:]))
+            finally:
+                with self.condition:
+                    self.in_flight = 0
+                    self.condition.notify_all()
+        return written, None
+
+    def __requeue(self, batches: List[Tuple[str, PendingBatch]]) -> List[JSONDict]:
+        with self.condition:
+            restored = {key: (options, list(rows)) for key, (options, rows) in batches}
+            for key, (options, rows) in self.pending.items():
+                restored.setdefault(key, (options, []))[1].extend(rows)
+            self.pending = restored
+            requeued = [row for _, (_, rows) in batches for row in rows]
+            self.queued += len(requeued)
+        return requeued
+
+    def __run_timer(self) -> None:
+        interval = float(self.flush_interval_ms or 0) / 1000
+        while not self.stopped.wait(interval):
+            _, failure = self.__flush()
+            if failure is not None:
+                self.on_error(*failure)
+
+    def __log_error(self, error: Exception, rows: List[JSONDict]) -> None:
+        logger.log(level='ERROR', log={'error': f'projection buffer flush failed: {error}', 'rows': len(rows)})
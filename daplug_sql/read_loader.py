@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional, Set, Tuple, TypeVar, Union
+
+from .types import JSONDict
+
+if TYPE_CHECKING:
+    from .adapter import SQLAdapter
+    from .async_adapter import AsyncSQLAdapter
+
+GroupKey = Tuple[str, str]
+PendingLoad = Tuple[Any, 'asyncio.Future[Optional[JSONDict]]']
+LoaderT = TypeVar('LoaderT', 'ReadLoader', 'AsyncReadLoader')
+active_loader: ContextVar[Union['ReadLoader', 'AsyncReadLoader', None]] = ContextVar('daplug_sql_loader', default=None)
+
+
+def current_loader(adapter: Any) -> Any:
+    loader = active_loader.get()
+    if loader is not None and loader.adapter is adapter:
+        return loader
+    return None
+
+
+@contextmanager
+def loader_scope(loader: LoaderT) -> Iterator[LoaderT]:
+    token = active_loader.set(loader)
+    try:
+        yield loader
+    finally:
+        active_loader.reset(token)
+
+
+class ReadLoader:
+
+    def __init__(self, adapter: 'SQLAdapter') -> None:
+        self.adapter: 'SQLAdapter' = adapter
+        self.memo: Dict[GroupKey, Dict[str, Optional[JSONDict]]] = {}
+        self.pending: Dict[GroupKey, Dict[str, Any]] = {}
+        self.options: Dict[GroupKey, JSONDict] = {}
+
+    def load(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        group, key = self.__queue(identifier_value, **kwargs)
+        if key not in self.memo.get(group, {}):
+            self.__dispatch(group)
+        return self.memo[group].get(key)
+
+    def defer(self, identifier_value: Any, **kwargs: Any) -> Callable[[], Optional[JSONDict]]:
+        self.__queue(identifier_value, **kwargs)
+        return lambda: self.load(identifier_value, **kwargs)
+
+    def clear(self) -> None:
+        self.memo.clear()
+        self.pending.clear()
+
+    def __queue(self, identifier_value: Any, **kwargs: Any) -> Tuple[GroupKey, str]:
+        group = (kwargs['table'], kwargs['identifier'])
+        key = str(identifier_value)
+        if key not in self.memo.get(group, {}):
+            self.pending.setdefault(group, {})[key] = identifier_value
+            self.options.setdefault(group, kwargs)
+        return group, key
+
+    def __dispatch(self, group: GroupKey) -> None:
+        values = self.pending.pop(group, {})
+        rows = self.adapter.get_many(list(values.values()), **self.options[group])
+        memo = self.memo.setdefault(group, {})
+        for key, value in values.items():
+            memo[key] = rows.get(value)
+
+
+class AsyncReadLoader:
+
+    def __init__(self, adapter: 'AsyncSQLAdapter') -> None:
+        self.adapter: 'AsyncSQLAdapter' = adapter
+        self.memo: Dict[GroupKey, Dict[str, Optional[JSONDict]]] = {}
+        self.pending: Dict[GroupKey, Dict[str, PendingLoad]] = {}
+        self.in_flight: Dict[GroupKey, Dict[str, PendingLoad]] = {}
+        self.options: Dict[GroupKey, JSONDict] = {}
+        self.tasks: Set[asyncio.Task[None]] = set()
+        self.scheduled: bool = False
+
+    async def load(self, identifier_value: Any, **kwargs: Any) -> Optional[JSONDict]:
+        group = (kwargs['table'], kwargs['identifier'])
+        key = str(identifier_value)
+        memo = self.memo.get(group, {})
+        if key in memo:
+            return memo[key]
+        if key in self.in_flight.get(group, {}):
+            return await self.in_flight[group][key][1]
+        pending = self.pending.setdefault(group, {})
+        if key not in pending:
+            pending[key] = (identifier_value, asyncio.get_running_loop().create_future())
+            self.options.setdefault(group, kwargs)
+            self.__schedule()
+        return await pending[key][1]
+
+    def clear(self) -> None:
+        self.memo.clear()
+
+    def __schedule(self) -> None:
+        if self.scheduled:
+            return
+        self.scheduled = True
+        asyncio.get_running_loop().call_soon(self.__dispatch)
+
+    def __dispatch(self) -> None:
+        self.scheduled = False
+        pending, self.pending = self.pending, {}
+        for group, entries in pending.items():
+            self.in_flight.setdefault(group, {}).update(entries)
+            task = asyncio.get_running_loop().create_task(self.__fetch(group, entries))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def __fetch(self, group: GroupKey, entries: Dict[str, PendingLoad]) -> None:
+        try:
+            rows = await self.adapter.get_many([value for value, _ in entries.values()], **self.options[group])
+        except Exception as error:
+            self.__settle(group, entries)
+            for _, future in entries.values():
+                if not future.done():
+                    future.set_exception(error)
+            return
+        self.__settle(group, entries)
+        memo = self.memo.setdefault(group, {})
+        for key, (value, future) in entries.items():
+            memo[key] = rows.get(value)
+            if not future.done():
+                future.set_result(memo[key])
+
+    def __settle(self, group: GroupKey, entries: Dict[str, PendingLoad]) -> None:
+        in_flight = self.in_flight.get(group, {})
+        for key in entries:
+            in_flight.pop(key, None)
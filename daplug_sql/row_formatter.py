@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+@lru_cache(maxsize=256)
+def record_type(names: Tuple[str, ...]) -> Any:
+    factory: Any = namedtuple
+    return factory('Record', names, rename=True)
+
+
+class RowSet(List[Any]):
+
+    def __init__(self, rows: Sequence[Any], columns: Dict[str, int]) -> None:
+        super().__init__(rows)
+        self.columns: Dict[str, int] = columns
+
+
+class RowFormatter:
+
+    FORMATS = ('dict', 'tuple', 'record')
+
+    def __init__(self, row_format: str = 'dict') -> None:
+        if row_format not in self.FORMATS:
+            raise ValueError(f'row_format must be one of {self.FORMATS}')
+        self.row_format: str = row_format
+
+    @property
+    def tuples(self) -> bool:
+        return self.row_format != 'dict'
+
+    def rows(self, description: Optional[Sequence[Sequence[Any]]], rows: Sequence[Any]) -> List[Any]:
+        names = self.__names(description)
+        if self.row_format == 'record':
+            make = record_type(names)._make
+            return [make(row) for row in rows]
+        if self.row_format == 'tuple':
+            return RowSet(rows, {name: index for index, name in enumerate(names)})
+        return list(rows)
+
+    def row(self, description: Optional[Sequence[Sequence[Any]]], row: Any) -> Any:
+        if self.row_format == 'record':
+            return record_type(self.__names(description))._make(row)
+        return row
+
+    def __names(self, description: Optional[Sequence[Sequence[Any]]]) -> Tuple[str, ...]:
+        return tuple(column[0] for column in description or ())
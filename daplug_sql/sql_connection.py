@@ -1,51 +1,100 @@
 from __future__ import annotations
 
 import threading
-from typing import Any, Callable, Dict, Tuple
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
 
+from .connection_pool import ConnectionPool, close_connector
+from .connection_pool import is_connection_closed as _is_connection_closed
 from .sql_connector import SQLConnector
-from .types import AdapterConfig, ConnectionProtocol
+from .types import AdapterConfig
 
-CacheKey = Tuple[str, str, str, int, str]
-_connection_cache: Dict[CacheKey, SQLConnector] = {}
+CacheKey = Tuple[str, str, str, int, str, bool, Tuple[Tuple[str, Any], ...]]
+_connection_cache: Dict[CacheKey, ConnectionPool] = {}
 _cache_lock = threading.Lock()
 
 
 def _build_cache_key(obj: AdapterConfig) -> CacheKey:
-    return (obj.endpoint, obj.database, obj.user, obj.port, getattr(obj, 'engine', 'postgres'))
+    pool_options = tuple(sorted(getattr(obj, 'pool_options', {}).items()))
+    autocommit = bool(getattr(obj, 'autocommit', False))
+    return (obj.endpoint, obj.database, obj.user, obj.port, getattr(obj, 'engine', 'postgres'), autocommit, pool_options)
 
 
-def _is_connection_closed(connection: ConnectionProtocol | None) -> bool:
-    if not connection:
-        return True
-    closed_attr = getattr(connection, 'closed', None)
-    if closed_attr is not None:
-        return bool(closed_attr)
-    open_attr = getattr(connection, 'open', None)
-    if open_attr is not None:
-        return open_attr == 0
-    is_connected = getattr(connection, 'is_connected', None)
-    if callable(is_connected):
-        return not is_connected()
-    return False
+def _get_pool(obj: AdapterConfig) -> ConnectionPool:
+    cache_key = _build_cache_key(obj)
+    with _cache_lock:
+        pool = _connection_cache.get(cache_key)
+        if not pool or pool.closed:
+            pool = ConnectionPool(**getattr(obj, 'pool_options', {}))
+            _connection_cache[cache_key] = pool
+    return pool
 
 
 def sql_connection(func: Callable[..., Any]) -> Callable[..., Any]:
 
     def decorator(obj: AdapterConfig, *args: Any, **kwargs: Any) -> Any:
-        cache_key = _build_cache_key(obj)
-        with _cache_lock:
-            connector = _connection_cache.get(cache_key)
-            if not connector or _is_connection_closed(connector.connection):
-                connector = SQLConnector(obj)
-                _connection_cache[cache_key] = connector
-        return func(obj, connector, *args, **kwargs)
+        pool = _get_pool(obj)
+        connector = getattr(obj, 'connector', None)
+        if connector and _is_connection_closed(connector.connection):
+            pool.discard(connector)
+            connector = None
+        if not connector:
+            connector = pool.checkout(factory=lambda: SQLConnector(obj))
+        try:
+            return func(obj, connector, *args, **kwargs)
+        except Exception:
+            pool.discard(connector)
+            setattr(obj, 'connector', None)
+            raise
 
     return decorator
 
 
 def sql_connection_cleanup(func: Callable[..., Any]) -> Callable[..., Any]:
 
+    def decorator(obj: AdapterConfig, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return func(obj, *args, **kwargs)
+        finally:
+            _release_connector_for(obj)
+
+    return decorator
+
+
+@contextmanager
+def borrowed_connector(obj: AdapterConfig) -> Iterator[SQLConnector]:
+    pool = _get_pool(obj)
+    connector = pool.checkout(factory=lambda: SQLConnector(obj))
+    finished = False
+    try:
+        yield connector
+        finished = True
+    finally:
+        if finished:
+            pool.checkin(connector)
+        else:
+            pool.discard(connector)
+
+
+def release_connector(obj: AdapterConfig, connector: SQLConnector) -> None:
+    with _cache_lock:
+        pool = _connection_cache.get(_build_cache_key(obj))
+    if pool:
+        pool.checkin(connector)
+    else:
+        close_connector(connector)
+
+
+def _release_connector_for(obj: AdapterConfig) -> None:
+    connector = getattr(obj, 'connector', None)
+    if not connector:
+        return
+    release_connector(obj, connector)
+    setattr(obj, 'connector', None)
+
+
+def sql_pool_cleanup(func: Callable[..., Any]) -> Callable[..., Any]:
+
     def decorator(obj: AdapterConfig, *args: Any, **kwargs: Any) -> Any:
         try:
             return func(obj, *args, **kwargs)
@@ -56,21 +105,14 @@ def sql_connection_cleanup(func: Callable[..., Any]) -> Callable[..., Any]:
 
 
 def _close_connectors_for(obj: AdapterConfig | None = None) -> None:
-    connectors: list[SQLConnector] = []
+    pools: list[ConnectionPool] = []
     with _cache_lock:
         if obj is None:
-            connectors = list(_connection_cache.values())
+            pools = list(_connection_cache.values())
             _connection_cache.clear()
         else:
-            cache_key = _build_cache_key(obj)
-            connector = _connection_cache.pop(cache_key, None)
-            if connector:
-                connectors.append(connector)
-    for connector in connectors:
-        connection = getattr(connector, 'connection', None)
-        if connection:
-            try:
-                connection.close()
-            except Exception:
-                pass
-        connector.connection = None
+            pool = _connection_cache.pop(_build_cache_key(obj), None)
+            if pool:
+                pools.append(pool)
+    for pool in pools:
+        pool.close()
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any
+import re
+import uuid
+from typing import Any, Dict, Optional, Sequence
 
 import psycopg2  # type: ignore[import-untyped]
 from psycopg2.extras import RealDictCursor  # type: ignore[import-untyped]
@@ -12,6 +14,8 @@ from .types import AdapterConfig, ConnectionProtocol, CursorProtocol
 
 class SQLConnector:
 
+    PLACEHOLDER = re.compile(r'%[s%]')
+
     def __init__(self, cls: AdapterConfig) -> None:
         self.endpoint: str = cls.endpoint
         self.database: str = cls.database
@@ -22,6 +26,8 @@ class SQLConnector:
         self.autocommit: bool = getattr(cls, 'autocommit', False)
         self.engine: str = getattr(cls, 'engine', 'postgres').lower()
         self.connection: Any = None
+        self.prepared: Dict[str, Any] = {}
+        self.prepared_connection: Any = None
 
     def connect(self) -> ConnectionProtocol:
         if self.engine == 'mysql':
@@ -34,6 +40,59 @@ class SQLConnector:
             return connection.cursor(dictionary=True)
         return connection.cursor(cursor_factory=RealDictCursor)
 
+    def tuple_cursor(self) -> CursorProtocol:
+        connection = self.connect()
+        if self.engine == 'mysql':
+            return connection.cursor(buffered=True)
+        return connection.cursor()
+
+    def stream_cursor(self, chunk_size: int, dictionary: bool = True) -> CursorProtocol:
+        connection = self.connect()
+        if self.engine == 'mysql':
+            return connection.cursor(dictionary=dictionary, buffered=False)
+        cursor = connection.cursor(
+            name=f'daplug_stream_{uuid.uuid4().hex}',
+            cursor_factory=RealDictCursor if dictionary else None,
+            withhold=bool(connection.autocommit),
+        )
+        setattr(cursor, 'itersize', chunk_size)
+        return cursor
+
+    def execute_prepared(self, cursor: CursorProtocol, query: str, params: Optional[Sequence[Any]]) -> CursorProtocol:
+        prepared = self.__prepared_statements()
+        if self.engine == 'mysql':
+            if query not in prepared:
+                prepared[query] = self.connection.cursor(prepared=True, dictionary=True)
+            prepared[query].execute(query, params)
+            return prepared[query]
+        if query not in prepared:
+            name = f'daplug_stmt_{len(prepared) + 1}'
+            cursor.execute(f'PREPARE {name} AS {self.__positional(query)}')
+            prepared[query] = name
+        if params:
+            cursor.execute(f'EXECUTE {prepared[query]} ({", ".join(["%s"] * len(params))})', params)
+        else:
+            cursor.execute(f'EXECUTE {prepared[query]}')
+        return cursor
+
+    def __prepared_statements(self) -> Dict[str, Any]:
+        if self.prepared_connection is not self.connection:
+            self.prepared = {}
+            self.prepared_connection = self.connection
+        return self.prepared
+
+    def __positional(self, query: str) -> str:
+        position = 0
+
+        def replace(match: re.Match[str]) -> str:
+            nonlocal position
+            if match.group() == '%%':
+                return '%'
+            position += 1
+            return f'${position}'
+
+        return self.PLACEHOLDER.sub(replace, query)
+
     def _connect_postgres(self) -> ConnectionProtocol:
         if not self.connection or self.connection.closed:
             self.connection = psycopg2.connect(
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from typing import Sequence
+
+from .statement_cache import statement_cache
+
+
+class StatementBuilder:
+
+    SAFE_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+    def __init__(self, engine: str) -> None:
+        self.engine: str = engine.lower()
+
+    def insert(self, table: str, columns: Sequence[str]) -> str:
+        return statement_cache.get(('insert', self.engine, table, tuple(columns)), lambda: self.__insert(table, columns))
+
+    def insert_unique(self, table: str, identifier: str, columns: Sequence[str]) -> str:
+        key = ('insert_unique', self.engine, table, identifier, tuple(columns))
+        return statement_cache.get(key, lambda: self.__insert_unique(table, identifier, columns))
+
+    def select(self, table: str, identifier: str) -> str:
+        return statement_cache.get(('select', self.engine, table, identifier), lambda: self.__select(table, identifier))
+
+    def select_existing(self, table: str, identifier: str) -> str:
+        key = ('select_existing', self.engine, table, identifier)
+        return statement_cache.get(key, lambda: f'{self.__select(table, identifier)} LIMIT 1')
+
+    def select_many(self, table: str, identifier: str, count: int) -> str:
+        key = ('select_many', self.engine, table, identifier, count)
+        return statement_cache.get(key, lambda: self.__select_many(table, identifier, count))
+
+    def select_applied(self, table: str, identifier: str, guard_column: str, count: int) -> str:
+        key = ('select_applied', self.engine, table, identifier, guard_column, count)
+        return statement_cache.get(key, lambda: self.__select_applied(table, identifier, guard_column, count))
+
+    def select_any(self, table: str, identifier: str) -> str:
+        key = ('select_any', self.engine, table, identifier)
+        return statement_cache.get(key, lambda: f'SELECT * FROM {self.format(table)} WHERE {self.format(identifier)} = ANY(%s)')
+
+    def update(self, table: str, identifier: str, columns: Sequence[str]) -> str:
+        key = ('update', self.engine, table, identifier, tuple(columns))
+        return statement_cache.get(key, lambda: self.__update(table, identifier, columns))
+
+    def delete(self, table: str, identifier: str) -> str:
+        return statement_cache.get(('delete', self.engine, table, identifier), lambda: self.__delete(table, identifier))
+
+    def placeholders(self, count: int) -> str:
+        if count <= 0:
+            raise ValueError('columns must include at least one entry')
+        return ', '.join(['%s'] * count)
+
+    def __insert(self, table: str, columns: Sequence[str]) -> str:
+        formatted_columns = ', '.join(self.format(column) for column in columns)
+        return f'INSERT INTO {self.format(table)} ({formatted_columns}) VALUES ({self.placeholders(len(columns))})'
+
+    def __insert_unique(self, table: str, identifier: str, columns: Sequence[str]) -> str:
+        if self.engine == 'mysql':
+            return self.__insert(table, columns).replace('INSERT INTO', 'INSERT IGNORE INTO', 1)
+        return f'{self.__insert(table, columns)} ON CONFLICT ({self.format(identifier)}) DO NOTHING'
+
+    def __select(self, table: str, identifier: str) -> str:
+        return f'SELECT * FROM {self.format(table)} WHERE {self.format(identifier)} = %s'
+
+    def __select_many(self, table: str, identifier: str, count: int) -> str:
+        return f'SELECT * FROM {self.format(table)} WHERE {self.format(identifier)} IN ({self.placeholders(count)})'
+
+    def __select_applied(self, table: str, identifier: str, guard_column: str, count: int) -> str:
+        if count <= 0:
+            raise ValueError('columns must include at least one entry')
+        equals = '<=>' if self.engine == 'mysql' else 'IS NOT DISTINCT FROM'
+        match = f'({self.format(identifier)} = %s AND {self.format(guard_column)} {equals} %s)'
+        return f'SELECT * FROM {self.format(table)} WHERE {" OR ".join([match] * count)}'
+
+    def __update(self, table: str, identifier: str, columns: Sequence[str]) -> str:
+        set_clause = ', '.join(f'{self.format(column)} = %s' for column in columns)
+        return f'UPDATE {self.format(table)} SET {set_clause} WHERE {self.format(identifier)} = %s'
+
+    def __delete(self, table: str, identifier: str) -> str:
+        return f'DELETE FROM {self.format(table)} WHERE {self.format(identifier)} = %s'
+
+    def format(self, value: str) -> str:
+        if not isinstance(value, str) or not self.SAFE_IDENTIFIER.match(value):
+            raise ValueError(f'invalid identifier: {value}')
+        if self.engine == 'mysql':
+            return f'`{value}`'
+        return f'"{value}"'
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from daplug_core import logger  # type: ignore[import-untyped]
+
+from .connection_state import ConnectionState
+
+if TYPE_CHECKING:
+    from .adapter import SQLAdapter
+
+Execute = Callable[..., None]
+
+
+class TransactionManager:
+
+    def __init__(self, adapter: 'SQLAdapter', execute: Execute) -> None:
+        self.adapter: 'SQLAdapter' = adapter
+        self.execute: Execute = execute
+
+    @contextmanager
+    def transaction(self, commit: bool = True) -> Iterator[None]:
+        state = self.adapter.states.current()
+        if state.transaction_depth:
+            state.transaction_depth += 1
+            try:
+                yield
+            finally:
+                state.transaction_depth -= 1
+            return
+        explicit = self.adapter.autocommit
+        if explicit:
+            self.execute('START TRANSACTION' if self.adapter.engine == 'mysql' else 'BEGIN')
+        state.transaction_depth, state.deferred = 1, []
+        try:
+            yield
+        except BaseException:
+            state.transaction_depth, state.deferred = 0, None
+            self.__rollback(explicit)
+            raise
+        deferred, state.transaction_depth, state.deferred = state.deferred, 0, None
+        if explicit:
+            self.execute('COMMIT')
+        elif commit and self.adapter.connection:
+            self.adapter.connection.commit()
+        for db_data, kwargs in deferred:
+            self.adapter.publish(db_data, **kwargs)
+
+    @contextmanager
+    def savepoint(self) -> Iterator[None]:
+        state = self.adapter.states.current()
+        if not state.transaction_depth:
+            with self.transaction():
+                yield
+            return
+        state.savepoints += 1
+        name = f'daplug_sp_{state.savepoints}'
+        mark = len(state.deferred or [])
+        self.execute(f'SAVEPOINT {name}')
+        try:
+            yield
+        except BaseException:
+            self.execute(f'ROLLBACK TO SAVEPOINT {name}')
+            self.__discard(state, mark)
+            raise
+        else:
+            self.execute(f'RELEASE SAVEPOINT {name}')
+        finally:
+            state.savepoints -= 1
+
+    def defer(self, db_data: Any, **kwargs: Any) -> bool:
+        state = self.adapter.states.current()
+        if state.deferred is None:
+            return False
+        state.deferred.append((db_data, kwargs))
+        return True
+
+    def __discard(self, state: ConnectionState, mark: int) -> None:
+        if state.deferred is not None:
+            del state.deferred[mark:]
+
+    def __rollback(self, explicit: bool) -> None:
+        try:
+            if explicit:
+                self.execute('ROLLBACK')
+            elif self.adapter.connection:
+                self.adapter.connection.rollback()
+        except Exception as error:  # pylint: disable=broad-except
+            logger.log(level='ERROR', log={'error': f'transaction_rollback_error: {error}'})
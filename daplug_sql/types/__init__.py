@@ -11,6 +11,7 @@ StrIterable = Iterable[str]
 @runtime_checkable
 class CursorProtocol(Protocol):
     rowcount: int
+    description: Any
 
     def execute(self, query: str, params: Sequence[Any] | None = ...) -> Any: ...
 
@@ -18,6 +19,8 @@ class CursorProtocol(Protocol):
 
     def fetchall(self) -> Sequence[JSONDict]: ...
 
+    def fetchmany(self, size: int = ...) -> Sequence[JSONDict]: ...
+
     def close(self) -> None: ...
 
     def mogrify(self, query: str, params: Sequence[Any] | None = ...) -> bytes | str: ...
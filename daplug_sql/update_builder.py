@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Tuple
+
+from .param_adapter import ParamAdapter
+from .statement_builder import StatementBuilder
+from .statement_cache import statement_cache
+from .types import JSONDict
+from .upsert_builder import UpsertBuilder
+
+
+class UpdateBuilder:
+
+    def __init__(self, engine: str, **kwargs: Any) -> None:
+        self.engine: str = engine
+        self.driver: str = kwargs.get('driver', 'psycopg2')
+        self.statements: StatementBuilder = StatementBuilder(engine)
+        self.data: JSONDict = dict(kwargs['data'])
+        self.table: str = kwargs['table']
+        self.identifier: str = kwargs['identifier']
+        self.columns: List[str] = [column for column in self.data.keys() if column != self.identifier]
+        self.merge_columns: List[str] = self.__merge_columns(**kwargs)
+        self.strip_paths: Dict[str, List[str]] = {
+            column: list(paths) for column, paths in dict(kwargs.get('strip_paths') or {}).items()
+        }
+
+    def build(self) -> Tuple[str, Tuple[Any, ...]]:
+        if self.identifier not in self.data:
+            raise KeyError(f'identifier "{self.identifier}" missing from payload for update')
+        if not self.columns:
+            raise ValueError('no updatable fields supplied for update operation')
+        strip_paths = tuple((column, tuple(paths)) for column, paths in self.strip_paths.items())
+        key = ('update_merge', self.engine, self.table, self.identifier, tuple(self.columns), tuple(self.merge_columns), strip_paths)
+        return statement_cache.get(key, self.__compile), self.__params()
+
+    def __merge_columns(self, **kwargs: Any) -> List[str]:
+        if not kwargs.get('merge', True):
+            return []
+        if kwargs.get('merge_columns') is not None:
+            return list(kwargs['merge_columns'])
+        return [column for column in self.columns if isinstance(self.data[column], dict)]
+
+    def __compile(self) -> str:
+        set_clause = ', '.join(f'{self.__format(column)} = {self.__expression(column)}' for column in self.columns)
+        query = f'UPDATE {self.__format(self.table)} SET {set_clause} WHERE {self.__format(self.identifier)} = %s'
+        if self.engine != 'mysql':
+            query += ' RETURNING *'
+        return query
+
+    def __expression(self, column: str) -> str:
+        formatted = self.__format(column)
+        expression = '%s'
+        if column in self.merge_columns:
+            if self.engine == 'mysql':
+                expression = f'JSON_MERGE_PATCH(COALESCE({formatted}, JSON_OBJECT()), %s)'
+            else:
+                expression = f'daplug_json_merge({formatted}, %s)'
+        for _ in self.strip_paths.get(column, []):
+            expression = f'JSON_REMOVE({expression}, %s)' if self.engine == 'mysql' else f'({expression}) #- %s'
+        return expression
+
+    def __params(self) -> Tuple[Any, ...]:
+        adapter = ParamAdapter(self.engine, self.driver)
+        params: List[Any] = []
+        for column in self.columns:
+            params.extend(adapter.sequence((self.data[column],)))
+            for path in self.strip_paths.get(column, []):
+                params.append(UpsertBuilder.mysql_path(path) if self.engine == 'mysql' else path.split('.'))
+        params.append(self.data[self.identifier])
+        return tuple(params)
+
+    def __format(self, value: str) -> str:
+        return self.statements.format(value)
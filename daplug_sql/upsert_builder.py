@@ -4,6 +4,7 @@ import re
 from typing import Any, Dict, List, Optional, Tuple
 
 from .param_adapter import ParamAdapter
+from .statement_cache import statement_cache
 from .types import JSONDict
 
 
@@ -49,7 +50,9 @@ $daplug$;
 
     def __init__(self, engine: str, **kwargs: Any) -> None:
         self.engine: str = engine
-        self.data: JSONDict = kwargs['data']
+        self.driver: str = kwargs.get('driver', 'psycopg2')
+        self.rows: List[JSONDict] = list(kwargs['rows']) if 'rows' in kwargs else [kwargs['data']]
+        self.data: JSONDict = self.rows[0] if self.rows else {}
         self.table: str = kwargs['table']
         self.identifier: str = kwargs['identifier']
         self.merge_columns: List[str] = list(kwargs.get('merge_columns') or [])
@@ -62,11 +65,21 @@ $daplug$;
     def build(self) -> Tuple[str, Tuple[Any, ...]]:
         if not self.columns:
             raise ValueError('no data supplied for upsert operation')
-        if self.identifier not in self.data:
-            raise KeyError(f'identifier "{self.identifier}" missing from payload for upsert')
-        if self.engine == 'mysql':
-            return self.__build_mysql()
-        return self.__build_postgres()
+        for row in self.rows:
+            if self.identifier not in row:
+                raise KeyError(f'identifier "{self.identifier}" missing from payload for upsert')
+            if list(row.keys()) != self.columns:
+                raise ValueError('all rows in an upsert batch must share the same columns')
+        compile_statement = self.__build_mysql if self.engine == 'mysql' else self.__build_postgres
+        query, set_params = statement_cache.get(self.__cache_key(), compile_statement)
+        return query, self.__insert_params() + set_params
+
+    def __cache_key(self) -> Tuple[Any, ...]:
+        strip_paths = tuple((column, tuple(paths)) for column, paths in self.strip_paths.items())
+        return (
+            'upsert', self.engine, self.table, self.identifier, tuple(self.columns),
+            tuple(self.merge_columns), strip_paths, self.guard_column, len(self.rows),
+        )
 
     def __build_postgres(self) -> Tuple[str, Tuple[Any, ...]]:
         set_parts: List[str] = []
@@ -78,14 +91,14 @@ $daplug$;
         conflict_action = f'DO UPDATE SET {", ".join(set_parts)}' if set_parts else 'DO NOTHING'
         query = (
             f'INSERT INTO {self.__format(self.table)} AS existing ({self.__column_clause()}) '
-            f'VALUES ({self.__placeholder_clause()}) '
+            f'VALUES {self.__values_clause()} '
             f'ON CONFLICT ({self.__format(self.identifier)}) {conflict_action}'
         )
         if self.guard_column and set_parts:
             guard = self.__format(self.guard_column)
             query += f' WHERE existing.{guard} IS NULL OR EXCLUDED.{guard} >= existing.{guard}'
         query += ' RETURNING *'
-        return query, self.__insert_params() + tuple(set_params)
+        return query, tuple(set_params)
 
     def __postgres_expression(self, column: str) -> Tuple[str, List[Any]]:
         formatted = self.__format(column)
@@ -113,10 +126,10 @@ $daplug$;
         update_clause = ', '.join(set_parts) if set_parts else f'{identifier} = {table}.{identifier}'
         query = (
             f'INSERT INTO {self.__format(self.table)} ({self.__column_clause()}) '
-            f'VALUES ({self.__placeholder_clause()}) AS new_values '
+            f'VALUES {self.__values_clause()} AS new_values '
             f'ON DUPLICATE KEY UPDATE {update_clause}'
         )
-        return query, self.__insert_params() + tuple(set_params)
+        return query, tuple(set_params)
 
     def __mysql_expression(self, column: str) -> Tuple[str, List[Any]]:
         formatted = self.__format(column)
@@ -127,10 +140,19 @@ $daplug$;
         params: List[Any] = []
         for path in self.strip_paths.get(column, []):
             expression = f'JSON_REMOVE({expression}, %s)'
-            params.append(self.__mysql_path(path))
+            params.append(self.mysql_path(path))
         return expression, params
 
-    def __mysql_path(self, path: str) -> str:
+    def reconstructable(self, returning: Any, batch: bool = False) -> bool:
+        if batch and self.guard_column:
+            return False
+        if returning == 'auto':
+            rewritten = (set(self.merge_columns) | set(self.strip_paths)).intersection(self.columns)
+            return not rewritten
+        return returning is False
+
+    @staticmethod
+    def mysql_path(path: str) -> str:
         segments = []
         for segment in path.split('.'):
             escaped = segment.replace('"', '\\"')
@@ -143,11 +165,16 @@ $daplug$;
     def __column_clause(self) -> str:
         return ', '.join(self.__format(column) for column in self.columns)
 
-    def __placeholder_clause(self) -> str:
-        return ', '.join(['%s'] * len(self.columns))
+    def __values_clause(self) -> str:
+        row_placeholder = f'({", ".join(["%s"] * len(self.columns))})'
+        return ', '.join([row_placeholder] * len(self.rows))
 
     def __insert_params(self) -> Tuple[Any, ...]:
-        return ParamAdapter(self.engine).sequence(tuple(self.data[column] for column in self.columns))
+        adapter = ParamAdapter(self.engine, self.driver)
+        params: List[Any] = []
+        for row in self.rows:
+            params.extend(adapter.sequence(tuple(row[column] for column in self.columns)))
+        return tuple(params)
 
     def __format(self, value: str) -> str:
         if not isinstance(value, str) or not self.SAFE_IDENTIFIER.match(value):
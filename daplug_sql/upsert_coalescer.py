@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict, List, Optional, Sequence
+
+from daplug_core import dict_merger  # type: ignore[import-untyped]
+
+from .types import JSONDict
+
+
+class UpsertCoalescer:
+
+    def __init__(self, **kwargs: Any) -> None:
+        self.identifier: str = kwargs['identifier']
+        self.merge_columns: List[str] = list(kwargs.get('merge_columns') or [])
+        self.strip_paths: Dict[str, List[str]] = {
+            column: list(paths) for column, paths in dict(kwargs.get('strip_paths') or {}).items()
+        }
+        self.guard_column: Optional[str] = kwargs.get('guard_column')
+
+    def coalesce(self, rows: Sequence[JSONDict]) -> List[JSONDict]:
+        coalesced: Dict[str, JSONDict] = {}
+        for row in rows:
+            if self.identifier not in row:
+                raise KeyError(f'identifier "{self.identifier}" missing from payload for upsert')
+            key = str(row[self.identifier])
+            existing = coalesced.get(key)
+            if existing is not None and not self.guard_column:
+                coalesced[key] = self.__strip(self.__merge(existing, row))
+            elif existing is None or self.__accepts(existing, row):
+                coalesced[key] = self.__strip(dict(row))
+        return list(coalesced.values())
+
+    def __accepts(self, existing: JSONDict, incoming: JSONDict) -> bool:
+        if not self.guard_column:
+            return True
+        current = existing.get(self.guard_column)
+        candidate = incoming.get(self.guard_column)
+        if current is None:
+            return True
+        return candidate is not None and candidate >= current
+
+    def __merge(self, existing: JSONDict, incoming: JSONDict) -> JSONDict:
+        merged = dict(existing)
+        for column, value in incoming.items():
+            current = merged.get(column)
+            if column in self.merge_columns and isinstance(current, dict) and isinstance(value, dict):
+                merged[column] = dict_merger.merge(current, value, update_list_operation='replace')
+            else:
+                merged[column] = value
+        return merged
+
+    def __strip(self, row: JSONDict) -> JSONDict:
+        for column, paths in self.strip_paths.items():
+            if isinstance(row.get(column), dict) and paths:
+                row[column] = copy.deepcopy(row[column])
+                for path in paths:
+                    self.__remove_path(row[column], path.split('.'))
+        return row
+
+    def __remove_path(self, document: JSONDict, segments: List[str]) -> None:
+        for segment in segments[:-1]:
+            document = document.get(segment)  # type: ignore[assignment]
+            if not isinstance(document, dict):
+                return
+        document.pop(segments[-1], None)
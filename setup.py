@@ -26,7 +26,16 @@ setup(
         "daplug-core>=1.0.0b9,<2; python_version >= '3.10'",
         "psycopg2-binary>=2.9.12,<3; python_version >= '3.9'",
         "mysql-connector-python>=9.7.0,<10; python_version >= '3.10'",
+        "simplejson>=4.1.1,<5; python_version >= '3.10'",
     ],
+    extras_require={
+        "async": [
+            "psycopg[binary,pool]>=3.2,<4",
+            "aiomysql>=0.2,<1",
+        ],
+        "numpy": ["numpy>=1.24"],
+        "arrow": ["pyarrow>=14"],
+    },
     keywords=[
         "daplug",
         "schema",
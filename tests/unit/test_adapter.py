@@ -1,3 +1,5 @@
+import threading
+import time
 from unittest import mock
 
 import pytest
@@ -8,6 +10,7 @@ import daplug_sql
 import daplug_sql.sql_connection as sc
 from daplug_sql.adapter import SQLAdapter
 from daplug_sql.exception import CreateTableException, SQLAdapterException
+from daplug_sql.statement_builder import StatementBuilder
 
 
 @pytest.fixture(autouse=True)
@@ -61,6 +64,83 @@ def test_connect_assigns_connection_and_cursor(monkeypatch):
     assert inst.cursor is cursor
 
 
+def test_thread_safe_adapter_gives_each_thread_its_own_cursor(monkeypatch, publish_mock):
+    class StubConnector:
+        def __init__(self, obj):
+            self.connection = mock.MagicMock(closed=0)
+            self.cursor_instance = mock.MagicMock()
+            self.cursor_instance.fetchone.return_value = {'id': 1}
+
+        def connect(self):
+            return self.connection
+
+        def cursor(self):
+            return self.cursor_instance
+
+    monkeypatch.setattr(sc, 'SQLConnector', StubConnector)
+    inst = SQLAdapter(endpoint='db.thread', database='app', user='svc', password='pw', thread_safe=True)
+    inst.connect()
+    main_cursor = inst.cursor
+    seen = []
+    barrier = threading.Barrier(2)
+
+    def worker():
+        barrier.wait()
+        assert inst.get(1, table='items', identifier='id') == {'id': 1}
+        seen.append(inst.cursor)
+        barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(cursor) for cursor in seen + [main_cursor]}) == 3
+    main_cursor.execute.assert_not_called()
+    inst.close()
+    for cursor in seen + [main_cursor]:
+        cursor.close.assert_called_once()
+    pool = sc._connection_cache[sc._build_cache_key(inst)]
+    assert len(pool.idle) == 3
+    with pytest.raises(SQLAdapterException):
+        inst.get(1, table='items', identifier='id')
+
+
+def test_thread_safe_adapter_releases_connection_when_thread_exits(monkeypatch, publish_mock):
+    monkeypatch.setattr(sc, 'SQLConnector', lambda obj: mock.MagicMock(connection=mock.MagicMock(closed=0)))
+    inst = SQLAdapter(endpoint='db.exit', database='app', user='svc', password='pw', thread_safe=True, pool_max_size=1)
+    inst.connect()
+    inst.release()
+    cursors = []
+
+    def worker():
+        inst.get(1, table='items', identifier='id')
+        cursors.append(inst.cursor)
+
+    for _ in range(3):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        deadline = time.monotonic() + 2
+        while inst.states.registry and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not inst.states.registry
+    assert len(cursors) == 3 and len({id(cursor) for cursor in cursors}) == 1
+    assert cursors[0].close.call_count == 4
+
+
+def test_release_returns_current_thread_connection(monkeypatch, publish_mock):
+    monkeypatch.setattr(sc, 'SQLConnector', lambda obj: mock.MagicMock(connection=mock.MagicMock(closed=0)))
+    inst = SQLAdapter(endpoint='db.release', database='app', user='svc', password='pw', thread_safe=True)
+    inst.connect()
+    cursor = inst.cursor
+    inst.release()
+    cursor.close.assert_called_once()
+    assert not inst.states.registry and inst.cursor is None
+    inst.get(1, table='items', identifier='id')
+    assert inst.cursor is not None and len(inst.states.registry) == 1
+
+
 def test_commit_controls_commit_call(adapter):
     adapter.commit(commit=True)
     adapter.connection.commit.assert_called_once()
@@ -100,6 +180,61 @@ def test_insert_raises_on_duplicate(adapter, monkeypatch):
     assert 'row already exist' in str(exc.value)
 
 
+def test_insert_atomic_uses_conflict_detection_in_one_round_trip(adapter, publish_mock):
+    adapter.cursor.rowcount = 1
+    assert adapter.insert(table='items', identifier='id', data={'id': 1, 'name': 'a'}, atomic=True) == {'id': 1, 'name': 'a'}
+    adapter.cursor.execute.assert_called_once_with(
+        'INSERT INTO "items" ("id", "name") VALUES (%s, %s) ON CONFLICT ("id") DO NOTHING', (1, 'a')
+    )
+    publish_mock.assert_called_once()
+    adapter.cursor.rowcount = 0
+    with pytest.raises(SQLAdapterException) as exc:
+        adapter.insert(table='items', identifier='id', data={'id': 1, 'name': 'a'}, atomic=True)
+    assert 'row already exist' in str(exc.value)
+    assert publish_mock.call_count == 1
+
+
+def test_insert_atomic_mysql_uses_insert_ignore(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.rowcount = 1
+    adapter.insert(table='items', identifier='id', data={'id': 1}, atomic=True)
+    adapter.cursor.execute.assert_called_once_with('INSERT IGNORE INTO `items` (`id`) VALUES (%s)', (1,))
+    with pytest.raises(KeyError):
+        adapter.insert(table='items', identifier='id', data={'name': 'a'}, atomic=True)
+
+
+def test_insert_many_batches_and_reports_rejected(adapter, publish_mock):
+    adapter.cursor.fetchall.side_effect = [[{'id': 1}], [{'id': 3}]]
+    rows = [{'id': 1}, {'id': 2}, {'id': 1}, {'id': 3}]
+    result = adapter.insert_many(rows, table='items', identifier='id', batch_size=2)
+    assert adapter.cursor.execute.call_count == 2
+    first_query, first_params = adapter.cursor.execute.call_args_list[0].args
+    assert first_query.startswith('INSERT INTO "items" ("id") VALUES (%s), (%s) ON CONFLICT ("id") DO NOTHING')
+    assert first_params == (1, 2)
+    assert result == {'inserted': [{'id': 1}, {'id': 3}], 'rejected': [1, 2]}
+    assert publish_mock.call_count == 2
+
+
+def test_insert_many_mysql_checks_existing_once_per_batch(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.fetchall.return_value = [{'id': 1}]
+    result = adapter.insert_many([{'id': 1}, {'id': 2}], table='items', identifier='id')
+    existing_query = adapter.cursor.execute.call_args_list[0].args[0]
+    insert_query, insert_params = adapter.cursor.execute.call_args_list[1].args
+    assert existing_query == 'SELECT `id` FROM `items` WHERE `id` IN (%s, %s)'
+    assert insert_query == 'INSERT INTO `items` (`id`) VALUES (%s)'
+    assert insert_params == (2,)
+    assert result == {'inserted': [{'id': 2}], 'rejected': [1]}
+    publish_mock.assert_called_once()
+
+
+def test_insert_many_validations(adapter):
+    with pytest.raises(KeyError):
+        adapter.insert_many([{'name': 'x'}], table='items', identifier='id')
+    with pytest.raises(ValueError):
+        adapter.insert_many([{'id': 1}], table='items', identifier='id', batch_size=0)
+
+
 def test_update_merges_and_executes(adapter, publish_mock, monkeypatch):
     monkeypatch.setattr(SQLAdapter, '_SQLAdapter__get_existing', lambda self, **_: {'id': 1, 'name': 'old'})
 
@@ -129,6 +264,30 @@ def test_update_raises_when_missing(adapter, monkeypatch):
     assert 'does not exist' in str(exc.value)
 
 
+def test_update_atomic_merges_in_one_statement(adapter, publish_mock):
+    adapter.cursor.fetchone.return_value = {'id': 1, 'doc': {'a': 1, 'b': 2}}
+    row = adapter.update(data={'id': 1, 'doc': {'b': 2}}, table='items', identifier='id', atomic=True)
+    query, params = adapter.cursor.execute.call_args.args
+    assert query == 'UPDATE "items" SET "doc" = daplug_json_merge("doc", %s) WHERE "id" = %s RETURNING *'
+    assert params[1] == 1
+    assert row == {'id': 1, 'doc': {'a': 1, 'b': 2}}
+    publish_mock.assert_called_once()
+    adapter.cursor.fetchone.return_value = None
+    with pytest.raises(SQLAdapterException):
+        adapter.update(data={'id': 2, 'doc': {}}, table='items', identifier='id', atomic=True)
+
+
+def test_update_atomic_mysql_refetches_row(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.fetchone.return_value = {'id': 1, 'doc': '{"a": 1}'}
+    adapter.update(data={'id': 1, 'doc': {'a': 1}}, table='items', identifier='id', atomic=True)
+    queries = [call.args[0] for call in adapter.cursor.execute.call_args_list]
+    assert queries == [
+        'UPDATE `items` SET `doc` = JSON_MERGE_PATCH(COALESCE(`doc`, JSON_OBJECT()), %s) WHERE `id` = %s',
+        'SELECT * FROM `items` WHERE `id` = %s',
+    ]
+
+
 def test_upsert_legacy_paths(adapter, monkeypatch):
     updater = mock.MagicMock(return_value='updated')
     inserter = mock.MagicMock(return_value='inserted')
@@ -172,6 +331,78 @@ def test_upsert_atomic_mysql_refetches_written_row(adapter, publish_mock):
     publish_mock.assert_called_once()
 
 
+def test_upsert_atomic_mysql_returning_modes(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.rowcount = 1
+    data = {'id': 1, 'name': 'new', 'doc': {'a': 1}}
+    assert adapter.upsert(table='items', identifier='id', data=data, returning=False) == data
+    assert adapter.upsert(table='items', identifier='id', data=data, returning='auto') == data
+    assert adapter.cursor.execute.call_count == 2
+    adapter.upsert(table='items', identifier='id', data=data, returning='auto', merge_columns=['doc'])
+    assert adapter.cursor.execute.call_count == 4
+    assert adapter.cursor.execute.call_args.args[0] == 'SELECT * FROM `items` WHERE `id` = %s'
+    adapter.cursor.rowcount = 0
+    assert adapter.upsert(table='items', identifier='id', data=data, returning=False) is None
+
+
+def test_upsert_many_mysql_returning_modes(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    rows = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    assert adapter.upsert_many(rows, table='items', identifier='id', returning='auto') == rows
+    assert adapter.cursor.execute.call_count == 1
+    adapter.upsert_many(rows, table='items', identifier='id', returning='auto', guard_column='name')
+    assert adapter.cursor.execute.call_count == 3
+    adapter.upsert_many(rows, table='items', identifier='id', returning=False, guard_column='name')
+    assert adapter.cursor.execute.call_count == 5
+
+
+def test_upsert_many_mysql_guard_returns_only_applied_rows(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.fetchall.return_value = [{'id': 2, 'version': 7}]
+    rows = [{'id': 1, 'version': 3}, {'id': 2, 'version': 7}]
+    result = adapter.upsert_many(rows, table='items', identifier='id', guard_column='version')
+    query, params = adapter.cursor.execute.call_args.args
+    assert query == (
+        'SELECT * FROM `items` WHERE (`id` = %s AND `version` <=> %s) OR (`id` = %s AND `version` <=> %s)'
+    )
+    assert params == (1, 3, 2, 7)
+    assert result == [{'id': 2, 'version': 7}]
+    publish_mock.assert_called_once()
+
+
+def test_upsert_many_returns_written_rows_in_one_fetch(adapter, publish_mock):
+    adapter.cursor.fetchall.return_value = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    rows = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    result = adapter.upsert_many(rows, table='items', identifier='id', guard_column='name')
+    adapter.cursor.execute.assert_called_once()
+    query = adapter.cursor.execute.call_args.args[0]
+    assert 'VALUES (%s, %s), (%s, %s) ON CONFLICT ("id") DO UPDATE SET' in query
+    assert result == rows
+    assert publish_mock.call_count == 2
+
+
+def test_upsert_many_mysql_refetches_batch_with_in_clause(adapter, publish_mock):
+    adapter.engine = 'mysql'
+    adapter.cursor.fetchall.return_value = [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}]
+    result = adapter.upsert_many([{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}], table='items', identifier='id')
+    assert adapter.cursor.execute.call_count == 2
+    refetch_query, refetch_params = adapter.cursor.execute.call_args_list[1].args
+    assert refetch_query == 'SELECT * FROM `items` WHERE `id` IN (%s, %s)'
+    assert refetch_params == (1, 2)
+    assert len(result) == 2
+
+
+def test_upsert_many_coalesces_duplicate_identifiers(adapter, publish_mock):
+    adapter.cursor.fetchall.return_value = [{'id': 1, 'name': 'b'}]
+    adapter.upsert_many([{'id': 1, 'name': 'a'}, {'id': 1, 'name': 'b'}], table='items', identifier='id')
+    params = adapter.cursor.execute.call_args.args[1]
+    assert params == (1, 'b')
+    adapter.cursor.execute.reset_mock()
+    adapter.upsert_many([{'id': 1, 'name': 'a'}, {'id': 1, 'name': 'b'}], table='items', identifier='id', coalesce=False)
+    params = adapter.cursor.execute.call_args.args[1]
+    assert params == (1, 'a', 1, 'b')
+
+
 def test_create_table_validates_and_executes(adapter):
     with pytest.raises(CreateTableException) as exc:
         adapter.create_table(query='DROP TABLE items')
@@ -201,6 +432,141 @@ def test_get_returns_row(adapter):
     assert row == {'id': 1}
 
 
+def test_prepared_get_executes_through_connector_and_reads_its_cursor(adapter):
+    prepared_cursor = mock.MagicMock()
+    prepared_cursor.fetchone.return_value = {'id': 7}
+    adapter.connector = mock.MagicMock()
+    adapter.connector.execute_prepared.return_value = prepared_cursor
+    row = adapter.get(7, table='items', identifier='id', prepared=True)
+    adapter.connector.execute_prepared.assert_called_once_with(adapter.cursor, 'SELECT * FROM "items" WHERE "id" = %s', (7,))
+    assert row == {'id': 7}
+    adapter.query(query='SELECT 1', params=())
+    adapter.cursor.execute.assert_called_once_with('SELECT 1', ())
+
+
+def test_get_many_chunks_keys_and_marks_missing(adapter):
+    adapter.cursor.fetchall.side_effect = [[{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}], [{'id': 4, 'name': 'd'}]]
+    result = adapter.get_many([1, 2, 3, 2, 4], table='items', identifier='id', batch_size=3)
+    assert result == {1: {'id': 1, 'name': 'a'}, 2: {'id': 2, 'name': 'b'}, 3: None, 4: {'id': 4, 'name': 'd'}}
+    assert adapter.cursor.execute.call_args_list == [
+        mock.call('SELECT * FROM "items" WHERE "id" = ANY(%s)', ([1, 2, 3],)),
+        mock.call('SELECT * FROM "items" WHERE "id" = ANY(%s)', ([4],)),
+    ]
+
+
+def test_get_many_mysql_uses_in_clause(adapter):
+    adapter.engine = 'mysql'
+    adapter.cursor.fetchall.return_value = [{'id': 'a'}]
+    assert adapter.get_many(['a', 'b'], table='items', identifier='id') == {'a': {'id': 'a'}, 'b': None}
+    adapter.cursor.execute.assert_called_once_with('SELECT * FROM `items` WHERE `id` IN (%s, %s)', ('a', 'b'))
+    assert adapter.get_many([], table='items', identifier='id') == {}
+
+
+def test_iter_query_streams_rows_and_chunks(adapter):
+    stream = mock.MagicMock()
+    stream.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+    adapter.connector = mock.MagicMock()
+    adapter.connector.stream_cursor.return_value = stream
+    rows = list(adapter.iter_query(query='SELECT * FROM items', params=(), chunk_size=2))
+    assert rows == [{'id': 1}, {'id': 2}, {'id': 3}]
+    adapter.connector.stream_cursor.assert_called_once_with(2, dictionary=True)
+    stream.execute.assert_called_once_with('SELECT * FROM items', ())
+    stream.close.assert_called_once()
+    stream.fetchmany.side_effect = [[{'id': 1}], []]
+    assert list(adapter.iter_query(query='SELECT 1', params=(), chunks=True)) == [[{'id': 1}]]
+
+
+def test_iter_query_validates_and_wraps_errors(adapter):
+    adapter.connector = mock.MagicMock()
+    with pytest.raises(SQLAdapterException):
+        next(adapter.iter_query(query='SELECT 1'))
+    with pytest.raises(ValueError):
+        next(adapter.iter_query(query='SELECT 1', params=(), chunk_size=0))
+    stream = adapter.connector.stream_cursor.return_value
+    stream.execute.side_effect = RuntimeError('boom')
+    with pytest.raises(SQLAdapterException):
+        next(adapter.iter_query(query='SELECT 1', params=()))
+    stream.close.assert_called_once()
+
+
+def test_mysql_iter_query_streams_on_a_borrowed_connection(adapter, monkeypatch):
+    connection = mock.MagicMock(closed=0, autocommit=True)
+    borrowed = mock.MagicMock(connection=connection)
+    stream = borrowed.stream_cursor.return_value
+    stream.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+    monkeypatch.setattr(sc, 'SQLConnector', lambda obj: borrowed)
+    adapter.engine = 'mysql'
+    adapter.connector = mock.MagicMock()
+    assert list(adapter.iter_query(query='SELECT * FROM items', params=(), chunk_size=2)) == [
+        {'id': 1}, {'id': 2}, {'id': 3},
+    ]
+    adapter.connector.stream_cursor.assert_not_called()
+    stream.close.assert_called_once()
+    pool = sc._connection_cache[sc._build_cache_key(adapter)]
+    assert pool.idle[0][0] is borrowed
+
+    stream.fetchmany.side_effect = [[{'id': 1}, {'id': 2}], [{'id': 3}], []]
+    rows = adapter.iter_query(query='SELECT * FROM items', params=(), chunk_size=2)
+    assert next(rows) == {'id': 1}
+    rows.close()
+    stream.close.assert_called_once()
+    connection.close.assert_called_once()
+    assert not pool.idle and pool.size == 0
+
+
+def test_query_columns_transposes_tuple_chunks(adapter):
+    stream = mock.MagicMock(description=(('id',), ('score',)))
+    stream.fetchmany.side_effect = [[(1, 2.5), (2, 3.5)], [(3, 4.5)], []]
+    adapter.connector = mock.MagicMock()
+    adapter.connector.stream_cursor.return_value = stream
+    columns = adapter.query_columns(query='SELECT id, score FROM metrics', params=(), chunk_size=2)
+    assert columns == {'id': [1, 2, 3], 'score': [2.5, 3.5, 4.5]}
+    adapter.connector.stream_cursor.assert_called_once_with(2, dictionary=False)
+    stream.close.assert_called_once()
+    with pytest.raises(SQLAdapterException):
+        adapter.query_columns(query='DELETE FROM metrics', params=())
+
+
+def test_row_format_reads_through_tuple_cursor(adapter):
+    tuples = mock.MagicMock(description=(('id',), ('name',)))
+    tuples.fetchall.return_value = [(1, 'a'), (2, 'b')]
+    tuples.fetchone.return_value = (1, 'a')
+    adapter.connector = mock.MagicMock()
+    adapter.connector.tuple_cursor.return_value = tuples
+    rows = adapter.query(query='SELECT id, name FROM items', params=(), row_format='tuple')
+    assert rows == [(1, 'a'), (2, 'b')]
+    tuples.execute.assert_called_once_with('SELECT id, name FROM items', ())
+    record = adapter.get(1, table='items', identifier='id', row_format='record')
+    assert (record.id, record.name) == (1, 'a')
+    tuples.fetchone.return_value = None
+    assert adapter.get(2, table='items', identifier='id', row_format='tuple') is None
+    assert tuples.close.call_count == 3
+    adapter.cursor.execute.assert_not_called()
+
+
+def test_iter_query_formats_streamed_chunks(adapter):
+    stream = mock.MagicMock(description=(('id',),))
+    stream.fetchmany.side_effect = [[(1,), (2,)], []]
+    adapter.connector = mock.MagicMock()
+    adapter.connector.stream_cursor.return_value = stream
+    chunks = list(adapter.iter_query(query='SELECT id FROM items', params=(), chunks=True, row_format='tuple'))
+    assert chunks == [[(1,), (2,)]] and chunks[0].columns == {'id': 0}
+    adapter.connector.stream_cursor.assert_called_once_with(500, dictionary=False)
+
+
+def test_paginate_and_iter_pages_walk_keyset(adapter):
+    adapter.cursor.fetchall.side_effect = [[{'id': 1}, {'id': 2}, {'id': 3}], [{'id': 3}]]
+    pages = list(adapter.iter_pages(table='items', identifier='id', page_size=2))
+    assert pages == [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+    assert adapter.cursor.execute.call_args_list == [
+        mock.call('SELECT * FROM "items" ORDER BY "id" LIMIT %s', (3,)),
+        mock.call('SELECT * FROM "items" WHERE "id" > %s ORDER BY "id" LIMIT %s', (2, 3)),
+    ]
+    adapter.cursor.fetchall.side_effect = None
+    adapter.cursor.fetchall.return_value = []
+    assert adapter.paginate(table='items', identifier='id') == {'items': [], 'next': None}
+
+
 def test_query_validation(adapter):
     with pytest.raises(SQLAdapterException):
         adapter.query(query='select 1')
@@ -269,8 +635,8 @@ def test_execute_handles_errors(adapter):
 
 def test_build_placeholders_and_format_identifier(adapter):
     with pytest.raises(ValueError):
-        adapter._SQLAdapter__build_placeholders(0)
-    assert adapter._SQLAdapter__build_placeholders(2) == '%s, %s'
+        StatementBuilder(adapter.engine).placeholders(0)
+    assert StatementBuilder(adapter.engine).placeholders(2) == '%s, %s'
     assert adapter._SQLAdapter__format_identifier('abc') == '"abc"'
     adapter.engine = 'mysql'
     assert adapter._SQLAdapter__format_identifier('abc') == '`abc`'
@@ -294,8 +660,8 @@ def test_raise_error_paths(adapter):
 
 
 def test_close_closes_cursor_and_connection(adapter, monkeypatch):
-    close_connectors = mock.MagicMock()
-    monkeypatch.setattr(sc, '_close_connectors_for', close_connectors)
+    release = mock.MagicMock()
+    monkeypatch.setattr(sc, '_release_connector_for', release)
     cursor = adapter.cursor
     connection = adapter.connection
     adapter.close()
@@ -303,4 +669,46 @@ def test_close_closes_cursor_and_connection(adapter, monkeypatch):
     connection.close.assert_called_once()
     assert adapter.cursor is None
     assert adapter.connection is None
+    release.assert_called_once_with(adapter)
+
+
+def test_close_returns_pooled_connection_without_closing_it(adapter, monkeypatch):
+    release = mock.MagicMock()
+    monkeypatch.setattr(sc, '_release_connector_for', release)
+    adapter.connector = mock.MagicMock()
+    connection = adapter.connection
+    adapter.close()
+    connection.close.assert_not_called()
+    assert adapter.connection is None
+    release.assert_called_once_with(adapter)
+
+
+def test_close_pool_closes_every_pooled_connection(adapter, monkeypatch):
+    close_connectors = mock.MagicMock()
+    monkeypatch.setattr(sc, '_close_connectors_for', close_connectors)
+    adapter.close_pool()
     close_connectors.assert_called_once_with(adapter)
+
+
+def test_close_flushes_registered_buffers(adapter, monkeypatch):
+    monkeypatch.setattr(sc, '_release_connector_for', mock.MagicMock())
+    upsert_many = mock.MagicMock(return_value=[])
+    monkeypatch.setattr(SQLAdapter, 'upsert_many', upsert_many)
+    projection = adapter.buffer(max_rows=10, flush_interval_ms=None)
+    projection.upsert(data={'id': 1}, table='items', identifier='id')
+    adapter.close()
+    upsert_many.assert_called_once_with([{'id': 1}], table='items', identifier='id')
+    assert adapter.buffers == []
+
+
+def test_close_finishes_cleanup_when_a_buffer_flush_fails(adapter, monkeypatch):
+    monkeypatch.setattr(sc, '_release_connector_for', mock.MagicMock())
+    monkeypatch.setattr(SQLAdapter, 'upsert_many', mock.MagicMock(side_effect=RuntimeError('db down')))
+    adapter.batch_publisher = mock.MagicMock()
+    projection = adapter.buffer(max_rows=10, flush_interval_ms=None)
+    projection.upsert(data={'id': 1}, table='items', identifier='id')
+    with pytest.raises(RuntimeError):
+        adapter.close()
+    adapter.batch_publisher.close.assert_called_once()
+    assert adapter.cursor is None
+    assert adapter.buffers == [projection] and projection.queued == 1
@@ -0,0 +1,215 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+import daplug_sql
+from daplug_sql.async_adapter import AsyncSQLAdapter
+from daplug_sql.exception import CreateTableException, SQLAdapterException
+
+
+@pytest.fixture
+def publish_mock(monkeypatch):
+    mock_publish = mock.MagicMock()
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', mock_publish)
+    return mock_publish
+
+
+@pytest.fixture
+def adapter(publish_mock):
+    inst = AsyncSQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    inst.connector.execute = mock.AsyncMock(return_value=([{'id': 1}], 1))
+    return inst
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_factory_returns_async_adapter():
+    instance = daplug_sql.async_adapter(endpoint='db.local', database='app', user='svc', password='pw', pool_max_size=4)
+    assert isinstance(instance, AsyncSQLAdapter)
+    assert instance.connector.max_size == 4
+
+
+def test_get_returns_first_row(adapter):
+    assert run(adapter.get(1, table='items', identifier='id')) == {'id': 1}
+    adapter.connector.execute.assert_awaited_once_with('SELECT * FROM "items" WHERE "id" = %s', (1,))
+    adapter.connector.execute.return_value = ([], 0)
+    assert run(adapter.get(2, table='items', identifier='id')) is None
+
+
+def test_get_many_returns_dict_with_missing_keys(adapter):
+    adapter.connector.execute.return_value = ([{'id': 1}], 1)
+    assert run(adapter.get_many([1, 2], table='items', identifier='id')) == {1: {'id': 1}, 2: None}
+    adapter.connector.execute.assert_awaited_once_with('SELECT * FROM "items" WHERE "id" = ANY(%s)', ([1, 2],))
+
+
+def test_iter_query_yields_rows_from_stream(adapter):
+    async def stream(query, params, chunk_size):
+        yield [{'id': 1}, {'id': 2}]
+        yield [{'id': 3}]
+
+    adapter.connector.stream = stream
+
+    async def collect(**kwargs):
+        return [row async for row in adapter.iter_query(query='SELECT 1', params=(), **kwargs)]
+
+    assert run(collect()) == [{'id': 1}, {'id': 2}, {'id': 3}]
+    assert run(collect(chunks=True)) == [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+
+
+def test_iter_pages_follows_tokens(adapter):
+    adapter.connector.execute.side_effect = [([{'id': 1}, {'id': 2}], 2), ([{'id': 2}], 1)]
+
+    async def collect():
+        return [page async for page in adapter.iter_pages(table='items', identifier='id', page_size=1)]
+
+    assert run(collect()) == [[{'id': 1}], [{'id': 2}]]
+    assert adapter.connector.execute.await_args_list[1].args[1] == (1, 2)
+
+
+def test_insert_checks_uniqueness_then_publishes(adapter, publish_mock):
+    adapter.connector.execute.side_effect = [([], 0), ([], 1)]
+    result = run(adapter.insert(data={'id': 1, 'doc': {'a': 1}}, table='items', identifier='id'))
+    query, params = adapter.connector.execute.await_args_list[1].args
+    assert query == 'INSERT INTO "items" ("id", "doc") VALUES (%s, %s)'
+    assert params[1].obj == {'a': 1}
+    assert result == {'id': 1, 'doc': {'a': 1}}
+    publish_mock.assert_called_once()
+    adapter.connector.execute.side_effect = None
+    with pytest.raises(SQLAdapterException):
+        run(adapter.insert(data={'id': 1}, table='items', identifier='id'))
+
+
+def test_update_atomic_returns_merged_row(adapter, publish_mock):
+    adapter.connector.execute.return_value = ([{'id': 1, 'doc': {'a': 1}}], 1)
+    row = run(adapter.update(data={'id': 1, 'doc': {'a': 1}}, table='items', identifier='id', atomic=True))
+    assert row == {'id': 1, 'doc': {'a': 1}}
+    assert adapter.connector.execute.await_count == 1
+    adapter.connector.execute.return_value = ([], 0)
+    with pytest.raises(SQLAdapterException):
+        run(adapter.update(data={'id': 1, 'doc': {}}, table='items', identifier='id', atomic=True))
+    publish_mock.assert_called_once()
+
+
+def test_mysql_upsert_returning_false_skips_refetch(publish_mock):
+    inst = AsyncSQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', engine='mysql')
+    inst.connector.execute = mock.AsyncMock(return_value=([], 1))
+    row = run(inst.upsert(data={'id': 1, 'name': 'a'}, table='items', identifier='id', returning=False))
+    assert row == {'id': 1, 'name': 'a'}
+    assert inst.connector.execute.await_count == 1
+
+
+def test_insert_atomic_checks_rowcount(adapter, publish_mock):
+    adapter.connector.execute.return_value = ([], 1)
+    run(adapter.insert(data={'id': 1}, table='items', identifier='id', atomic=True))
+    adapter.connector.execute.assert_awaited_once_with(
+        'INSERT INTO "items" ("id") VALUES (%s) ON CONFLICT ("id") DO NOTHING', (1,)
+    )
+    adapter.connector.execute.return_value = ([], 0)
+    with pytest.raises(SQLAdapterException):
+        run(adapter.insert(data={'id': 1}, table='items', identifier='id', atomic=True))
+    publish_mock.assert_called_once()
+
+
+def test_update_merges_existing_row(adapter, publish_mock):
+    adapter.connector.execute.side_effect = [([{'id': 1, 'doc': {'a': 1}}], 1), ([], 1)]
+    result = run(adapter.update(data={'id': 1, 'doc': {'b': 2}}, table='items', identifier='id'))
+    assert result == {'id': 1, 'doc': {'a': 1, 'b': 2}}
+    query = adapter.connector.execute.await_args_list[1].args[0]
+    assert query == 'UPDATE "items" SET "doc" = %s WHERE "id" = %s'
+    adapter.connector.execute.side_effect = None
+    adapter.connector.execute.return_value = ([], 0)
+    with pytest.raises(SQLAdapterException):
+        run(adapter.update(data={'id': 9, 'doc': {}}, table='items', identifier='id'))
+
+
+def test_upsert_uses_upsert_builder_and_returning_row(adapter, publish_mock):
+    adapter.connector.execute.return_value = ([{'id': 1, 'name': 'merged'}], 1)
+    result = run(adapter.upsert(data={'id': 1, 'name': 'new'}, table='items', identifier='id'))
+    query = adapter.connector.execute.await_args.args[0]
+    assert 'ON CONFLICT ("id") DO UPDATE SET' in query
+    assert result == {'id': 1, 'name': 'merged'}
+    publish_mock.assert_called_once()
+    adapter.connector.execute.return_value = ([], 0)
+    assert run(adapter.upsert(data={'id': 1, 'name': 'old'}, table='items', identifier='id', guard_column='name')) is None
+
+
+def test_upsert_mysql_refetches_written_row(adapter):
+    adapter.engine = 'mysql'
+    adapter.connector.execute.side_effect = [([], 2), ([{'id': 1, 'name': 'stored'}], 1)]
+    result = run(adapter.upsert(data={'id': 1, 'name': 'new'}, table='items', identifier='id'))
+    assert 'ON DUPLICATE KEY UPDATE' in adapter.connector.execute.await_args_list[0].args[0]
+    assert result == {'id': 1, 'name': 'stored'}
+
+
+def test_query_delete_and_create_table(adapter, publish_mock):
+    with pytest.raises(SQLAdapterException):
+        run(adapter.query(query='select 1'))
+    with pytest.raises(SQLAdapterException):
+        run(adapter.query(query='delete from items', params={}))
+    assert run(adapter.query(query='select * from items', params={})) == [{'id': 1}]
+    run(adapter.delete(1, table='items', identifier='id'))
+    publish_mock.assert_called_once()
+    with pytest.raises(CreateTableException):
+        run(adapter.create_table(query='DROP TABLE items'))
+
+
+def test_execute_wraps_driver_errors(adapter):
+    adapter.connector.execute.side_effect = RuntimeError('driver failure')
+    with pytest.raises(SQLAdapterException) as exc:
+        run(adapter.get(1, table='items', identifier='id'))
+    assert 'driver failure' in str(exc.value)
+
+
+def test_batch_publish_mode_flushes_on_close():
+    instance = AsyncSQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', publish_mode='batch')
+    instance.batch_publisher = mock.MagicMock()
+    instance.connector.close = mock.AsyncMock()
+    run(instance.flush_publishes())
+    instance.batch_publisher.flush.assert_called_once()
+    run(instance.close())
+    instance.batch_publisher.close.assert_called_once()
+    instance.connector.close.assert_awaited_once()
+
+
+def test_pipeline_sends_queued_statements_and_publishes_returned_rows(adapter, publish_mock):
+    adapter.connector.pipeline = mock.AsyncMock(return_value=[([{'id': 1, 'name': 'stored'}], 1), ([], 1)])
+
+    async def write():
+        async with adapter.pipeline() as queued:
+            queued.upsert(table='items', identifier='id', data={'id': 1, 'name': 'a'})
+            queued.delete(2, table='carts', identifier='id')
+        return queued.results
+
+    assert run(write()) == [{'id': 1, 'name': 'stored'}, None]
+    statements = adapter.connector.pipeline.await_args.args[0]
+    assert len(statements) == 2 and statements[1] == ('DELETE FROM "carts" WHERE "id" = %s', (2,))
+    assert [call.args[0] for call in publish_mock.call_args_list] == [{'id': 1, 'name': 'stored'}, {'id': 2}]
+
+
+def test_pipeline_skips_writes_that_changed_nothing(adapter, publish_mock):
+    adapter.connector.pipeline = mock.AsyncMock(return_value=[([], 0), ([], 0), ([], 1)])
+
+    async def write():
+        async with adapter.pipeline() as queued:
+            queued.update(table='items', identifier='id', data={'id': 404, 'name': 'gone'})
+            queued.upsert(table='items', identifier='id', data={'id': 1, 'version': 1}, guard_column='version')
+            queued.insert(table='audit', data={'id': 9})
+        return queued.results
+
+    assert run(write()) == [None, None, {'id': 9}]
+    assert [call.args[0] for call in publish_mock.call_args_list] == [{'id': 9}]
+
+
+def test_pipeline_wraps_driver_errors(adapter, publish_mock):
+    adapter.connector.pipeline = mock.AsyncMock(side_effect=RuntimeError('broken pipe'))
+
+    async def write():
+        async with adapter.pipeline() as queued:
+            queued.execute('DELETE FROM items')
+
+    with pytest.raises(SQLAdapterException):
+        run(write())
+    publish_mock.assert_not_called()
@@ -0,0 +1,172 @@
+import asyncio
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+from daplug_sql.async_connector import AsyncSQLConnector
+from daplug_sql.exception import SQLAdapterException
+from tests.unit.mocks.adapters import ConnectorHost
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.description = [('id',)] if rows else None
+        self.rowcount = len(rows)
+        self.executed = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    async def execute(self, query, params):
+        self.executed.append((query, params))
+
+    async def fetchall(self):
+        return self.rows
+
+    async def close(self):
+        return None
+
+    async def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self.cursor_instance = cursor
+        self.cursor_args = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        return None
+
+    def cursor(self, *args, **kwargs):
+        self.cursor_args.append((args, kwargs))
+        return self.cursor_instance
+
+    def transaction(self):
+        return self
+
+    def pipeline(self):
+        return self
+
+    async def begin(self):
+        self.cursor_args.append('begin')
+
+    async def commit(self):
+        self.cursor_args.append('commit')
+
+    async def rollback(self):
+        self.cursor_args.append('rollback')
+
+
+def test_postgres_pool_opens_with_dict_rows(monkeypatch):
+    pool = mock.MagicMock()
+    pool.open = mock.AsyncMock()
+    pool_class = mock.MagicMock(return_value=pool)
+    monkeypatch.setitem(sys.modules, 'psycopg_pool', types.SimpleNamespace(AsyncConnectionPool=pool_class))
+    connector = AsyncSQLConnector(ConnectorHost(), max_size=5)
+    asyncio.run(connector.open())
+    kwargs = pool_class.call_args.kwargs
+    assert kwargs['max_size'] == 5
+    assert kwargs['kwargs']['autocommit'] is True
+    assert kwargs['kwargs']['dbname'] == 'app'
+    pool.open.assert_awaited_once()
+
+
+def test_postgres_execute_fetches_rows_and_rowcount():
+    cursor = FakeCursor([{'id': 1}])
+    connector = AsyncSQLConnector(ConnectorHost())
+    connector.pool = mock.MagicMock()
+    connector.pool.connection.return_value = FakeConnection(cursor)
+    rows, rowcount = asyncio.run(connector.execute('SELECT 1', None))
+    assert rows == [{'id': 1}]
+    assert rowcount == 1
+
+
+def test_mysql_pool_and_execute(monkeypatch):
+    pool = mock.MagicMock()
+    pool.wait_closed = mock.AsyncMock()
+    fake_aiomysql = types.SimpleNamespace(create_pool=mock.AsyncMock(return_value=pool), DictCursor=object)
+    monkeypatch.setitem(sys.modules, 'aiomysql', fake_aiomysql)
+    connector = AsyncSQLConnector(ConnectorHost(engine='mysql', port=3306))
+    asyncio.run(connector.open())
+    assert fake_aiomysql.create_pool.await_args.kwargs['autocommit'] is True
+    cursor = FakeCursor([])
+    pool.acquire.return_value = FakeConnection(cursor)
+    assert asyncio.run(connector.execute('DELETE FROM t', ())) == ([], 0)
+    asyncio.run(connector.close())
+    pool.close.assert_called_once()
+    pool.wait_closed.assert_awaited_once()
+
+
+def test_execute_requires_open_pool_and_missing_driver(monkeypatch):
+    connector = AsyncSQLConnector(ConnectorHost())
+    with pytest.raises(SQLAdapterException):
+        asyncio.run(connector.execute('SELECT 1'))
+    monkeypatch.setitem(sys.modules, 'psycopg_pool', None)
+    with pytest.raises(SQLAdapterException):
+        asyncio.run(connector.open())
+
+
+def test_postgres_stream_uses_named_cursor_in_transaction():
+    cursor = FakeCursor([{'id': 1}, {'id': 2}, {'id': 3}])
+    connection = FakeConnection(cursor)
+    connector = AsyncSQLConnector(ConnectorHost())
+    connector.pool = mock.MagicMock()
+    connector.pool.connection.return_value = connection
+
+    async def collect():
+        return [chunk async for chunk in connector.stream('SELECT * FROM items', (), 2)]
+
+    assert asyncio.run(collect()) == [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+    assert connection.cursor_args[0][1]['name'].startswith('daplug_stream_')
+
+
+def test_mysql_stream_uses_unbuffered_dict_cursor(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'aiomysql', types.SimpleNamespace(SSDictCursor='ss-dict'))
+    cursor = FakeCursor([{'id': 1}])
+    connection = FakeConnection(cursor)
+    connector = AsyncSQLConnector(ConnectorHost(engine='mysql', port=3306))
+    connector.pool = mock.MagicMock()
+    connector.pool.acquire.return_value = connection
+
+    async def collect():
+        return [chunk async for chunk in connector.stream('SELECT 1', (), 10)]
+
+    assert asyncio.run(collect()) == [[{'id': 1}]]
+    assert connection.cursor_args == [(('ss-dict',), {})]
+
+
+def test_postgres_pipeline_queues_statements_then_collects_rows():
+    cursor = FakeCursor([{'id': 1}])
+    connector = AsyncSQLConnector(ConnectorHost())
+    connector.pool = mock.MagicMock()
+    connector.pool.connection.return_value = FakeConnection(cursor)
+    statements = [('INSERT INTO t VALUES (%s) RETURNING *', (1,)), ('DELETE FROM u WHERE id = %s', (2,))]
+    assert asyncio.run(connector.pipeline(statements)) == [([{'id': 1}], 1), ([{'id': 1}], 1)]
+    assert cursor.executed == statements
+
+
+def test_mysql_pipeline_rolls_back_on_failure():
+    cursor = FakeCursor([])
+    cursor.execute = mock.AsyncMock(side_effect=[None, RuntimeError('duplicate')])
+    connection = FakeConnection(cursor)
+    connector = AsyncSQLConnector(ConnectorHost(engine='mysql', port=3306))
+    connector.pool = mock.MagicMock()
+    connector.pool.acquire.return_value = connection
+    with pytest.raises(RuntimeError):
+        asyncio.run(connector.pipeline([('DELETE FROM t', None), ('INSERT INTO t VALUES (1)', None)]))
+    assert connection.cursor_args[0] == 'begin' and connection.cursor_args[-1] == 'rollback'
+    connection.cursor_args.clear()
+    cursor.execute = mock.AsyncMock()
+    assert asyncio.run(connector.pipeline([('DELETE FROM t', None)])) == [([], 0)]
+    assert connection.cursor_args[-1] == 'commit'
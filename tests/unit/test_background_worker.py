@@ -0,0 +1,42 @@
+import threading
+
+from daplug_sql.background_worker import BackgroundWorker
+
+
+def test_items_are_handled_in_batches_and_joined():
+    handled = []
+    worker = BackgroundWorker('test-worker', handled.append, linger=0.5, batch_size=3)
+    for index in range(7):
+        worker.put(index)
+    worker.join()
+    assert [item for batch in handled for item in batch] == list(range(7))
+    assert max(len(batch) for batch in handled) == 3
+    worker.close()
+    assert worker.thread is None
+
+
+def test_close_drains_pending_items_and_runs_stop_hook():
+    handled = []
+    stopped = threading.Event()
+    gate = threading.Event()
+
+    def handle(batch):
+        gate.wait()
+        handled.extend(batch)
+
+    worker = BackgroundWorker('test-worker', handle, on_stop=stopped.set)
+    worker.put(1)
+    worker.put(2)
+    gate.set()
+    worker.close()
+    assert handled == [1, 2] and stopped.is_set()
+
+
+def test_worker_restarts_after_close():
+    handled = []
+    worker = BackgroundWorker('test-worker', handled.extend)
+    worker.put(1)
+    worker.close()
+    worker.put(2)
+    worker.close()
+    assert handled == [1, 2]
@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.batch_publisher import BatchPublisher, configured_publisher
+
+ARN = 'arn:aws:sns:us-east-1:000000000000:events'
+
+
+class FakeSNS:
+    def __init__(self, fail_ids=(), error=None):
+        self.batches = []
+        self.fail_ids = set(fail_ids)
+        self.error = error
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def publish_batch(self, **kwargs):
+        self.gate.wait()
+        if self.error:
+            raise self.error
+        self.batches.append(kwargs)
+        entries = kwargs['PublishBatchRequestEntries']
+        return {
+            'Successful': [{'Id': entry['Id']} for entry in entries if entry['Id'] not in self.fail_ids],
+            'Failed': [{'Id': entry['Id'], 'Code': 'Throttled'} for entry in entries if entry['Id'] in self.fail_ids],
+        }
+
+
+def test_events_are_sent_in_batches_of_ten():
+    client = FakeSNS()
+    publisher = BatchPublisher(client=client, linger=0.5)
+    for index in range(25):
+        publisher.publish(arn=ARN, data={'id': index}, attributes={'event': {'DataType': 'String', 'StringValue': 'x'}})
+    publisher.close()
+    sizes = [len(batch['PublishBatchRequestEntries']) for batch in client.batches]
+    assert sum(sizes) == 25 and max(sizes) == 10
+    first = client.batches[0]['PublishBatchRequestEntries'][0]
+    assert client.batches[0]['TopicArn'] == ARN
+    assert first == {'Id': '0', 'Message': '{"id": 0}', 'MessageAttributes': {'event': {'DataType': 'String', 'StringValue': 'x'}}}
+
+
+def test_batches_are_split_by_request_size():
+    client = FakeSNS()
+    publisher = BatchPublisher(client=client, linger=0.5)
+    blob = 'x' * (100 * 1024)
+    for index in range(5):
+        publisher.publish(arn=ARN, data={'id': index, 'blob': blob},
+                          attributes={'event': {'DataType': 'String', 'StringValue': 'x'}})
+    publisher.close()
+    sizes = [len(batch['PublishBatchRequestEntries']) for batch in client.batches]
+    assert sum(sizes) == 5 and max(sizes) == 2
+    for batch in client.batches:
+        entries = batch['PublishBatchRequestEntries']
+        assert [entry['Id'] for entry in entries] == [str(index) for index in range(len(entries))]
+        assert sum(len(entry['Message']) for entry in entries) <= BatchPublisher.MAX_REQUEST_BYTES
+
+
+def test_fifo_metadata_and_empty_events():
+    client = FakeSNS()
+    publisher = BatchPublisher(client=client, linger=0)
+    publisher.publish(arn=None, data={'id': 1})
+    publisher.publish(arn=ARN, data={})
+    publisher.publish(arn=ARN, data={'id': 1}, fifo_group_id='g', fifo_duplication_id='d')
+    publisher.flush()
+    entry = client.batches[0]['PublishBatchRequestEntries'][0]
+    assert (entry['MessageGroupId'], entry['MessageDeduplicationId']) == ('g', 'd')
+    assert len(client.batches) == 1
+    publisher.close()
+
+
+def test_failed_entries_and_errors_reach_callback():
+    failures = []
+    client = FakeSNS(fail_ids={'1'})
+    publisher = BatchPublisher(client=client, linger=0.5, on_failure=lambda event, error: failures.append((event['data'], error)))
+    publisher.publish(arn=ARN, data={'id': 0})
+    publisher.publish(arn=ARN, data={'id': 1})
+    publisher.flush()
+    assert failures == [({'id': 1}, {'Id': '1', 'Code': 'Throttled'})]
+    client.error = RuntimeError('unreachable')
+    publisher.publish(arn=ARN, data={'id': 2})
+    publisher.close()
+    assert failures[-1][0] == {'id': 2} and isinstance(failures[-1][1], RuntimeError)
+
+
+def test_full_queue_reports_dropped_event():
+    failures = []
+    client = FakeSNS()
+    client.gate.clear()
+    publisher = BatchPublisher(client=client, linger=0, batch_size=1, queue_size=1, timeout=0.01,
+                               on_failure=lambda event, error: failures.append(event['data']))
+    for index in range(4):
+        publisher.publish(arn=ARN, data={'id': index})
+    assert failures
+    client.gate.set()
+    publisher.close()
+    assert len(client.batches) + len(failures) == 4
+
+
+def test_publisher_restarts_after_close():
+    client = FakeSNS()
+    publisher = BatchPublisher(client=client, linger=0)
+    publisher.publish(arn=ARN, data={'id': 1})
+    publisher.close()
+    publisher.publish(arn=ARN, data={'id': 2})
+    publisher.close()
+    assert len(client.batches) == 2
+
+
+def test_adapter_publish_mode_wires_batch_publisher():
+    client = FakeSNS()
+    adapter = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', sns_arn=ARN,
+                         publish_mode='batch', sns_client=client, publish_linger=0)
+    assert adapter.publisher is adapter.batch_publisher
+    adapter.publish({'id': 7})
+    adapter.flush_publishes()
+    assert client.batches[0]['PublishBatchRequestEntries'][0]['Message'] == '{"id": 7}'
+    adapter.close()
+    assert adapter.batch_publisher.worker.thread is None
+
+
+def test_validations():
+    assert configured_publisher() is None
+    with pytest.raises(ValueError):
+        configured_publisher(publish_mode='carrier-pigeon')
+    with pytest.raises(ValueError):
+        BatchPublisher(batch_size=11)
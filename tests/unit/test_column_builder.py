@@ -0,0 +1,57 @@
+import sys
+from unittest import mock
+
+import pytest
+
+from daplug_sql.column_builder import ColumnBuilder
+from daplug_sql.exception import SQLAdapterException
+
+
+def test_list_output_transposes_rows():
+    builder = ColumnBuilder()
+    builder.describe((('id', 23), ('score', 701)))
+    builder.extend([(1, 0.5), (2, 1.5)])
+    builder.extend([])
+    builder.extend([(3, 2.5)])
+    assert builder.build() == {'id': [1, 2, 3], 'score': [0.5, 1.5, 2.5]}
+
+
+def test_empty_result_keeps_column_names():
+    builder = ColumnBuilder()
+    builder.describe((('id',), ('score',)))
+    assert builder.build() == {'id': [], 'score': []}
+
+
+def test_numpy_output_converts_each_column(monkeypatch):
+    numpy = mock.MagicMock()
+    numpy.asarray.side_effect = lambda values: ('array', tuple(values))
+    monkeypatch.setitem(sys.modules, 'numpy', numpy)
+    builder = ColumnBuilder('numpy')
+    builder.describe((('id',),))
+    builder.extend([(1,), (2,)])
+    assert builder.build() == {'id': ('array', (1, 2))}
+
+
+def test_arrow_output_builds_table(monkeypatch):
+    pyarrow = mock.MagicMock()
+    monkeypatch.setitem(sys.modules, 'pyarrow', pyarrow)
+    builder = ColumnBuilder('arrow')
+    builder.describe((('id',), ('score',)))
+    builder.extend([(1, 0.5)])
+    assert builder.build() is pyarrow.Table.from_arrays.return_value
+    assert pyarrow.Table.from_arrays.call_args.kwargs['names'] == ['id', 'score']
+
+
+def test_missing_optional_dependency_raises(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    builder = ColumnBuilder('arrow')
+    builder.describe((('id',),))
+    with pytest.raises(SQLAdapterException, match='pip install daplug-sql\\[arrow\\]'):
+        builder.build()
+
+
+def test_validations():
+    with pytest.raises(ValueError):
+        ColumnBuilder('pandas')
+    with pytest.raises(ValueError):
+        ColumnBuilder().describe((('id',), ('id',)))
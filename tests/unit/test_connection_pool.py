@@ -0,0 +1,105 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from daplug_sql.connection_pool import ConnectionPool, close_connector
+from daplug_sql.exception import SQLAdapterException
+
+
+def build_pool(**kwargs):
+    created = []
+
+    def factory():
+        connector = mock.MagicMock()
+        connector.connection = mock.MagicMock(closed=0, autocommit=True)
+        created.append(connector)
+        return connector
+
+    return ConnectionPool(factory, **kwargs), created
+
+
+def test_checkout_creates_up_to_max_size_then_times_out():
+    pool, created = build_pool(max_size=2, timeout=0.01)
+    first = pool.checkout()
+    second = pool.checkout()
+    assert first is not second
+    with pytest.raises(SQLAdapterException):
+        pool.checkout()
+    assert len(created) == 2
+
+
+def test_checkin_returns_connector_for_reuse():
+    pool, created = build_pool(max_size=1)
+    connector = pool.checkout()
+    pool.checkin(connector)
+    assert pool.checkout() is connector
+    assert len(created) == 1
+    connector.connection.close.assert_not_called()
+
+
+def test_waiting_checkout_receives_checked_in_connector():
+    pool, _ = build_pool(max_size=1, timeout=2)
+    connector = pool.checkout()
+    received = []
+    waiter = threading.Thread(target=lambda: received.append(pool.checkout()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.checkin(connector)
+    waiter.join(2)
+    assert received == [connector]
+
+
+def test_checkin_discards_closed_connections_and_rolls_back_transactions():
+    pool, _ = build_pool(max_size=1)
+    connector = pool.checkout()
+    connector.connection.closed = 1
+    pool.checkin(connector)
+    assert pool.size == 0
+    connector = pool.checkout()
+    connection = connector.connection
+    connection.autocommit = False
+    pool.checkin(connector)
+    connection.rollback.assert_called_once()
+    assert pool.idle[0][0] is connector
+
+
+def test_idle_connectors_are_reaped_down_to_min_size():
+    pool, _ = build_pool(min_size=1, max_size=3, idle_timeout=0)
+    connectors = [pool.checkout() for _ in range(3)]
+    for connector in connectors:
+        pool.checkin(connector)
+    time.sleep(0.01)
+    kept = pool.checkout()
+    assert pool.size == 1
+    assert kept is connectors[-1]
+    closed = [connector for connector in connectors if connector.connection is None]
+    assert len(closed) == 2
+
+
+def test_factory_failure_releases_slot():
+    pool = ConnectionPool(mock.MagicMock(side_effect=RuntimeError('boom')), max_size=1)
+    with pytest.raises(RuntimeError):
+        pool.checkout()
+    assert pool.size == 0
+
+
+def test_close_closes_idle_and_rejects_checkout():
+    pool, _ = build_pool()
+    connector = pool.checkout()
+    connection = connector.connection
+    pool.checkin(connector)
+    pool.close()
+    connection.close.assert_called_once()
+    with pytest.raises(SQLAdapterException):
+        pool.checkout()
+
+
+def test_close_connector_and_validation():
+    connector = mock.MagicMock()
+    connector.connection.close.side_effect = RuntimeError('already closed')
+    close_connector(connector)
+    assert connector.connection is None
+    with pytest.raises(ValueError):
+        ConnectionPool(mock.MagicMock(), min_size=3, max_size=2)
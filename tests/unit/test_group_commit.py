@@ -0,0 +1,132 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.exception import SQLAdapterException
+
+
+@pytest.fixture
+def writer_cursor(monkeypatch):
+    cursor = mock.MagicMock()
+    connection = mock.MagicMock(autocommit=True)
+
+    def connect(self):
+        self.connection, self.cursor = connection, cursor
+
+    monkeypatch.setattr(SQLAdapter, 'connect', connect)
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', mock.MagicMock())
+    return cursor
+
+
+def build_adapter(**overrides):
+    options = {'group_commit': True, 'thread_safe': True, 'group_commit_window': 1.0, 'group_commit_size': 4, **overrides}
+    return SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', **options)
+
+
+def statements(cursor):
+    return [call.args[0].split(' ')[0] for call in cursor.execute.call_args_list]
+
+
+def concurrently(adapter, identifiers):
+    outcomes = {}
+
+    def write(identifier):
+        try:
+            outcomes[identifier] = adapter.delete(identifier, table='items', identifier='id', commit=True)
+        except SQLAdapterException as error:
+            outcomes[identifier] = error
+
+    threads = [threading.Thread(target=write, args=(identifier,)) for identifier in identifiers]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_concurrent_writes_share_one_commit(writer_cursor):
+    adapter = build_adapter()
+    outcomes = concurrently(adapter, [1, 2, 3, 4])
+    assert outcomes == {1: None, 2: None, 3: None, 4: None}
+    assert statements(writer_cursor) == ['BEGIN', 'DELETE', 'DELETE', 'DELETE', 'DELETE', 'COMMIT']
+    adapter.close()
+    assert adapter.group_committer.worker.thread is None
+
+
+def test_failed_write_is_reported_to_its_caller_and_the_rest_retry(writer_cursor):
+    def execute(query, params=None):
+        if params == (3,):
+            raise RuntimeError('constraint violated')
+
+    writer_cursor.execute.side_effect = execute
+    adapter = build_adapter()
+    outcomes = concurrently(adapter, [1, 2, 3, 4])
+    assert isinstance(outcomes[3], SQLAdapterException)
+    assert [outcomes[identifier] for identifier in (1, 2, 4)] == [None, None, None]
+    executed = statements(writer_cursor)
+    assert executed.count('ROLLBACK') == 1
+    assert executed[-5:] == ['BEGIN', 'DELETE', 'DELETE', 'DELETE', 'COMMIT']
+    adapter.close()
+
+
+def test_commit_failure_fails_the_whole_group(writer_cursor):
+    def execute(query, params=None):
+        if query == 'COMMIT':
+            raise RuntimeError('fsync failed')
+
+    writer_cursor.execute.side_effect = execute
+    adapter = build_adapter(group_commit_size=2)
+    outcomes = concurrently(adapter, [1, 2])
+    assert all(isinstance(outcome, SQLAdapterException) for outcome in outcomes.values())
+    adapter.close()
+
+
+def test_explicit_transactions_bypass_the_committer(writer_cursor):
+    adapter = build_adapter()
+    adapter.connection = mock.MagicMock(autocommit=True)
+    adapter.cursor = mock.MagicMock()
+    with adapter.transaction():
+        adapter.delete(1, table='items', identifier='id')
+    assert adapter.group_committer.worker.thread is None
+    writer_cursor.execute.assert_not_called()
+
+
+def test_other_threads_keep_group_committing_during_a_transaction(writer_cursor):
+    adapter = build_adapter(group_commit_size=1)
+    adapter.connection = mock.MagicMock(autocommit=True)
+    adapter.cursor = mock.MagicMock()
+    with adapter.transaction():
+        outcomes = concurrently(adapter, [7])
+    assert outcomes == {7: None}
+    assert statements(writer_cursor) == ['BEGIN', 'DELETE', 'COMMIT']
+    adapter.close()
+
+
+def test_grouped_events_go_through_the_parent_batch_publisher(monkeypatch):
+    def connect(self):
+        self.connection, self.cursor = mock.MagicMock(autocommit=True), mock.MagicMock()
+
+    monkeypatch.setattr(SQLAdapter, 'connect', connect)
+    client = mock.MagicMock()
+    client.publish_batch.return_value = {'Failed': []}
+    adapter = build_adapter(group_commit_size=1, sns_arn='arn:aws:sns:us-east-1:000000000000:events',
+                            publish_mode='batch', sns_client=client, publish_linger=0)
+    adapter.delete(5, table='items', identifier='id')
+    adapter.flush_publishes()
+    entries = client.publish_batch.call_args.kwargs['PublishBatchRequestEntries']
+    assert entries[0]['Message'] == '{"id": 5}'
+    writer = adapter.group_committer.writer
+    assert writer.publisher is adapter.batch_publisher and writer.batch_publisher is None
+    adapter.close()
+    assert adapter.batch_publisher.worker.thread is None
+
+
+def test_validations():
+    with pytest.raises(ValueError):
+        build_adapter(autocommit=False)
+    with pytest.raises(ValueError):
+        build_adapter(thread_safe=False)
+    with pytest.raises(ValueError):
+        build_adapter(group_commit_size=0)
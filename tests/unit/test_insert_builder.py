@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from psycopg2.extras import Json
+
+from daplug_sql.insert_builder import InsertBuilder
+
+
+def build_kwargs(**overrides):
+    kwargs = {
+        'rows': [
+            {'entity_key': 'a', 'payload': {'name': 'Ada'}},
+            {'entity_key': 'b', 'payload': {'name': 'Bob'}},
+        ],
+        'table': 'documents',
+        'identifier': 'entity_key',
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_postgres_multi_row_insert_skips_conflicts():
+    query, params = InsertBuilder('postgres', **build_kwargs()).build()
+    assert query == (
+        'INSERT INTO "documents" ("entity_key", "payload") '
+        'VALUES (%s, %s), (%s, %s) '
+        'ON CONFLICT ("entity_key") DO NOTHING RETURNING "entity_key"'
+    )
+    assert params[0] == 'a'
+    assert isinstance(params[1], Json)
+    assert params[2] == 'b'
+
+
+def test_mysql_multi_row_insert_and_existing_check():
+    builder = InsertBuilder('mysql', **build_kwargs())
+    query, params = builder.build()
+    assert query == 'INSERT INTO `documents` (`entity_key`, `payload`) VALUES (%s, %s), (%s, %s)'
+    assert params[1] == json.dumps({'name': 'Ada'})
+    query, params = builder.build_existing()
+    assert query == 'SELECT `entity_key` FROM `documents` WHERE `entity_key` IN (%s, %s)'
+    assert params == ('a', 'b')
+
+
+def test_build_validations():
+    with pytest.raises(ValueError):
+        InsertBuilder('postgres', **build_kwargs(rows=[])).build()
+    with pytest.raises(KeyError):
+        InsertBuilder('postgres', **build_kwargs(rows=[{'payload': {}}])).build()
+    mixed = [{'entity_key': 'a', 'payload': {}}, {'entity_key': 'b'}]
+    with pytest.raises(ValueError):
+        InsertBuilder('postgres', **build_kwargs(rows=mixed)).build()
+    with pytest.raises(ValueError):
+        InsertBuilder('postgres', **build_kwargs(table='bad table')).build()
@@ -0,0 +1,188 @@
+import threading
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.exception import SQLAdapterException
+from daplug_sql.outbox import OutboxRelay, OutboxWriter, outbox_table_statement
+
+ARN = 'arn:aws:sns:us-east-1:000000000000:events'
+
+
+def build_adapter(**overrides):
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', sns_arn=ARN,
+                      publish_mode='outbox', **overrides)
+    inst.connection = mock.MagicMock(autocommit=inst.autocommit)
+    inst.cursor = mock.MagicMock()
+    inst.cursor.fetchone.return_value = None
+    return inst
+
+
+@pytest.fixture
+def relay_cursor(monkeypatch):
+    cursor = mock.MagicMock()
+    connection = mock.MagicMock(autocommit=True)
+    connects = []
+
+    def connect(self):
+        connects.append(self)
+        self.connection, self.cursor = connection, cursor
+
+    monkeypatch.setattr(SQLAdapter, 'connect', connect)
+    cursor.connects = connects
+    return cursor
+
+
+def statements(cursor):
+    return [call.args[0] for call in cursor.execute.call_args_list]
+
+
+def test_outbox_table_statement_per_engine():
+    postgres = outbox_table_statement('postgres')
+    assert postgres.startswith('CREATE TABLE IF NOT EXISTS "daplug_outbox" ("id" BIGSERIAL PRIMARY KEY')
+    assert '"message" TEXT NOT NULL' in postgres
+    mysql = outbox_table_statement('mysql', 'events_outbox')
+    assert '`id` BIGINT AUTO_INCREMENT PRIMARY KEY' in mysql and '`events_outbox`' in mysql
+
+
+def test_write_and_event_share_one_transaction():
+    adapter = build_adapter()
+    adapter.insert(data={'id': 1, 'name': 'a'}, table='items', identifier='id', fifo_group_id='g')
+    executed = statements(adapter.cursor)
+    assert executed[0] == 'BEGIN'
+    assert executed[-2].startswith('INSERT INTO "daplug_outbox" ("topic_arn", "endpoint", "message"')
+    assert executed[-1] == 'COMMIT'
+    params = adapter.cursor.execute.call_args_list[-2].args[1]
+    assert params == (ARN, None, '{"id": 1, "name": "a"}', '{}', 'g', None)
+    adapter.connection.commit.assert_not_called()
+
+
+def test_payloads_with_datetimes_and_decimals_are_written():
+    adapter = build_adapter()
+    created = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+    adapter.insert(data={'id': 1, 'price': Decimal('9.90'), 'created': created}, table='items', identifier='id')
+    executed = statements(adapter.cursor)
+    assert executed[-1] == 'COMMIT'
+    message = adapter.cursor.execute.call_args_list[-2].args[1][2]
+    assert message == '{"id": 1, "price": 9.90, "created": "2024-05-01 12:30:00+00:00"}'
+
+
+def test_failed_write_rolls_back_without_event():
+    adapter = build_adapter()
+
+    def execute(query, params=None):
+        if query.startswith('DELETE'):
+            raise RuntimeError('boom')
+
+    adapter.cursor.execute.side_effect = execute
+    with pytest.raises(SQLAdapterException):
+        adapter.delete(1, table='items', identifier='id')
+    executed = statements(adapter.cursor)
+    assert executed[0] == 'BEGIN' and executed[-1] == 'ROLLBACK'
+    assert not any('daplug_outbox' in query for query in executed)
+
+
+def test_manual_transactions_commit_once_when_requested():
+    adapter = build_adapter(autocommit=False)
+    adapter.delete(1, table='items', identifier='id', commit=True)
+    assert 'BEGIN' not in statements(adapter.cursor)
+    adapter.connection.commit.assert_called_once()
+
+
+class FakeSNS:
+    def __init__(self, fail_ids=()):
+        self.batches = []
+        self.fail_ids = set(fail_ids)
+
+    def publish_batch(self, **kwargs):
+        self.batches.append(kwargs)
+        entries = kwargs['PublishBatchRequestEntries']
+        return {'Failed': [{'Id': entry['Id'], 'Code': 'Throttled'} for entry in entries if entry['Id'] in self.fail_ids]}
+
+
+def outbox_rows(count):
+    return [{
+        'id': index, 'topic_arn': ARN, 'endpoint': None, 'message': f'{{"id": {index}}}',
+        'attributes': '{"event": {"DataType": "String", "StringValue": "created"}}',
+        'fifo_group_id': None, 'fifo_duplication_id': None,
+    } for index in range(1, count + 1)]
+
+
+def test_relay_sends_in_id_order_and_deletes_delivered_rows(relay_cursor):
+    adapter = build_adapter()
+    relay_cursor.fetchall.return_value = outbox_rows(12)
+    client = FakeSNS(fail_ids={'1'})
+    failures = []
+    relay = OutboxRelay(adapter, sns_client=client, on_failure=lambda event, error: failures.append(event['outbox_id']))
+    assert relay.relay() == 10
+    executed = statements(relay_cursor)
+    assert executed[0] == 'BEGIN'
+    assert executed[1] == 'SELECT * FROM "daplug_outbox" ORDER BY "id" LIMIT %s FOR UPDATE SKIP LOCKED'
+    assert executed[2] == 'DELETE FROM "daplug_outbox" WHERE "id" = ANY(%s)'
+    assert executed[3] == 'COMMIT'
+    assert failures == [2, 12]
+    assert relay_cursor.execute.call_args_list[2].args[1] == ([1] + list(range(3, 12)),)
+    assert [len(batch['PublishBatchRequestEntries']) for batch in client.batches] == [10, 2]
+    first = client.batches[0]['PublishBatchRequestEntries'][0]
+    assert first['Message'] == '{"id": 1}'
+    assert first['MessageAttributes'] == {'event': {'DataType': 'String', 'StringValue': 'created'}}
+    adapter.cursor.execute.assert_not_called()
+
+
+def test_relay_uses_its_own_connection_from_any_thread(relay_cursor):
+    adapter = build_adapter(thread_safe=True)
+    relay_cursor.fetchall.return_value = outbox_rows(1)
+    relay = OutboxRelay(adapter, sns_client=FakeSNS())
+    relayed = []
+    worker = threading.Thread(target=lambda: relayed.extend([relay.relay(), relay.relay()]))
+    worker.start()
+    worker.join()
+    assert relayed == [1, 1]
+    assert len(relay_cursor.connects) == 1
+    reader = relay_cursor.connects[0]
+    assert reader is not adapter and reader.thread_safe is False and not isinstance(reader.publisher, OutboxWriter)
+    relay.close()
+    assert relay.reader is None
+
+
+def test_relay_rolls_back_on_errors_and_run_stops(relay_cursor):
+    adapter = build_adapter(engine='mysql')
+    relay_cursor.fetchall.side_effect = RuntimeError('lost connection')
+    relay = OutboxRelay(adapter, sns_client=FakeSNS(), interval=0)
+    with pytest.raises(SQLAdapterException):
+        relay.relay()
+    assert statements(relay_cursor)[0] == 'START TRANSACTION'
+    assert statements(relay_cursor)[-1] == 'ROLLBACK'
+    relay_cursor.fetchall.side_effect = None
+    relay_cursor.fetchall.return_value = outbox_rows(1)
+    with mock.patch.object(OutboxRelay, 'relay', side_effect=lambda: relay.stop() or 1) as relayed:
+        relay.run()
+    relayed.assert_called_once()
+    assert relay.reader is None
+
+
+def test_relay_reconnects_after_a_failed_rollback(relay_cursor):
+    adapter = build_adapter()
+
+    def execute(query, params=None):
+        if query != 'BEGIN':
+            raise RuntimeError('server closed the connection')
+
+    relay_cursor.execute.side_effect = execute
+    relay = OutboxRelay(adapter, sns_client=FakeSNS())
+    with pytest.raises(SQLAdapterException):
+        relay.relay()
+    assert relay.reader is None
+    relay_cursor.execute.side_effect = None
+    relay_cursor.fetchall.return_value = []
+    assert relay.relay() == 0
+    assert len(relay_cursor.connects) == 2
+
+
+def test_async_adapter_rejects_outbox_mode():
+    from daplug_sql.async_adapter import AsyncSQLAdapter
+    with pytest.raises(ValueError):
+        AsyncSQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', publish_mode='outbox')
@@ -0,0 +1,38 @@
+import pytest
+
+from daplug_sql.exception import SQLAdapterException
+from daplug_sql.paginator import Paginator
+
+
+def test_first_page_has_no_keyset_condition():
+    query, params = Paginator('postgres', table='items', identifier='id', page_size=2).build()
+    assert query == 'SELECT * FROM "items" ORDER BY "id" LIMIT %s'
+    assert params == (3,)
+
+
+def test_next_page_uses_keyset_and_where_clause():
+    token = Paginator.encode(10)
+    paginator = Paginator('mysql', table='items', identifier='id', page_size=5, after=token,
+                          where='status = %s', params=('open',))
+    query, params = paginator.build()
+    assert query == 'SELECT * FROM `items` WHERE (status = %s) AND `id` > %s ORDER BY `id` LIMIT %s'
+    assert params == ('open', 10, 6)
+
+
+def test_page_trims_lookahead_row_and_emits_token():
+    paginator = Paginator('postgres', table='items', identifier='id', page_size=2)
+    page = paginator.page([{'id': 1}, {'id': 2}, {'id': 3}])
+    assert page['items'] == [{'id': 1}, {'id': 2}]
+    assert Paginator.decode(page['next']) == 2
+    assert paginator.page([{'id': 1}]) == {'items': [{'id': 1}], 'next': None}
+
+
+def test_validations():
+    with pytest.raises(ValueError):
+        Paginator('postgres', table='items', identifier='id', page_size=0)
+    with pytest.raises(SQLAdapterException):
+        Paginator('postgres', table='items', identifier='id', where='status = 1')
+    with pytest.raises(SQLAdapterException):
+        Paginator.decode('not-a-token')
+    with pytest.raises(ValueError):
+        Paginator('postgres', table='bad table', identifier='id').build()
@@ -0,0 +1,177 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+import daplug_sql.parallel_scanner as ps
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.exception import SQLAdapterException
+from daplug_sql.parallel_scanner import ParallelScanner
+
+
+@pytest.fixture
+def adapter():
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    inst._select = mock.MagicMock()
+    return inst
+
+
+def test_numeric_keys_split_min_max_into_partitions(adapter):
+    adapter._select.return_value = [{'low': 1, 'high': 10}]
+    scanner = ParallelScanner(adapter, table='items', identifier='id', workers=2, partitions=3)
+    assert scanner.ranges() == [(1, 5), (5, 9), (9, None)]
+    adapter._select.return_value = [{'low': Decimal('0'), 'high': Decimal('1')}]
+    ranges = scanner.ranges()
+    assert len(ranges) == 3
+    assert ranges[0][0] == 0 and ranges[-1][1] is None
+    assert all(ranges[index][1] == ranges[index + 1][0] for index in range(2))
+    adapter._select.return_value = [{'low': None, 'high': None}]
+    assert scanner.ranges() == []
+
+
+def test_text_keys_use_sampled_boundaries(adapter):
+    samples = [{'sample': key} for key in 'bcdefghijklmnopqrs']
+    adapter._select.side_effect = [[{'low': 'a', 'high': 'z'}], [{'estimate': 30000}], samples]
+    scanner = ParallelScanner(adapter, table='items', identifier='sku', partitions=3)
+    assert scanner.ranges() == [('a', 'h'), ('h', 'n'), ('n', None)]
+    estimate, sample = adapter._select.call_args_list[1:]
+    assert estimate.kwargs['params'] == ('"items"',)
+    assert sample.kwargs['query'] == 'SELECT "sku" AS sample FROM "items" TABLESAMPLE SYSTEM (%s) ORDER BY "sku"'
+    assert sample.kwargs['params'] == (1.0,)
+    assert 'NTILE' not in sample.kwargs['query']
+
+
+def test_text_keys_on_small_or_unsampled_tables(adapter):
+    adapter.engine = 'mysql'
+    adapter._select.side_effect = [[{'low': 'a', 'high': 'c'}], [], []]
+    scanner = ParallelScanner(adapter, table='items', identifier='sku', partitions=4)
+    assert scanner.ranges() == [('a', None)]
+    sample = adapter._select.call_args
+    assert sample.kwargs['query'] == 'SELECT `sku` AS sample FROM `items` WHERE RAND() < %s ORDER BY `sku`'
+    assert sample.kwargs['params'] == (1.0,)
+
+
+def test_generated_sql_skips_read_only_guard_for_keyword_names():
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    inst.connection = mock.MagicMock()
+    inst.cursor = mock.MagicMock()
+    inst.cursor.fetchall.return_value = [{'low': 1, 'high': 4}]
+    scanner = ParallelScanner(inst, table='deleted_orders', identifier='update_seq', partitions=2)
+    assert scanner.ranges() == [(1, 3), (3, None)]
+    query = inst.cursor.execute.call_args.args[0]
+    assert query == 'SELECT MIN("update_seq") AS low, MAX("update_seq") AS high FROM "deleted_orders"'
+    with pytest.raises(SQLAdapterException):
+        inst.query(query=query, params=())
+
+
+def test_page_options_bound_each_range(adapter):
+    adapter._select.return_value = [{'low': 1, 'high': 4}]
+    options = ParallelScanner(adapter, table='items', identifier='id', partitions=2, chunk_size=50).page_options()
+    assert options[0]['where'] == '"id" >= %s AND "id" < %s'
+    assert options[0]['params'] == (1, 3)
+    assert options[1]['where'] == '"id" >= %s'
+    assert options[1]['params'] == (3,)
+    assert options[1]['page_size'] == 50
+
+
+def test_rows_streams_chunks_from_worker_threads(adapter, monkeypatch):
+    adapter._select.return_value = [{'low': 1, 'high': 4}]
+
+    def fake_scan(config, options, emit, snapshot=None):
+        lower = options['params'][0]
+        emit([{'id': lower}])
+        emit([{'id': lower + 1}])
+        return 2
+
+    monkeypatch.setattr(ps, 'scan_range', fake_scan)
+    rows = adapter.parallel_scan(table='items', identifier='id', workers=2, partitions=2)
+    assert sorted(row['id'] for row in rows) == [1, 2, 3, 4]
+
+
+def test_rows_surfaces_worker_failures(adapter, monkeypatch):
+    adapter._select.return_value = [{'low': 1, 'high': 4}]
+    monkeypatch.setattr(ps, 'scan_range', mock.MagicMock(side_effect=RuntimeError('boom')))
+    with pytest.raises(SQLAdapterException):
+        list(adapter.parallel_scan(table='items', identifier='id', workers=2))
+
+
+def test_callback_mode_returns_scanned_count(adapter, monkeypatch):
+    adapter._select.return_value = [{'low': 1, 'high': 4}]
+    monkeypatch.setattr(ps, 'scan_range', lambda config, options, callback, snapshot=None: 2)
+    assert adapter.parallel_scan(table='items', identifier='id', partitions=2, callback=print) == 4
+
+
+def test_process_executor_spawns_workers(adapter, monkeypatch):
+    adapter._select.return_value = [{'low': 1, 'high': 4}]
+    pool = mock.MagicMock()
+    pool.return_value.__enter__.return_value.submit.return_value.result.return_value = 2
+    monkeypatch.setattr(ps, 'ProcessPoolExecutor', pool)
+    assert adapter.parallel_scan(table='items', identifier='id', partitions=2, executor='process', callback=print) == 4
+    assert pool.call_args.kwargs['mp_context'].get_start_method() == 'spawn'
+
+
+def test_scan_range_pages_on_its_own_adapter(monkeypatch):
+    pages = [[{'id': 1}, {'id': 2}], [{'id': 3}]]
+    monkeypatch.setattr(SQLAdapter, 'connect', mock.MagicMock())
+    monkeypatch.setattr(SQLAdapter, 'close', mock.MagicMock())
+    monkeypatch.setattr(SQLAdapter, 'iter_pages', mock.MagicMock(return_value=iter(pages)))
+    received = []
+    config = {'endpoint': 'db.local', 'database': 'app', 'user': 'svc', 'password': 'pw', 'thread_safe': True,
+              'group_commit': True}
+    assert ps.scan_range(config, {'table': 'items', 'identifier': 'id'}, received.append) == 3
+    assert received == pages
+    SQLAdapter.close.assert_called_once()
+
+
+def test_snapshot_mode_shares_exported_snapshot_with_workers(adapter, monkeypatch):
+    cursor = mock.MagicMock()
+    connection = mock.MagicMock(autocommit=True)
+
+    def connect(self):
+        self.connection, self.cursor = connection, cursor
+
+    monkeypatch.setattr(SQLAdapter, 'connect', connect)
+    monkeypatch.setattr(SQLAdapter, 'close', mock.MagicMock())
+    monkeypatch.setattr(
+        SQLAdapter, '_select',
+        mock.MagicMock(side_effect=[[{'snapshot': '00000003-1'}], [{'low': 1, 'high': 4}]]),
+    )
+    scan = mock.MagicMock(return_value=2)
+    monkeypatch.setattr(ps, 'scan_range', scan)
+    scanned = adapter.parallel_scan(table='items', identifier='id', partitions=2, callback=print, snapshot=True)
+    assert scanned == 4
+    assert {call.args[3] for call in scan.call_args_list} == {'00000003-1'}
+    adapter._select.assert_not_called()
+    executed = [call.args[0] for call in cursor.execute.call_args_list]
+    assert executed == ['BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY', 'ROLLBACK']
+
+
+def test_scan_range_imports_snapshot_before_paging(monkeypatch):
+    cursor = mock.MagicMock()
+    connection = mock.MagicMock(autocommit=False)
+
+    def connect(self):
+        self.connection, self.cursor = connection, cursor
+
+    monkeypatch.setattr(SQLAdapter, 'connect', connect)
+    monkeypatch.setattr(SQLAdapter, 'close', mock.MagicMock())
+    monkeypatch.setattr(SQLAdapter, 'iter_pages', mock.MagicMock(return_value=iter([[{'id': 1}]])))
+    config = {'endpoint': 'db.local', 'database': 'app', 'user': 'svc', 'password': 'pw'}
+    assert ps.scan_range(config, {'table': 'items', 'identifier': 'id'}, print, 'snap-1') == 1
+    assert cursor.execute.call_args_list == [
+        mock.call('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY'),
+        mock.call('SET TRANSACTION SNAPSHOT %s', ('snap-1',)),
+    ]
+    assert connection.rollback.call_count == 2
+
+
+def test_validations(adapter):
+    with pytest.raises(ValueError):
+        ParallelScanner(adapter, table='items', identifier='id', workers=0)
+    with pytest.raises(ValueError):
+        ParallelScanner(adapter, table='items', identifier='id', executor='fiber')
+    with pytest.raises(ValueError):
+        ParallelScanner(adapter, table='items', identifier='id', executor='process')
+    mysql = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', engine='mysql')
+    with pytest.raises(ValueError):
+        ParallelScanner(mysql, table='items', identifier='id', snapshot=True)
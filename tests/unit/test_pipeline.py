@@ -0,0 +1,195 @@
+from unittest import mock
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.exception import SQLAdapterException
+from daplug_sql.pipeline import Pipeline
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def adapter(monkeypatch, events):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, db_data, **kwargs: events.append(db_data))
+    return build_adapter()
+
+
+def build_adapter(**overrides):
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', **overrides)
+    inst.connection = mock.MagicMock(autocommit=inst.autocommit)
+    inst.cursor = mock.MagicMock()
+    return inst
+
+
+def test_script_joins_statements_and_params():
+    queued = Pipeline('postgres')
+    queued.insert(table='items', data={'id': 1, 'name': 'a'})
+    queued.delete(2, table='orders', identifier='id')
+    queued.execute("UPDATE counters SET label = 'x%'")
+    query, params = queued.script()
+    assert query.split(';\n') == [
+        'INSERT INTO "items" ("id", "name") VALUES (%s, %s)',
+        'DELETE FROM "orders" WHERE "id" = %s',
+        "UPDATE counters SET label = 'x%%'",
+    ]
+    assert params == (1, 'a', 2)
+
+
+def test_script_without_params_leaves_percent_signs_alone():
+    queued = Pipeline('postgres')
+    queued.execute("DELETE FROM logs WHERE note LIKE 'a%';")
+    assert queued.script() == ("DELETE FROM logs WHERE note LIKE 'a%'", None)
+
+
+def test_postgres_script_counts_updates_and_upserts_in_the_same_execute():
+    queued = Pipeline('postgres')
+    queued.delete(1, table='carts', identifier='id')
+    queued.upsert(table='items', identifier='id', data={'id': 1, 'name': 'a'})
+    queued.update(table='orders', identifier='id', data={'id': 2, 'state': 'paid'})
+    query, params = queued.script()
+    statements = query.split(';\n')
+    assert len(statements) == 4 and queued.counted() == [1, 2]
+    assert statements[1].startswith('WITH daplug_written AS (INSERT INTO "items"')
+    assert statements[1].endswith("RETURNING *) SELECT set_config('daplug.pipeline_1', count(*)::text, true) FROM daplug_written")
+    assert statements[3] == (
+        "SELECT current_setting('daplug.pipeline_1', true) AS pipeline_1, "
+        "current_setting('daplug.pipeline_2', true) AS pipeline_2"
+    )
+    assert params == (1, 1, 'a', 'paid', 2)
+    assert queued.counts({'pipeline_1': '0', 'pipeline_2': '1'}) == [None, ([], 0), ([], 1)]
+
+
+def test_mysql_script_is_not_rewritten():
+    queued = Pipeline('mysql')
+    queued.update(table='items', identifier='id', data={'id': 1, 'name': 'a'})
+    query, _ = queued.script()
+    assert query.startswith('UPDATE `items`') and queued.counted() == []
+
+
+def test_resolve_prefers_returned_rows_over_payloads():
+    queued = Pipeline('postgres', 'psycopg')
+    queued.upsert(table='items', identifier='id', data={'id': 1, 'name': 'a'})
+    queued.delete(2, table='items', identifier='id', arn='arn:topic')
+    queued.execute('SELECT 1')
+    assert queued.resolve([([{'id': 1, 'name': 'stored'}], 1), ([], 0), ([{'one': 1}], 1)]) == [
+        {'id': 1, 'name': 'stored'}, None, [{'one': 1}],
+    ]
+    assert queued.events()[1] == ({'id': 2}, {'table': 'items', 'identifier': 'id', 'arn': 'arn:topic'})
+
+
+def test_writes_that_changed_no_rows_resolve_to_none_and_publish_nothing():
+    queued = Pipeline('postgres')
+    queued.update(table='items', identifier='id', data={'id': 404, 'name': 'gone'}, arn='arn:topic')
+    queued.upsert(table='items', identifier='id', data={'id': 1, 'version': 1}, guard_column='version', arn='arn:topic')
+    queued.insert(table='audit', data={'id': 9}, arn='arn:topic')
+    queued.execute('SELECT 1')
+    assert queued.resolve([([], 0), ([], 0), None, None]) == [None, None, {'id': 9}, None]
+    assert [db_data for db_data, _ in queued.events()] == [{'id': 9}]
+
+
+def test_pipeline_sends_one_statement_and_publishes_after(adapter, events):
+    with adapter.pipeline() as queued:
+        queued.insert(table='items', data={'id': 1, 'name': 'a'})
+        queued.delete(3, table='carts', identifier='id')
+        assert adapter.cursor.execute.call_count == 0
+    adapter.cursor.execute.assert_called_once()
+    query = adapter.cursor.execute.call_args.args[0]
+    assert query == 'INSERT INTO "items" ("id", "name") VALUES (%s, %s);\nDELETE FROM "carts" WHERE "id" = %s'
+    assert queued.results == [{'id': 1, 'name': 'a'}, None]
+    assert events == [{'id': 1, 'name': 'a'}, {'id': 3}]
+
+
+def test_postgres_pipeline_reads_every_write_count_in_one_round_trip(adapter, events):
+    adapter.cursor.fetchone.return_value = {'pipeline_0': '1', 'pipeline_1': '1', 'pipeline_2': '0'}
+    with adapter.pipeline() as queued:
+        queued.upsert(table='a', identifier='id', data={'id': 1, 'name': 'a'})
+        queued.upsert(table='b', identifier='id', data={'id': 2, 'name': 'b'}, guard_column='version')
+        queued.update(table='c', identifier='id', data={'id': 404, 'state': 'paid'})
+        queued.delete(3, table='carts', identifier='id')
+    adapter.cursor.execute.assert_called_once()
+    query = adapter.cursor.execute.call_args.args[0]
+    assert 'BEGIN' not in query and 'COMMIT' not in query
+    assert query.endswith('AS pipeline_2')
+    assert queued.results == [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}, None, None]
+    assert events == [{'id': 1, 'name': 'a'}, {'id': 2, 'name': 'b'}, {'id': 3}]
+
+
+def test_pipeline_rolls_back_and_skips_publishes_on_error(adapter, events):
+    adapter.cursor.execute.side_effect = [RuntimeError('deadlock'), None]
+    with pytest.raises(SQLAdapterException):
+        with adapter.pipeline() as queued:
+            queued.delete(1, table='items', identifier='id')
+    adapter.cursor.execute.assert_called_once()
+    assert events == []
+
+
+def test_mysql_pipeline_rolls_back_its_explicit_transaction(events):
+    inst = build_adapter(engine='mysql', port=3306)
+    inst.cursor.execute.side_effect = [RuntimeError('deadlock'), None]
+    with pytest.raises(SQLAdapterException):
+        with inst.pipeline() as queued:
+            queued.delete(1, table='items', identifier='id')
+    assert inst.cursor.execute.call_args.args == ('ROLLBACK',)
+    inst.connection.rollback.assert_not_called()
+
+
+def test_pipeline_is_discarded_when_the_block_raises(adapter):
+    with pytest.raises(RuntimeError):
+        with adapter.pipeline() as queued:
+            queued.delete(1, table='items', identifier='id')
+            raise RuntimeError('abort')
+    adapter.cursor.execute.assert_not_called()
+
+
+def test_pipeline_joins_an_open_transaction(adapter, events):
+    with adapter.transaction():
+        with adapter.pipeline() as queued:
+            queued.delete(1, table='items', identifier='id')
+        assert events == []
+    executed = [call.args[0] for call in adapter.cursor.execute.call_args_list]
+    assert executed == ['BEGIN', 'DELETE FROM "items" WHERE "id" = %s', 'COMMIT']
+    assert events == [{'id': 1}]
+
+
+def test_pipeline_without_autocommit_commits_on_request(monkeypatch):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, db_data, **kwargs: None)
+    inst = build_adapter(autocommit=False)
+    with inst.pipeline(commit=True) as queued:
+        queued.execute('DELETE FROM items')
+    inst.cursor.execute.assert_called_once_with('DELETE FROM items')
+    inst.connection.commit.assert_called_once()
+
+
+def test_mysql_pipeline_drains_every_result_set(monkeypatch):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, db_data, **kwargs: None)
+    inst = build_adapter(engine='mysql', port=3306)
+    inst.cursor.nextset.side_effect = [True, True, None]
+    with inst.pipeline() as queued:
+        queued.insert(table='items', data={'id': 1})
+    assert inst.cursor.execute.call_args.args[0].startswith('START TRANSACTION;\nINSERT INTO `items`')
+    assert inst.cursor.nextset.call_count == 3
+
+
+def test_mysql_pipeline_skips_writes_with_no_affected_rows(monkeypatch, events):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, db_data, **kwargs: events.append(db_data))
+    inst = build_adapter(engine='mysql', port=3306)
+    inst.cursor.nextset.side_effect = [True, True, True, True, None]
+    type(inst.cursor).rowcount = mock.PropertyMock(side_effect=[0, 0, 2, 1, 0])
+    with inst.pipeline() as queued:
+        queued.update(table='items', identifier='id', data={'id': 404, 'name': 'gone'})
+        queued.upsert(table='items', identifier='id', data={'id': 1, 'name': 'a'})
+        queued.execute('SELECT 1')
+    inst.cursor.execute.assert_called_once()
+    assert queued.results == [None, {'id': 1, 'name': 'a'}, None]
+    assert events == [{'id': 1, 'name': 'a'}]
+
+
+def test_empty_pipeline_is_a_no_op(adapter):
+    with adapter.pipeline() as queued:
+        pass
+    assert queued.results == []
+    adapter.cursor.execute.assert_not_called()
@@ -0,0 +1,181 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from daplug_sql.exception import SQLAdapterException
+from daplug_sql.projection_buffer import ProjectionBuffer
+
+
+@pytest.fixture
+def host():
+    adapter = mock.MagicMock()
+    adapter.BATCH_SIZE = 500
+    adapter.buffers = []
+    adapter.upsert_many.side_effect = lambda rows, **_: list(rows)
+    return adapter
+
+
+def test_flushes_when_max_rows_queued(host):
+    buffer = ProjectionBuffer(host, max_rows=2, flush_interval_ms=None)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    host.upsert_many.assert_not_called()
+    buffer.upsert(data={'id': 2}, table='items', identifier='id')
+    host.upsert_many.assert_called_once_with([{'id': 1}, {'id': 2}], table='items', identifier='id')
+
+
+def test_groups_rows_by_call_options(host):
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=None)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    buffer.upsert(data={'id': 2}, table='items', identifier='id', guard_column='ts')
+    buffer.upsert(data={'id': 3}, table='items', identifier='id')
+    written = buffer.flush()
+    assert host.upsert_many.call_count == 2
+    first, second = host.upsert_many.call_args_list
+    assert first.args[0] == [{'id': 1}, {'id': 3}]
+    assert second.kwargs['guard_column'] == 'ts'
+    assert len(written) == 3
+
+
+def test_timer_flushes_pending_rows(host):
+    flushed = threading.Event()
+    host.upsert_many.side_effect = lambda rows, **_: flushed.set() or list(rows)
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=10)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    assert flushed.wait(2)
+    buffer.close()
+
+
+def test_timer_reports_flush_errors(host):
+    failures = []
+    reported = threading.Event()
+    host.upsert_many.side_effect = RuntimeError('db down')
+
+    def on_error(error, rows):
+        failures.append((str(error), rows))
+        reported.set()
+
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=10, on_error=on_error)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    assert reported.wait(2)
+    buffer.stopped.set()
+    buffer.timer.join(2)
+    assert failures[0] == ('db down', [{'id': 1}])
+    assert buffer.pending and buffer.queued == 1
+
+
+def test_failed_flush_requeues_failed_and_unsent_batches(host):
+    calls = []
+
+    def upsert_many(rows, **options):
+        calls.append(list(rows))
+        if options.get('guard_column') and len(calls) == 2:
+            raise RuntimeError('deadlock')
+        return list(rows)
+
+    host.upsert_many.side_effect = upsert_many
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=None)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    buffer.upsert(data={'id': 2}, table='items', identifier='id', guard_column='ts')
+    buffer.upsert(data={'id': 3}, table='orders', identifier='id')
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    assert buffer.queued == 2
+    assert buffer.flush() == [{'id': 2}, {'id': 3}]
+    assert calls == [[{'id': 1}], [{'id': 2}], [{'id': 2}], [{'id': 3}]]
+
+
+def test_timer_requires_thread_safe_adapter(host):
+    host.thread_safe = False
+    with pytest.raises(ValueError):
+        ProjectionBuffer(host, flush_interval_ms=100)
+    assert ProjectionBuffer(host).timer is None
+
+
+def test_back_pressure_blocks_until_flush_completes(host):
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow_upsert(rows, **_):
+        started.set()
+        release.wait(2)
+        return list(rows)
+
+    host.upsert_many.side_effect = slow_upsert
+    buffer = ProjectionBuffer(host, max_rows=1, max_pending=1, flush_interval_ms=None)
+    worker = threading.Thread(target=buffer.upsert, kwargs={'data': {'id': 1}, 'table': 'items', 'identifier': 'id'})
+    worker.start()
+    assert started.wait(2)
+    blocked = threading.Thread(target=buffer.upsert, kwargs={'data': {'id': 2}, 'table': 'items', 'identifier': 'id'})
+    blocked.start()
+    blocked.join(0.05)
+    assert blocked.is_alive()
+    release.set()
+    worker.join(2)
+    blocked.join(2)
+    assert host.upsert_many.call_count == 2
+
+
+def test_full_buffer_without_timer_flushes_inline_and_raises(host):
+    host.thread_safe = False
+    host.upsert_many.side_effect = RuntimeError('db down')
+    buffer = ProjectionBuffer(host, max_rows=2, max_pending=4)
+    outcomes = []
+
+    def consume():
+        for index in range(6):
+            try:
+                buffer.upsert(data={'id': index}, table='items', identifier='id')
+                outcomes.append('queued')
+            except RuntimeError:
+                outcomes.append('failed')
+
+    worker = threading.Thread(target=consume)
+    worker.start()
+    worker.join(2)
+    assert not worker.is_alive()
+    assert outcomes == ['queued', 'failed', 'failed', 'failed', 'failed', 'failed']
+    assert buffer.queued == 4
+
+
+def test_full_buffer_with_timer_raises_after_pending_timeout(host):
+    host.upsert_many.side_effect = RuntimeError('db down')
+    buffer = ProjectionBuffer(host, max_rows=10, max_pending=10, flush_interval_ms=60000, pending_timeout=0.01)
+    for index in range(9):
+        buffer.upsert(data={'id': index}, table='items', identifier='id')
+    with pytest.raises(RuntimeError):
+        buffer.upsert(data={'id': 9}, table='items', identifier='id')
+    with pytest.raises(SQLAdapterException):
+        buffer.upsert(data={'id': 10}, table='items', identifier='id')
+    buffer.stopped.set()
+    buffer.timer.join(2)
+
+
+def test_failed_close_keeps_rows_and_can_be_retried(host):
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=None)
+    host.buffers.append(buffer)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    host.upsert_many.side_effect = RuntimeError('db down')
+    with pytest.raises(RuntimeError):
+        buffer.close()
+    assert host.buffers == [buffer] and buffer.queued == 1
+    host.upsert_many.side_effect = lambda rows, **_: list(rows)
+    assert buffer.close() == [{'id': 1}]
+    assert not host.buffers
+
+
+def test_close_flushes_and_rejects_new_rows(host):
+    buffer = ProjectionBuffer(host, max_rows=10, flush_interval_ms=None)
+    host.buffers.append(buffer)
+    buffer.upsert(data={'id': 1}, table='items', identifier='id')
+    assert buffer.close() == [{'id': 1}]
+    assert not host.buffers
+    with pytest.raises(SQLAdapterException):
+        buffer.upsert(data={'id': 2}, table='items', identifier='id')
+
+
+def test_validates_limits(host):
+    with pytest.raises(ValueError):
+        ProjectionBuffer(host, max_rows=0)
+    with pytest.raises(ValueError):
+        ProjectionBuffer(host, max_rows=10, max_pending=5)
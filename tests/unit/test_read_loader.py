@@ -0,0 +1,103 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.async_adapter import AsyncSQLAdapter
+from daplug_sql.read_loader import current_loader
+
+
+@pytest.fixture
+def publish_mock(monkeypatch):
+    mock_publish = mock.MagicMock()
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', mock_publish)
+    return mock_publish
+
+
+@pytest.fixture
+def adapter(publish_mock):
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    inst.connection = mock.MagicMock()
+    inst.cursor = mock.MagicMock()
+    return inst
+
+
+@pytest.fixture
+def async_adapter(publish_mock):
+    inst = AsyncSQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    inst.connector.execute = mock.AsyncMock()
+    return inst
+
+
+def test_sync_scope_batches_deferred_loads_and_memoizes(adapter):
+    adapter.cursor.fetchall.return_value = [{'id': 1}, {'id': 2}]
+    with adapter.loader() as loader:
+        first = loader.defer(1, table='items', identifier='id')
+        second = loader.defer(2, table='items', identifier='id')
+        missing = loader.defer(3, table='items', identifier='id')
+        assert first() == {'id': 1}
+        assert second() == {'id': 2}
+        assert missing() is None
+        assert adapter.get(1, table='items', identifier='id') == {'id': 1}
+    adapter.cursor.execute.assert_called_once_with('SELECT * FROM "items" WHERE "id" = ANY(%s)', ([1, 2, 3],))
+    assert current_loader(adapter) is None
+
+
+def test_sync_get_outside_scope_hits_database(adapter):
+    adapter.cursor.fetchone.return_value = {'id': 1}
+    with adapter.loader():
+        pass
+    adapter.get(1, table='items', identifier='id')
+    adapter.get(1, table='items', identifier='id')
+    assert adapter.cursor.execute.call_count == 2
+
+
+def test_sync_scope_is_bound_to_its_adapter(adapter):
+    other = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw')
+    with adapter.loader():
+        assert current_loader(adapter) is not None
+        assert current_loader(other) is None
+
+
+def test_mysql_upsert_refetch_bypasses_loader_memo(adapter):
+    adapter.engine = 'mysql'
+    adapter.cursor.rowcount = 1
+    adapter.cursor.fetchall.return_value = [{'id': 1, 'name': 'old'}]
+    adapter.cursor.fetchone.return_value = {'id': 1, 'name': 'new'}
+    with adapter.loader():
+        assert adapter.get(1, table='items', identifier='id') == {'id': 1, 'name': 'old'}
+        assert adapter.upsert(data={'id': 1, 'name': 'new'}, table='items', identifier='id') == {'id': 1, 'name': 'new'}
+
+
+def test_async_scope_coalesces_gets_within_a_tick(async_adapter):
+    async_adapter.connector.execute.return_value = ([{'id': 1}, {'id': 2}], 2)
+
+    async def resolve():
+        with async_adapter.loader():
+            rows = await asyncio.gather(*[
+                async_adapter.get(key, table='items', identifier='id') for key in [1, 2, 1, 3]
+            ])
+            again = await async_adapter.get(2, table='items', identifier='id')
+        return rows, again
+
+    rows, again = asyncio.run(resolve())
+    assert rows == [{'id': 1}, {'id': 2}, {'id': 1}, None]
+    assert again == {'id': 2}
+    async_adapter.connector.execute.assert_awaited_once_with('SELECT * FROM "items" WHERE "id" = ANY(%s)', ([1, 2, 3],))
+
+
+def test_async_scope_propagates_errors(async_adapter):
+    async_adapter.connector.execute.side_effect = RuntimeError('boom')
+
+    async def resolve():
+        with async_adapter.loader():
+            return await asyncio.gather(
+                async_adapter.get(1, table='items', identifier='id'),
+                async_adapter.get(2, table='items', identifier='id'),
+                return_exceptions=True,
+            )
+
+    results = asyncio.run(resolve())
+    assert all(isinstance(result, Exception) for result in results)
+    assert async_adapter.connector.execute.await_count == 1
@@ -0,0 +1,37 @@
+import pytest
+
+from daplug_sql.row_formatter import RowFormatter, RowSet, record_type
+
+DESCRIPTION = (('id', 23), ('name', 25))
+
+
+def test_dict_format_passes_rows_through():
+    formatter = RowFormatter()
+    assert not formatter.tuples
+    assert formatter.rows(DESCRIPTION, ({'id': 1},)) == [{'id': 1}]
+
+
+def test_tuple_format_shares_one_column_index():
+    rows = RowFormatter('tuple').rows(DESCRIPTION, [(1, 'a'), (2, 'b')])
+    assert isinstance(rows, RowSet)
+    assert rows == [(1, 'a'), (2, 'b')]
+    assert rows.columns == {'id': 0, 'name': 1}
+    assert RowFormatter('tuple').row(DESCRIPTION, (1, 'a')) == (1, 'a')
+
+
+def test_record_format_builds_slotted_records():
+    formatter = RowFormatter('record')
+    rows = formatter.rows(DESCRIPTION, [(1, 'a'), (2, 'b')])
+    assert rows[1].name == 'b'
+    assert rows[0]._asdict() == {'id': 1, 'name': 'a'}
+    assert type(rows[0]).__slots__ == ()
+    assert type(formatter.row(DESCRIPTION, (3, 'c'))) is type(rows[0])
+
+
+def test_record_type_renames_invalid_fields():
+    assert record_type(('id', 'count(*)', 'id'))._fields == ('id', '_1', '_2')
+
+
+def test_unknown_format_raises():
+    with pytest.raises(ValueError):
+        RowFormatter('frozenset')
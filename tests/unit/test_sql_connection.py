@@ -3,6 +3,7 @@ from unittest import mock
 import pytest
 
 import daplug_sql.sql_connection as sc
+from daplug_sql.exception import SQLAdapterException
 
 
 @pytest.fixture(autouse=True)
@@ -26,92 +27,135 @@ def build_adapter(**overrides):
     return adapter
 
 
-def test_sql_connection_caches_connector(monkeypatch):
+class StubConnector:
     created = []
 
-    class StubConnector:
-        def __init__(self, adapter):
-            self.adapter = adapter
-            self.connection = mock.MagicMock(closed=0)
-            created.append(self)
+    def __init__(self, adapter):
+        self.adapter = adapter
+        self.connection = mock.MagicMock(closed=0)
+        StubConnector.created.append(self)
 
-        def connect(self):
-            return self.connection
+    def connect(self):
+        return self.connection
 
-    monkeypatch.setattr(sc, 'SQLConnector', StubConnector)
-
-    @sc.sql_connection
-    def connect_method(adapter, connector):
-        return connector
-
-    adapter = build_adapter()
-    first = connect_method(adapter)
-    second = connect_method(adapter)
-    assert first is second
-    assert len(created) == 1
 
+@pytest.fixture
+def stub_connector(monkeypatch):
+    StubConnector.created = []
+    monkeypatch.setattr(sc, 'SQLConnector', StubConnector)
+    return StubConnector
 
-def test_sql_connection_recreates_when_closed(monkeypatch):
-    created = []
 
-    class StubConnector:
-        def __init__(self, adapter):
-            self.connection = mock.MagicMock(closed=0)
-            created.append(self)
+@sc.sql_connection
+def connect_method(adapter, connector):
+    adapter.connector = connector
+    return connector
 
-        def connect(self):
-            return self.connection
 
-    monkeypatch.setattr(sc, 'SQLConnector', StubConnector)
+@sc.sql_connection_cleanup
+def close_method(adapter):
+    return 'done'
 
-    @sc.sql_connection
-    def connect_method(adapter, connector):
-        return connector
 
-    adapter = build_adapter()
+def test_sql_connection_reuses_checked_in_connector(stub_connector):
+    adapter = build_adapter(connector=None)
+    first = connect_method(adapter)
+    assert connect_method(adapter) is first
+    close_method(adapter)
+    assert adapter.connector is None
+    other = build_adapter(connector=None)
+    assert connect_method(other) is first
+    assert len(stub_connector.created) == 1
+
+
+def test_sql_connection_gives_concurrent_adapters_their_own_connectors(stub_connector):
+    first_adapter = build_adapter(connector=None)
+    second_adapter = build_adapter(connector=None)
+    first = connect_method(first_adapter)
+    second = connect_method(second_adapter)
+    assert first is not second
+    close_method(first_adapter)
+    first.connection.close.assert_not_called()
+    assert second.connection.close.call_count == 0
+
+
+def test_sql_connection_recreates_when_closed(stub_connector):
+    adapter = build_adapter(connector=None)
     connector = connect_method(adapter)
     connector.connection.closed = 1
     new_connector = connect_method(adapter)
     assert connector is not new_connector
-    assert len(created) == 2
+    assert len(stub_connector.created) == 2
 
 
-def test_sql_connection_cleanup_closes_and_removes(monkeypatch):
-    closed = []
+def test_sql_connection_discards_connector_when_connect_fails(stub_connector):
+    @sc.sql_connection
+    def failing_connect(adapter, connector):
+        raise RuntimeError('refused')
 
-    class StubConnector:
-        def __init__(self, adapter):
-            self.connection = mock.MagicMock()
-            self.connection.close.side_effect = lambda: closed.append(True)
+    adapter = build_adapter(connector=None)
+    with pytest.raises(RuntimeError):
+        failing_connect(adapter)
+    pool = sc._connection_cache[sc._build_cache_key(adapter)]
+    assert pool.size == 0
+    assert stub_connector.created[0].connection is None
 
-        def connect(self):
-            return self.connection
 
-    monkeypatch.setattr(sc, 'SQLConnector', StubConnector)
+def test_sql_connection_uses_pool_options(stub_connector):
+    adapter = build_adapter(connector=None, pool_options={'max_size': 1, 'timeout': 0})
+    connect_method(adapter)
+    with pytest.raises(SQLAdapterException):
+        connect_method(build_adapter(connector=None, pool_options={'max_size': 1, 'timeout': 0}))
 
-    @sc.sql_connection
-    def connect_method(adapter, connector):
-        return connector
 
-    @sc.sql_connection_cleanup
-    def close_method(adapter):
-        return 'done'
+def test_new_connectors_are_built_from_the_checking_out_adapter(stub_connector):
+    first = build_adapter(connector=None, password='old')
+    connect_method(first)
+    rotated = build_adapter(connector=None, password='new')
+    connector = connect_method(rotated)
+    assert connector.adapter is rotated
+    assert len(sc._connection_cache) == 1
 
-    adapter = build_adapter()
-    connect_method(adapter)
-    result = close_method(adapter)
-    assert result == 'done'
+
+def test_pool_does_not_keep_its_first_adapter_alive(stub_connector):
+    import gc
+    import weakref
+
+    adapter = build_adapter(connector=None)
+    connector = connect_method(adapter)
+    connector.adapter = None
+    adapter.connector = None
+    reference = weakref.ref(adapter)
+    del adapter
+    gc.collect()
+    assert reference() is None and sc._connection_cache
+
+
+def test_pools_are_split_by_autocommit_and_pool_options(stub_connector):
+    connect_method(build_adapter(connector=None, autocommit=True))
+    connect_method(build_adapter(connector=None, autocommit=False))
+    connect_method(build_adapter(connector=None, autocommit=False, pool_options={'max_size': 2}))
+    assert len(sc._connection_cache) == 3
+
+
+def test_sql_pool_cleanup_closes_pool(stub_connector):
+    @sc.sql_pool_cleanup
+    def shutdown(adapter):
+        return 'closed'
+
+    adapter = build_adapter(connector=None)
+    connector = connect_method(adapter)
+    close_method(adapter)
+    assert shutdown(adapter) == 'closed'
     assert not sc._connection_cache
-    assert closed == [True]
+    assert connector.connection is None
 
 
-def test_close_connectors_for_all_entries(monkeypatch):
-    connector = mock.MagicMock()
-    connector.connection = mock.MagicMock()
-    sc._connection_cache[('k',)] = connector
-    connection = connector.connection
+def test_close_connectors_for_all_entries():
+    pool = mock.MagicMock()
+    sc._connection_cache[('k',)] = pool
     sc._close_connectors_for()
-    connection.close.assert_called_once()
+    pool.close.assert_called_once()
     assert not sc._connection_cache
 
 
@@ -95,3 +95,71 @@ def test_mysql_cursor_returns_dictionary_cursor():
         cursor = connector.cursor()
     fake_connection.cursor.assert_called_once_with(dictionary=True)
     assert cursor is fake_cursor
+
+
+def test_postgres_execute_prepared_prepares_once_per_connection(postgres_connector):
+    postgres_connector.connection = mock.MagicMock(closed=0)
+    cursor = mock.MagicMock()
+    query = "SELECT * FROM items WHERE id = %s AND name LIKE 'a%%'"
+    assert postgres_connector.execute_prepared(cursor, query, (1,)) is cursor
+    postgres_connector.execute_prepared(cursor, query, (2,))
+    assert cursor.execute.call_args_list == [
+        mock.call("PREPARE daplug_stmt_1 AS SELECT * FROM items WHERE id = $1 AND name LIKE 'a%'"),
+        mock.call('EXECUTE daplug_stmt_1 (%s)', (1,)),
+        mock.call('EXECUTE daplug_stmt_1 (%s)', (2,)),
+    ]
+
+
+def test_postgres_execute_prepared_reprepares_after_reconnect(postgres_connector):
+    postgres_connector.connection = mock.MagicMock(closed=0)
+    cursor = mock.MagicMock()
+    postgres_connector.execute_prepared(cursor, 'SELECT 1', None)
+    postgres_connector.connection = mock.MagicMock(closed=0)
+    postgres_connector.execute_prepared(cursor, 'SELECT 1', None)
+    assert cursor.execute.call_args_list == [
+        mock.call('PREPARE daplug_stmt_1 AS SELECT 1'),
+        mock.call('EXECUTE daplug_stmt_1'),
+        mock.call('PREPARE daplug_stmt_1 AS SELECT 1'),
+        mock.call('EXECUTE daplug_stmt_1'),
+    ]
+
+
+def test_mysql_execute_prepared_reuses_prepared_cursor():
+    connector = SQLConnector(ConnectorHost(engine='mysql', port=3306))
+    connector.connection = mock.MagicMock()
+    prepared_cursor = connector.connection.cursor.return_value
+    first = connector.execute_prepared(mock.MagicMock(), 'SELECT * FROM items WHERE id = %s', (1,))
+    second = connector.execute_prepared(mock.MagicMock(), 'SELECT * FROM items WHERE id = %s', (2,))
+    assert first is second is prepared_cursor
+    connector.connection.cursor.assert_called_once_with(prepared=True, dictionary=True)
+    assert prepared_cursor.execute.call_count == 2
+
+
+def test_postgres_stream_cursor_is_named_and_withheld_under_autocommit(postgres_connector):
+    postgres_connector.connection = mock.MagicMock(closed=0, autocommit=True)
+    cursor = postgres_connector.stream_cursor(250)
+    kwargs = postgres_connector.connection.cursor.call_args.kwargs
+    assert kwargs['name'].startswith('daplug_stream_')
+    assert kwargs['withhold'] is True
+    assert cursor.itersize == 250
+
+
+def test_mysql_stream_cursor_is_unbuffered():
+    connector = SQLConnector(ConnectorHost(engine='mysql', port=3306))
+    connector.connection = mock.MagicMock()
+    connector.connection.is_connected.return_value = True
+    connector.stream_cursor(100)
+    connector.connection.cursor.assert_called_once_with(dictionary=True, buffered=False)
+    connector.stream_cursor(100, dictionary=False)
+    connector.connection.cursor.assert_called_with(dictionary=False, buffered=False)
+
+
+def test_tuple_cursor_uses_driver_default_rows(postgres_connector):
+    postgres_connector.connection = mock.MagicMock(closed=0)
+    postgres_connector.tuple_cursor()
+    postgres_connector.connection.cursor.assert_called_once_with()
+    connector = SQLConnector(ConnectorHost(engine='mysql', port=3306))
+    connector.connection = mock.MagicMock()
+    connector.connection.is_connected.return_value = True
+    connector.tuple_cursor()
+    connector.connection.cursor.assert_called_once_with(buffered=True)
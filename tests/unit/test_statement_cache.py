@@ -0,0 +1,77 @@
+import pytest
+
+from daplug_sql.insert_builder import InsertBuilder
+from daplug_sql.statement_builder import StatementBuilder
+from daplug_sql.statement_cache import StatementCache, statement_cache
+from daplug_sql.upsert_builder import UpsertBuilder
+
+
+@pytest.fixture(autouse=True)
+def clear_statement_cache():
+    statement_cache.clear()
+    yield
+    statement_cache.clear()
+
+
+def test_cache_counts_hits_and_misses():
+    cache = StatementCache()
+    calls = []
+    compile_statement = lambda: calls.append(1) or 'SELECT 1'  # noqa: E731
+    assert cache.get('key', compile_statement) == 'SELECT 1'
+    assert cache.get('key', compile_statement) == 'SELECT 1'
+    assert calls == [1]
+    assert cache.info() == {'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 1024}
+
+
+def test_cache_evicts_least_recently_used():
+    cache = StatementCache(maxsize=2)
+    cache.get('a', lambda: 'A')
+    cache.get('b', lambda: 'B')
+    cache.get('a', lambda: 'A')
+    cache.get('c', lambda: 'C')
+    assert list(cache.entries) == ['a', 'c']
+    cache.clear()
+    assert cache.info() == {'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2}
+
+
+def test_upsert_builder_reuses_template_and_binds_new_params():
+    kwargs = {
+        'table': 'entities',
+        'identifier': 'entity_key',
+        'merge_columns': ['payload'],
+        'strip_paths': {'payload': ['eye_color']},
+        'guard_column': 'last_event_at',
+    }
+    first = UpsertBuilder('postgres', data={'entity_key': 'a', 'payload': {}, 'last_event_at': 1}, **kwargs).build()
+    second = UpsertBuilder('postgres', data={'entity_key': 'b', 'payload': {}, 'last_event_at': 2}, **kwargs).build()
+    assert first[0] == second[0]
+    assert first[1][0] == 'a' and second[1][0] == 'b'
+    assert first[1][-1] == second[1][-1] == ['eye_color']
+    assert statement_cache.info()['hits'] == 1
+    assert statement_cache.info()['misses'] == 1
+
+
+def test_upsert_builder_keys_on_shape():
+    UpsertBuilder('postgres', table='t', identifier='id', data={'id': 1, 'a': 1}).build()
+    UpsertBuilder('mysql', table='t', identifier='id', data={'id': 1, 'a': 1}).build()
+    UpsertBuilder('postgres', table='t', identifier='id', data={'id': 1, 'b': 1}).build()
+    UpsertBuilder('postgres', table='t', identifier='id', rows=[{'id': 1, 'a': 1}, {'id': 2, 'a': 2}]).build()
+    assert statement_cache.info()['misses'] == 4
+    assert statement_cache.info()['hits'] == 0
+
+
+def test_statement_and_insert_builders_use_cache():
+    builder = StatementBuilder('postgres')
+    assert builder.select('t', 'id') is builder.select('t', 'id')
+    rows = [{'id': 1, 'name': 'a'}]
+    InsertBuilder('postgres', rows=rows, table='t', identifier='id').build()
+    query, params = InsertBuilder('postgres', rows=[{'id': 2, 'name': 'b'}], table='t', identifier='id').build()
+    assert params == (2, 'b')
+    assert query.startswith('INSERT INTO "t"')
+    assert statement_cache.info()['hits'] == 2
+
+
+def test_validation_runs_on_cache_hits():
+    UpsertBuilder('postgres', table='t', identifier='id', data={'id': 1, 'a': 1}).build()
+    with pytest.raises(KeyError):
+        UpsertBuilder('postgres', table='t', identifier='id', data={'a': 1}).build()
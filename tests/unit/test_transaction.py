@@ -0,0 +1,103 @@
+from unittest import mock
+
+import pytest
+
+from daplug_sql.adapter import SQLAdapter
+from daplug_sql.exception import SQLAdapterException
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+@pytest.fixture
+def adapter(monkeypatch, events):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, data, **kwargs: events.append(data))
+    return build_adapter()
+
+
+def build_adapter(**overrides):
+    inst = SQLAdapter(endpoint='db.local', database='app', user='svc', password='pw', **overrides)
+    inst.connection = mock.MagicMock(autocommit=inst.autocommit)
+    inst.cursor = mock.MagicMock()
+    inst.cursor.fetchone.return_value = None
+    return inst
+
+
+def statements(adapter):
+    return [call.args[0] for call in adapter.cursor.execute.call_args_list]
+
+
+def test_transaction_commits_once_and_publishes_after_commit(adapter, events):
+    with adapter.transaction():
+        adapter.delete(1, table='items', identifier='id', commit=True)
+        adapter.delete(2, table='items', identifier='id', commit=True)
+        assert events == []
+    executed = statements(adapter)
+    assert executed[0] == 'BEGIN' and executed[-1] == 'COMMIT'
+    assert len(executed) == 4
+    adapter.connection.commit.assert_not_called()
+    assert events == [{'id': 1}, {'id': 2}]
+
+
+def test_transaction_rolls_back_and_drops_events(adapter, events):
+    with pytest.raises(RuntimeError):
+        with adapter.transaction():
+            adapter.delete(1, table='items', identifier='id')
+            raise RuntimeError('abort')
+    assert statements(adapter)[-1] == 'ROLLBACK'
+    assert events == []
+    adapter.delete(3, table='items', identifier='id')
+    assert events == [{'id': 3}]
+
+
+def test_nested_transactions_join_the_outer_scope(adapter):
+    with adapter.transaction():
+        with adapter.transaction():
+            adapter.delete(1, table='items', identifier='id')
+    assert statements(adapter).count('BEGIN') == 1
+    assert statements(adapter).count('COMMIT') == 1
+
+
+def fail_on_three(query, params=None):
+    if params == (3,):
+        raise RuntimeError('constraint')
+
+
+def test_savepoint_rolls_back_only_its_own_work(adapter, events):
+    with adapter.transaction():
+        adapter.delete(1, table='items', identifier='id')
+        with pytest.raises(SQLAdapterException):
+            with adapter.savepoint():
+                adapter.delete(2, table='items', identifier='id')
+                adapter.cursor.execute.side_effect = fail_on_three
+                adapter.delete(3, table='items', identifier='id')
+        with adapter.savepoint():
+            adapter.delete(4, table='items', identifier='id')
+    executed = statements(adapter)
+    assert 'SAVEPOINT daplug_sp_1' in executed
+    assert 'ROLLBACK TO SAVEPOINT daplug_sp_1' in executed
+    assert 'RELEASE SAVEPOINT daplug_sp_1' in executed
+    assert executed[-1] == 'COMMIT'
+    assert events == [{'id': 1}, {'id': 4}]
+
+
+def test_savepoint_outside_transaction_opens_one(adapter):
+    with adapter.savepoint():
+        adapter.delete(1, table='items', identifier='id')
+    assert statements(adapter)[0] == 'BEGIN'
+    assert not any(query.startswith('SAVEPOINT') for query in statements(adapter))
+
+
+def test_manual_commit_mode_uses_connection_commit(monkeypatch, events):
+    monkeypatch.setattr('daplug_core.base_adapter.BaseAdapter.publish', lambda self, data, **kwargs: events.append(data))
+    adapter = build_adapter(autocommit=False, engine='mysql')
+    with adapter.transaction():
+        adapter.delete(1, table='items', identifier='id', commit=True)
+    assert 'BEGIN' not in statements(adapter)
+    adapter.connection.commit.assert_called_once()
+    with pytest.raises(KeyError):
+        with adapter.transaction():
+            raise KeyError('x')
+    adapter.connection.rollback.assert_called_once()
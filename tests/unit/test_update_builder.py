@@ -0,0 +1,53 @@
+import json
+
+import pytest
+from psycopg2.extras import Json
+
+from daplug_sql.update_builder import UpdateBuilder
+
+
+def build_kwargs(**overrides):
+    kwargs = {
+        'data': {'entity_key': 'a', 'name': 'Ada', 'payload': {'eye_color': 'green'}},
+        'table': 'documents',
+        'identifier': 'entity_key',
+    }
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_postgres_merges_dict_columns_server_side():
+    query, params = UpdateBuilder('postgres', **build_kwargs()).build()
+    assert query == (
+        'UPDATE "documents" SET "name" = %s, "payload" = daplug_json_merge("payload", %s) '
+        'WHERE "entity_key" = %s RETURNING *'
+    )
+    assert params[0] == 'Ada'
+    assert isinstance(params[1], Json)
+    assert params[2] == 'a'
+
+
+def test_postgres_strip_paths_and_merge_false():
+    query, params = UpdateBuilder('postgres', **build_kwargs(strip_paths={'payload': ['prefs.music']})).build()
+    assert '"payload" = (daplug_json_merge("payload", %s)) #- %s' in query
+    assert params[2] == ['prefs', 'music']
+    query, _ = UpdateBuilder('postgres', **build_kwargs(merge=False)).build()
+    assert query == 'UPDATE "documents" SET "name" = %s, "payload" = %s WHERE "entity_key" = %s RETURNING *'
+
+
+def test_mysql_uses_json_merge_patch_without_returning():
+    kwargs = build_kwargs(merge_columns=['payload'], strip_paths={'payload': ['eye_color']})
+    query, params = UpdateBuilder('mysql', **kwargs).build()
+    assert query == (
+        'UPDATE `documents` SET `name` = %s, '
+        '`payload` = JSON_REMOVE(JSON_MERGE_PATCH(COALESCE(`payload`, JSON_OBJECT()), %s), %s) '
+        'WHERE `entity_key` = %s'
+    )
+    assert params == ('Ada', json.dumps({'eye_color': 'green'}), '$."eye_color"', 'a')
+
+
+def test_build_validations():
+    with pytest.raises(KeyError):
+        UpdateBuilder('postgres', **build_kwargs(data={'name': 'Ada'})).build()
+    with pytest.raises(ValueError):
+        UpdateBuilder('postgres', **build_kwargs(data={'entity_key': 'a'})).build()
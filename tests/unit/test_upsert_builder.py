@@ -74,6 +74,27 @@ def test_mysql_identifier_only_payload_is_noop_on_conflict():
     assert query.endswith('ON DUPLICATE KEY UPDATE `entity_key` = `documents`.`entity_key`')
 
 
+def test_postgres_multi_row_upsert_shares_set_clause():
+    rows = [
+        {'entity_key': 'a', 'payload': {'name': 'Ada'}, 'last_event_at': 100},
+        {'entity_key': 'b', 'payload': {'name': 'Bob'}, 'last_event_at': 200},
+    ]
+    kwargs = build_kwargs(rows=rows, merge_columns=['payload'], strip_paths={'payload': ['eye_color']})
+    query, params = UpsertBuilder('postgres', **kwargs).build()
+    assert 'VALUES (%s, %s, %s), (%s, %s, %s) ON CONFLICT ("entity_key")' in query
+    assert '"payload" = (daplug_json_merge(existing."payload", EXCLUDED."payload")) #- %s' in query
+    assert len(params) == 7
+    assert params[3] == 'b'
+    assert params[-1] == ['eye_color']
+
+
+def test_mysql_multi_row_upsert_uses_row_alias():
+    rows = [{'entity_key': 'a', 'last_event_at': 1}, {'entity_key': 'b', 'last_event_at': 2}]
+    query, params = UpsertBuilder('mysql', **build_kwargs(rows=rows)).build()
+    assert 'VALUES (%s, %s), (%s, %s) AS new_values ON DUPLICATE KEY UPDATE' in query
+    assert params == ('a', 1, 'b', 2)
+
+
 def test_build_validations():
     empty_data = UpsertBuilder('postgres', **build_kwargs(data={}))
     with pytest.raises(ValueError):
@@ -81,6 +102,9 @@ def test_build_validations():
     missing_identifier = UpsertBuilder('postgres', **build_kwargs(data={'payload': {}}))
     with pytest.raises(KeyError):
         missing_identifier.build()
+    mixed_rows = UpsertBuilder('postgres', **build_kwargs(rows=[{'entity_key': 'a'}, {'entity_key': 'b', 'payload': {}}]))
+    with pytest.raises(ValueError):
+        mixed_rows.build()
     unsafe_table = UpsertBuilder('postgres', **build_kwargs(table='bad table'))
     with pytest.raises(ValueError):
         unsafe_table.build()
@@ -0,0 +1,59 @@
+import pytest
+
+from daplug_sql.upsert_coalescer import UpsertCoalescer
+
+
+def build_kwargs(**overrides):
+    kwargs = {'identifier': 'entity_key'}
+    kwargs.update(overrides)
+    return kwargs
+
+
+def test_coalesce_keeps_one_row_per_identifier_in_first_seen_order():
+    rows = [
+        {'entity_key': 'a', 'name': 'first'},
+        {'entity_key': 'b', 'name': 'other'},
+        {'entity_key': 'a', 'name': 'second', 'extra': 1},
+    ]
+    result = UpsertCoalescer(**build_kwargs()).coalesce(rows)
+    assert result == [
+        {'entity_key': 'a', 'name': 'second', 'extra': 1},
+        {'entity_key': 'b', 'name': 'other'},
+    ]
+
+
+def test_coalesce_deep_merges_merge_columns_then_strips():
+    rows = [
+        {'entity_key': 'a', 'payload': {'name': 'Ada', 'eye_color': 'green', 'tags': [1]}},
+        {'entity_key': 'a', 'payload': {'preferences': {'music': 'jazz', 'food': 'pizza'}, 'tags': [2]}},
+    ]
+    kwargs = build_kwargs(merge_columns=['payload'], strip_paths={'payload': ['eye_color', 'preferences.music']})
+    result = UpsertCoalescer(**kwargs).coalesce(rows)
+    assert result == [{'entity_key': 'a', 'payload': {'name': 'Ada', 'tags': [2], 'preferences': {'food': 'pizza'}}}]
+    assert rows[1]['payload']['preferences'] == {'music': 'jazz', 'food': 'pizza'}
+
+
+def test_coalesce_guard_skips_older_rows():
+    rows = [
+        {'entity_key': 'a', 'name': 'newest', 'last_event_at': 300},
+        {'entity_key': 'a', 'name': 'stale', 'last_event_at': 100},
+        {'entity_key': 'a', 'name': 'tie', 'last_event_at': 300},
+        {'entity_key': 'a', 'name': 'missing-guard'},
+    ]
+    result = UpsertCoalescer(**build_kwargs(guard_column='last_event_at')).coalesce(rows)
+    assert result == [{'entity_key': 'a', 'name': 'tie', 'last_event_at': 300}]
+
+
+def test_coalesce_guard_keeps_newest_row_without_merging_older_fields():
+    rows = [
+        {'entity_key': 'a', 'name': 'old', 'payload': {'stale': True}, 'last_event_at': 100},
+        {'entity_key': 'a', 'payload': {'fresh': True}, 'last_event_at': 200},
+    ]
+    kwargs = build_kwargs(guard_column='last_event_at', merge_columns=['payload'])
+    result = UpsertCoalescer(**kwargs).coalesce(rows)
+    assert result == [{'entity_key': 'a', 'payload': {'fresh': True}, 'last_event_at': 200}]
+
+
+def test_coalesce_requires_identifier():
+    with pytest.raises(KeyError):
+        UpsertCoalescer(**build_kwargs()).coalesce([{'name': 'x'}])